@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from shared.core import models, schemas, database
+from backend.app.auth_cache import user_cache
 
 # Constants
 SECRET_KEY = "supersecretkeychangeinproduction"
@@ -61,8 +62,14 @@ async def get_current_user_from_cookie(request: Request, db: AsyncSession = Depe
     except JWTError:
         raise credentials_exception
     
-    result = await db.execute(select(models.User).where(models.User.username == token_data.username))
-    user = result.scalar_one_or_none()
+    # Cached (detached) user: no DB round trip on the hot path
+    hit, user = user_cache.get(token_data.username)
+    if not hit:
+        result = await db.execute(select(models.User).where(models.User.username == token_data.username))
+        user = result.scalar_one_or_none()
+        if user is not None:
+            db.expunge(user)
+        user_cache.set(token_data.username, user)
     
     if user is None:
         raise credentials_exception
@@ -0,0 +1,86 @@
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger("backend.auth_cache")
+
+# NOTIFY channel every backend process listens on (see main.listen_to_notifications)
+AUTH_INVALIDATE_CHANNEL = "auth_invalidate"
+
+class AuthCache:
+    """
+    Small TTL + LRU map for auth lookups. Misses can be cached too (value None)
+    with their own, shorter TTL so unknown keys don't hit the DB on every request.
+    Cached ORM objects must be detached from their session (expunged) before storing.
+    """
+
+    def __init__(self, ttl_seconds: float, negative_ttl_seconds: float, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Returns (hit, value); value is None for a cached miss."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return False, None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return False, None
+        self.entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any):
+        ttl = self.ttl_seconds if value is not None else self.negative_ttl_seconds
+        self.entries[key] = (value, time.monotonic() + ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        self.entries.pop(key, None)
+
+    def clear(self):
+        self.entries.clear()
+
+# key_hash -> ApiKey (or None: unknown/inactive key)
+api_key_cache = AuthCache(
+    ttl_seconds=float(os.getenv("API_KEY_CACHE_TTL_SECONDS", 60)),
+    negative_ttl_seconds=float(os.getenv("API_KEY_CACHE_NEGATIVE_TTL_SECONDS", 10)),
+)
+# username -> User (or None)
+user_cache = AuthCache(
+    ttl_seconds=float(os.getenv("USER_CACHE_TTL_SECONDS", 300)),
+    negative_ttl_seconds=float(os.getenv("USER_CACHE_NEGATIVE_TTL_SECONDS", 10)),
+)
+
+CACHES = {"api_key": api_key_cache, "user": user_cache}
+
+async def publish_invalidation(db: AsyncSession, kind: str, key: str):
+    """
+    Drops the entry here and, once the transaction commits, in every other backend
+    process (NOTIFY is delivered on commit).
+    """
+    CACHES[kind].invalidate(key)
+    payload = json.dumps({"kind": kind, "key": key})
+    await db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": AUTH_INVALIDATE_CHANNEL, "payload": payload})
+
+def on_auth_invalidate(connection, pid, channel, payload):
+    try:
+        data = json.loads(payload)
+        CACHES[data["kind"]].invalidate(data["key"])
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error(f"Invalid auth invalidation payload {payload!r}: {e}")
+
+def clear_all():
+    """Used when the listener (re)connects: invalidations may have been missed meanwhile."""
+    for cache in CACHES.values():
+        cache.clear()
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger("backend.cache")
+
+# NOTIFY channel telling every backend process that a site's cached responses are stale
+CACHE_INVALIDATE_CHANNEL = "response_cache_invalidate"
+
+class CachedResponse:
+    def __init__(self, body: bytes, site_id: Optional[str], ttl: float):
+        self.body = body
+        self.site_id = site_id
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.expires_at = time.monotonic() + ttl
+
+class ResponseCache:
+    """
+    In-process TTL + LRU cache of serialized JSON responses.
+
+    Entries are tagged with the site they belong to; None means the response spans
+    all sites (e.g. the feed without site_id). invalidate_site() drops the site's
+    entries and every cross-site one, found through a per-site index of keys. It is
+    called for every committed page change (page_events NOTIFY, see main.on_page_event)
+    and on site changes in any backend process (see publish_site_invalidation).
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.keys_by_site: dict[Optional[str], set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _drop(self, key: str):
+        entry = self.entries.pop(key)
+        keys = self.keys_by_site.get(entry.site_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.keys_by_site[entry.site_id]
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at < time.monotonic():
+            self._drop(key)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, body: bytes, site_id: Optional[str] = None) -> CachedResponse:
+        if key in self.entries:
+            self._drop(key)
+        entry = CachedResponse(body, site_id, self.ttl_seconds)
+        self.entries[key] = entry
+        self.keys_by_site.setdefault(site_id, set()).add(key)
+        while len(self.entries) > self.max_entries:
+            self._drop(next(iter(self.entries)))
+        return entry
+
+    def invalidate_site(self, site_id):
+        site_id = str(site_id)
+        stale = list(self.keys_by_site.get(site_id, ())) + list(self.keys_by_site.get(None, ()))
+        for key in stale:
+            self._drop(key)
+        if stale:
+            logger.debug(f"Invalidated {len(stale)} cached responses for site {site_id}")
+
+    def clear(self):
+        self.entries.clear()
+        self.keys_by_site.clear()
+
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1000)),
+    ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 60)),
+)
+
+async def publish_site_invalidation(db: AsyncSession, site_id):
+    """Invalidates the site's responses in every backend process once the transaction commits."""
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CACHE_INVALIDATE_CHANNEL, "payload": str(site_id)},
+    )
+
+def on_cache_invalidate(connection, pid, channel, payload):
+    response_cache.invalidate_site(payload)
+
+def cache_key(request: Request) -> str:
+    """Path plus the query parameters in a canonical order."""
+    params = sorted(request.query_params.multi_items())
+    return request.url.path + "?" + "&".join(f"{k}={v}" for k, v in params)
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+async def cached_json_response(
+    request: Request,
+    build: Callable[[], Awaitable[Any]],
+    site_id: Optional[UUID] = None,
+    site_of: Optional[Callable[[Any], Optional[UUID]]] = None,
+    headers: Optional[dict[str, str]] = None,
+) -> Response:
+    """
+    Serves the response from the cache (building it on a miss) with a strong ETag,
+    answering If-None-Match with 304.
+
+    site_id (or site_of(payload), when it's only known after building) tags the entry for invalidation.
+    headers are added to the response (e.g. rate limit headers, which FastAPI doesn't merge into a returned Response).
+    """
+    key = cache_key(request)
+    entry = response_cache.get(key)
+    if entry is None:
+        payload = await build()
+        if site_of is not None:
+            site_id = site_of(payload)
+        body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode()
+        entry = response_cache.set(key, body, str(site_id) if site_id else None)
+
+    headers = {**(headers or {}), "ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
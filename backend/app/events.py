@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from sqlalchemy import select, func
+
+from shared.core import models
+from shared.core.database import AsyncSessionLocal
+from shared.core.events import event_dict
+
+logger = logging.getLogger("backend.events")
+
+# Events read per outbox query when a consumer is behind
+CATCH_UP_BATCH = 500
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("EVENT_SUBSCRIBER_QUEUE_SIZE", 1000))
+
+class Subscription:
+    def __init__(self, site_id: Optional[str]):
+        self.site_id = site_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        # Set when the consumer fell behind and pushed events were dropped: it re-reads the outbox
+        self.overflowed = False
+
+class PageEventBroker:
+    """
+    Fans out page events to the open streams of this process.
+
+    Events arrive on the page_events NOTIFY channel (see main.listen_to_notifications),
+    committed together with the page by the worker. Consumers that resume (Last-Event-ID)
+    or fall behind read the page_events outbox table instead.
+    """
+
+    def __init__(self):
+        self.subscriptions: set[Subscription] = set()
+
+    def publish(self, event: dict):
+        for sub in self.subscriptions:
+            if sub.site_id is not None and sub.site_id != event.get("site_id"):
+                continue
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                sub.overflowed = True
+                while not sub.queue.empty():
+                    sub.queue.get_nowait()
+
+    async def latest_event_id(self) -> int:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(func.max(models.PageEvent.id)))
+            return result.scalar() or 0
+
+    async def fetch_events(self, after: int, site_id: Optional[str], limit: int) -> list[dict]:
+        query = select(models.PageEvent).where(models.PageEvent.id > after)
+        if site_id:
+            query = query.where(models.PageEvent.site_id == UUID(site_id))
+        query = query.order_by(models.PageEvent.id).limit(limit)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(query)
+            return [event_dict(event) for event in result.scalars().all()]
+
+    async def stream(self, after: Optional[int], site_id: Optional[UUID], timeout: float) -> AsyncIterator[list[dict]]:
+        """
+        Yields batches of events after the event id `after` (None: from now on), as they are
+        committed. Yields [] whenever `timeout` seconds pass without events (heartbeat / long-poll end).
+        """
+        sub = Subscription(str(site_id) if site_id else None)
+        # Subscribe before reading the outbox so nothing committed in between is missed
+        self.subscriptions.add(sub)
+        # Ids already sent: the outbox and the pushed events overlap while catching up
+        sent = deque(maxlen=SUBSCRIBER_QUEUE_SIZE)
+        sent_ids = set()
+        try:
+            catching_up = after is not None
+            if after is None:
+                after = await self.latest_event_id()
+
+            while True:
+                if catching_up or sub.overflowed:
+                    sub.overflowed = False
+                    events = await self.fetch_events(after, sub.site_id, CATCH_UP_BATCH)
+                    catching_up = len(events) == CATCH_UP_BATCH
+                else:
+                    try:
+                        events = [await asyncio.wait_for(sub.queue.get(), timeout)]
+                    except asyncio.TimeoutError:
+                        yield []
+                        continue
+                    while not sub.queue.empty():
+                        events.append(sub.queue.get_nowait())
+
+                events = [event for event in events if event["id"] not in sent_ids]
+                for event in events:
+                    if len(sent) == sent.maxlen:
+                        sent_ids.discard(sent[0])
+                    sent.append(event["id"])
+                    sent_ids.add(event["id"])
+                    after = max(after, event["id"])
+                if events:
+                    yield events
+        finally:
+            self.subscriptions.discard(sub)
+
+page_event_broker = PageEventBroker()
@@ -0,0 +1,146 @@
+import csv
+import io
+import json
+import typing
+from datetime import datetime, date
+from typing import Any, AsyncIterator, Callable
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from shared.core.database import AsyncSessionLocal
+
+# Rows fetched per server-side cursor round trip; also one Parquet row group
+EXPORT_BATCH_SIZE = 500
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+def _json_default(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    return str(obj)
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file for pyarrow that hands out what was written so far; tell() keeps counting."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+class PageExporter:
+    """
+    Streams query results as NDJSON, CSV or Parquet with bounded memory: rows come through a
+    server-side cursor in batches of batch_size and each batch is encoded and yielded right away.
+
+    fields are the output keys (in order) and model the Pydantic model they come from, whose
+    annotations give the Parquet column types. Parquet needs pyarrow (ImportError otherwise).
+    """
+
+    def __init__(self, format: str, fields: list[str], model: type[BaseModel], batch_size: int = EXPORT_BATCH_SIZE):
+        if format not in MEDIA_TYPES:
+            raise ValueError(f"Unknown export format: {format}")
+        self.format = format
+        self.fields = fields
+        self.batch_size = batch_size
+        self.media_type = MEDIA_TYPES[format]
+        self.schema = None
+        if format == "parquet":
+            import pyarrow as pa
+            self.schema = pa.schema([(field, self._arrow_type(model.model_fields[field].annotation)) for field in fields])
+
+    @staticmethod
+    def _arrow_type(annotation):
+        import pyarrow as pa
+        # Optional[X] -> X
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if args:
+            annotation = args[0]
+        if annotation is datetime:
+            return pa.timestamp("us", tz="UTC")
+        if annotation is bool:
+            return pa.bool_()
+        if annotation is int:
+            return pa.int64()
+        return pa.string()
+
+    async def stream(
+        self,
+        query,
+        to_item: Callable[[Any], dict],
+        session_factory=AsyncSessionLocal,
+    ) -> AsyncIterator[bytes]:
+        # Own session: the response is streamed after the request's dependencies are gone
+        async with session_factory() as db:
+            result = await db.stream(query.execution_options(yield_per=self.batch_size))
+            encode, finish = self._encoder()
+            async for rows in result.partitions():
+                chunk = encode([to_item(row) for row in rows])
+                if chunk:
+                    yield chunk
+            chunk = finish()
+            if chunk:
+                yield chunk
+
+    def _encoder(self):
+        """(encode(items) -> bytes, finish() -> bytes) for the format."""
+        if self.format == "ndjson":
+            def encode(items):
+                return "".join(
+                    json.dumps(item, default=_json_default, ensure_ascii=False) + "\n" for item in items
+                ).encode()
+            return encode, lambda: b""
+
+        if self.format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=self.fields, extrasaction="ignore")
+            writer.writeheader()
+
+            def encode(items):
+                writer.writerows({key: _csv_value(value) for key, value in item.items()} for item in items)
+                data = buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                return data.encode()
+            return encode, lambda: encode([])
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, self.schema)
+
+        def encode(items):
+            # One row group per batch
+            writer.write_table(pa.Table.from_pylist(items, schema=self.schema))
+            return sink.drain()
+
+        def finish():
+            writer.close()
+            return sink.drain()
+        return encode, finish
@@ -0,0 +1,36 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from shared.core.cleanup import SiteDataCleaner
+
+logger = logging.getLogger("backend.jobs")
+
+# In-process registry of admin jobs, keyed by site. Not shared between API processes: only
+# the process that started a cleanup can report or cancel it (the backend runs one uvicorn process)
+cleanup_jobs: dict[UUID, SiteDataCleaner] = {}
+_running_tasks: set[asyncio.Task] = set()
+
+
+def start_site_cleanup(site_id: UUID, **kwargs) -> SiteDataCleaner:
+    """
+    Starts a background cleanup of all pages of a site.
+    If one is already running for that site, it is returned instead.
+    """
+    job = cleanup_jobs.get(site_id)
+    if job and job.is_running:
+        return job
+
+    job = SiteDataCleaner(site_id, **kwargs)
+    cleanup_jobs[site_id] = job
+    logger.info(f"Starting cleanup job for site {site_id}")
+
+    # Keep a reference so the task is not garbage collected mid-run
+    task = asyncio.create_task(job.run())
+    _running_tasks.add(task)
+    task.add_done_callback(_running_tasks.discard)
+    return job
+
+
+def get_site_cleanup(site_id: UUID):
+    return cleanup_jobs.get(site_id)
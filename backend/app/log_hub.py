@@ -0,0 +1,118 @@
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from typing import Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+logger = logging.getLogger("backend.log_hub")
+
+LOG_HISTORY_SIZE = int(os.getenv("LOG_HISTORY_SIZE", 200))
+LOG_CLIENT_QUEUE_SIZE = int(os.getenv("LOG_CLIENT_QUEUE_SIZE", 500))
+
+class LogClient:
+    """One WebSocket viewer: its filters and a bounded queue that drops the oldest logs when full."""
+
+    def __init__(self, websocket: WebSocket, site_id: Optional[str] = None, levels: Optional[set[str]] = None):
+        self.websocket = websocket
+        self.site_id = site_id
+        self.levels = levels
+        self.queue: deque[str] = deque(maxlen=LOG_CLIENT_QUEUE_SIZE)
+        self.ready = asyncio.Event()
+        self.dropped = 0
+
+    def matches(self, event: dict) -> bool:
+        if self.levels and event.get("level") not in self.levels:
+            return False
+        if self.site_id and str((event.get("extra") or {}).get("site_id")) != self.site_id:
+            return False
+        return True
+
+    def push(self, payload: str):
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(payload)
+        self.ready.set()
+
+    def set_filters(self, message: str):
+        """
+        Clients can change filters at any time: {"site_id": "...", "levels": ["error", ...]}.
+        levels may also be a comma-separated string; filters that aren't understood are ignored.
+        """
+        try:
+            filters = json.loads(message)
+        except ValueError:
+            return
+        if not isinstance(filters, dict):
+            return
+        if "site_id" in filters:
+            self.site_id = str(filters["site_id"]) if filters["site_id"] else None
+        if "levels" in filters:
+            levels = filters["levels"]
+            if isinstance(levels, str):
+                levels = levels.split(",")
+            if levels is None or (isinstance(levels, list) and all(isinstance(level, str) for level in levels)):
+                self.levels = {level.strip() for level in levels or [] if level.strip()} or None
+
+class LogHub:
+    """
+    Fans worker logs out to WebSocket viewers without blocking on any of them.
+
+    publish() only appends to each matching client's queue; every client has its own
+    sender task, so a slow tab falls behind (and loses its oldest logs) on its own.
+    New clients first get the matching logs of the last LOG_HISTORY_SIZE received.
+    """
+
+    def __init__(self):
+        self.clients: set[LogClient] = set()
+        self.history: deque[tuple[str, dict]] = deque(maxlen=LOG_HISTORY_SIZE)
+
+    def publish(self, payload: str, event: Optional[dict] = None):
+        if event is None:
+            try:
+                event = json.loads(payload)
+            except ValueError:
+                event = None
+            if not isinstance(event, dict):
+                event = {}
+        self.history.append((payload, event))
+        for client in self.clients:
+            if client.matches(event):
+                client.push(payload)
+
+    async def serve(self, websocket: WebSocket, site_id: Optional[str] = None, levels: Optional[set[str]] = None):
+        await websocket.accept()
+        client = LogClient(websocket, site_id, levels)
+        for payload, event in self.history:
+            if client.matches(event):
+                client.push(payload)
+        self.clients.add(client)
+
+        sender = asyncio.create_task(self._send_loop(client))
+        try:
+            while True:
+                client.set_filters(await websocket.receive_text())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self.clients.discard(client)
+            sender.cancel()
+            if client.dropped:
+                logger.info(f"Log viewer disconnected, {client.dropped} logs dropped for being too slow")
+
+    async def _send_loop(self, client: LogClient):
+        try:
+            while True:
+                await client.ready.wait()
+                client.ready.clear()
+                while client.queue:
+                    await client.websocket.send_text(client.queue.popleft())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Closed socket: the receive loop in serve() sees the disconnect and cleans up
+            pass
+
+log_hub = LogHub()
@@ -1,5 +1,6 @@
 import os
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from typing import Optional
+from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from backend.app.routers import sites, pages, feed, settings, auth
 import asyncio
@@ -7,6 +8,13 @@ import asyncpg
 import json
 import logging
 from shared.core.database import DATABASE_URL
+from backend.app.cache import response_cache, on_cache_invalidate, CACHE_INVALIDATE_CHANNEL
+from backend.app import auth_cache
+from backend.app.rate_limit import rate_limiter
+from backend.app.events import page_event_broker
+from backend.app.log_hub import log_hub
+from backend.app.metrics import MetricsMiddleware, metrics_response
+from shared.core.events import PAGE_EVENTS_CHANNEL
 
 # Configure logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -30,15 +38,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(sites.router)
 app.include_router(pages.router)
 app.include_router(feed.router)
 app.include_router(settings.router)
 app.include_router(auth.router)
-from backend.app.routers import public, api_keys
+from backend.app.routers import public, api_keys, admin
 app.include_router(public.router)
 app.include_router(api_keys.router)
+app.include_router(admin.router)
 
 from fastapi.openapi.utils import get_openapi
 
@@ -79,55 +89,57 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception:
-                # Handle disconnected clients that weren't properly removed
-                pass
-
-manager = ConnectionManager()
-
 @app.websocket("/ws/logs")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, site_id: Optional[str] = None, level: Optional[str] = None):
+    # Optional filters: ?site_id=<uuid>&level=error,warning (can be changed later by sending them as JSON)
+    levels = set(level.split(",")) if level else None
+    await log_hub.serve(websocket, site_id, levels)
+
+def on_worker_log(connection, pid, channel, payload):
     try:
-        while True:
-            # We just keep the connection open, we don't expect messages from client
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        pass
-    finally:
-        manager.disconnect(websocket)
+        event = json.loads(payload)
+    except ValueError:
+        event = None
+    if not isinstance(event, dict):
+        event = {}
+    log_hub.publish(payload, event)
+
+def on_page_event(connection, pid, channel, payload):
+    try:
+        event = json.loads(payload)
+    except ValueError as e:
+        logger.error(f"Invalid page event payload: {e}")
+        return
+    # Every committed page change (scrape, re-extraction) makes its site's cached responses stale
+    if event.get("site_id"):
+        response_cache.invalidate_site(event["site_id"])
+    page_event_broker.publish(event)
 
 # Background task to listen to Postgres notifications
-async def listen_to_logs():
+async def listen_to_notifications():
     # asyncpg expects 'postgresql://' not 'postgresql+asyncpg://'
     dsn = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
     try:
         conn = await asyncpg.connect(dsn)
-        await conn.add_listener("worker_logs", lambda connection, pid, channel, payload: asyncio.create_task(manager.broadcast(payload)))
-        logger.info("Listening to worker_logs channel...")
+        await conn.add_listener("worker_logs", on_worker_log)
+        await conn.add_listener(auth_cache.AUTH_INVALIDATE_CHANNEL, auth_cache.on_auth_invalidate)
+        await conn.add_listener(PAGE_EVENTS_CHANNEL, on_page_event)
+        await conn.add_listener(CACHE_INVALIDATE_CHANNEL, on_cache_invalidate)
+        # Revocations and invalidations sent while we weren't listening would otherwise be missed
+        auth_cache.clear_all()
+        response_cache.clear()
+        logger.info(
+            f"Listening to worker_logs, {auth_cache.AUTH_INVALIDATE_CHANNEL}, {PAGE_EVENTS_CHANNEL} "
+            f"and {CACHE_INVALIDATE_CHANNEL} channels..."
+        )
         while True:
             await asyncio.sleep(60) # Keep the listener alive
             if conn.is_closed():
-                break
+                raise ConnectionError("listener connection closed")
     except Exception as e:
-        logger.error(f"Error in log listener: {e}")
+        logger.error(f"Error in notification listener: {e}")
         await asyncio.sleep(5)
-        asyncio.create_task(listen_to_logs())
+        asyncio.create_task(listen_to_notifications())
     finally:
         try:
             if 'conn' in locals() and not conn.is_closed():
@@ -137,8 +149,19 @@ async def listen_to_logs():
 
 @app.on_event("startup")
 async def startup_event():
-    asyncio.create_task(listen_to_logs())
+    asyncio.create_task(listen_to_notifications())
+    asyncio.create_task(rate_limiter.run_flusher())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Don't lose the API key usage counted since the last flush
+    await rate_limiter.flush()
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+# Prometheus exposition (request latency per route, DB pool usage)
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
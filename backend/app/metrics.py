@@ -0,0 +1,53 @@
+from time import perf_counter
+
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST, Gauge, Histogram, generate_latest
+
+from shared.core.database import engine
+
+REQUEST_SECONDS = Histogram(
+    "web2text_backend_request_seconds",
+    "Time until the response starts (headers sent), by route template; streams are not timed to the end",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+_pool = engine.sync_engine.pool
+DB_POOL_SIZE = Gauge("web2text_backend_db_pool_size", "Connections the DB pool keeps open")
+DB_POOL_SIZE.set_function(_pool.size)
+DB_POOL_CHECKED_OUT = Gauge("web2text_backend_db_pool_checked_out", "DB connections in use")
+DB_POOL_CHECKED_OUT.set_function(_pool.checkedout)
+DB_POOL_OVERFLOW = Gauge("web2text_backend_db_pool_overflow", "DB connections open beyond the pool size")
+# overflow() is negative while the pool isn't full yet
+DB_POOL_OVERFLOW.set_function(lambda: max(0, _pool.overflow()))
+
+class MetricsMiddleware:
+    """
+    Times every HTTP request by route template (/pages/{page_id}, not the raw path, to keep
+    the label set small). Plain ASGI so streaming responses (exports, SSE) pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                REQUEST_SECONDS.labels(
+                    scope["method"],
+                    route.path if route else "unmatched",
+                    str(message["status"]),
+                ).observe(perf_counter() - start)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+def metrics_response() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,34 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+def encode_cursor(sort_at: datetime, row_id: UUID) -> str:
+    """Opaque keyset cursor: the (sort key, id) of the last row returned."""
+    raw = json.dumps([sort_at.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_at), UUID(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def estimate_count(db: AsyncSession, query) -> int:
+    """
+    Row count estimate from the planner (EXPLAIN), without executing the query.
+    Good enough for "about N results" and constant-time regardless of table size.
+    """
+    compiled = query.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    # Raw driver SQL: the inlined literals may contain ':' which text() would take for bind params
+    conn = await db.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,39 @@
+from typing import Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import func
+
+# Characters of extracted text returned when the full text wasn't asked for (include=content)
+PREVIEW_CHARS = 500
+
+def parse_list_param(value: Optional[str], allowed: Sequence[str], name: str) -> Optional[list[str]]:
+    """
+    Parses a comma-separated query parameter (fields=, include=).
+    Returns None when absent and raises 400 on unknown names.
+    """
+    if value is None:
+        return None
+    names = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in names if item not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {name}: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return names
+
+def text_column(column, full: bool):
+    """
+    The text column itself, or just enough of it for a preview.
+    substr() lets Postgres read only the first chunks of a TOASTed value.
+    One extra character tells preview() whether the text was cut.
+    """
+    if full:
+        return column
+    return func.substr(column, 1, PREVIEW_CHARS + 1)
+
+def preview(text: Optional[str], full: bool) -> tuple[Optional[str], bool]:
+    """Returns (text, truncated) for a value selected with text_column()."""
+    if full or text is None or len(text) <= PREVIEW_CHARS:
+        return text, False
+    return text[:PREVIEW_CHARS], True
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from datetime import datetime, date, timedelta, timezone
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, literal, Date, BigInteger
+from sqlalchemy.dialects.postgresql import insert
+
+from shared.core import models
+from shared.core.database import AsyncSessionLocal
+
+logger = logging.getLogger("backend.rate_limit")
+
+DEFAULT_RATE_LIMIT_PER_MINUTE = int(os.getenv("PUBLIC_RATE_LIMIT_PER_MINUTE", 120))
+DEFAULT_RATE_LIMIT_BURST = int(os.getenv("PUBLIC_RATE_LIMIT_BURST", 0)) or None  # None = per-minute limit
+DEFAULT_DAILY_QUOTA = int(os.getenv("PUBLIC_DAILY_QUOTA", 0))  # 0 = unlimited
+USAGE_FLUSH_SECONDS = float(os.getenv("API_KEY_USAGE_FLUSH_SECONDS", 10))
+
+class TokenBucket:
+    def __init__(self, per_minute: int, burst: int):
+        self.rate = per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def retry_after(self) -> int:
+        """Seconds until the next token."""
+        return max(1, math.ceil((1 - self.tokens) / self.rate))
+
+    def reset_after(self) -> int:
+        """Seconds until the bucket is full again."""
+        return math.ceil((self.capacity - self.tokens) / self.rate)
+
+def _seconds_until_midnight_utc() -> int:
+    now = datetime.now(timezone.utc)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    return max(1, math.ceil((midnight - now).total_seconds()))
+
+class RateLimiter:
+    """
+    Per-API-key token bucket (requests per minute, with a burst capacity) and daily quota.
+
+    Everything is decided in-process. Daily usage is counted in memory and flushed to
+    api_key_usage every USAGE_FLUSH_SECONDS with one upsert per key; the upsert returns the
+    total across all backend processes, so quotas converge within one flush interval.
+    """
+
+    def __init__(self):
+        self.buckets: dict[UUID, TokenBucket] = {}
+        # (key id, day) -> requests: persisted total (as of the last flush), being flushed, not yet flushed
+        self.flushed: dict[tuple[UUID, date], int] = {}
+        self.in_flight: dict[tuple[UUID, date], int] = {}
+        self.pending: dict[tuple[UUID, date], int] = {}
+        self._flush_lock = asyncio.Lock()
+
+    def _bucket(self, api_key: models.ApiKey) -> TokenBucket:
+        per_minute = api_key.rate_limit_per_minute or DEFAULT_RATE_LIMIT_PER_MINUTE
+        burst = api_key.rate_limit_burst or DEFAULT_RATE_LIMIT_BURST or per_minute
+        bucket = self.buckets.get(api_key.id)
+        # Limits changed on the key: start over with the new ones
+        if bucket is None or bucket.capacity != burst or bucket.rate != per_minute / 60.0:
+            bucket = TokenBucket(per_minute, burst)
+            self.buckets[api_key.id] = bucket
+        return bucket
+
+    def used_today(self, key: tuple[UUID, date]) -> int:
+        return self.flushed.get(key, 0) + self.in_flight.get(key, 0) + self.pending.get(key, 0)
+
+    async def _load_usage(self, key: tuple[UUID, date]):
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(models.ApiKeyUsage.requests).where(
+                    models.ApiKeyUsage.api_key_id == key[0],
+                    models.ApiKeyUsage.day == key[1],
+                )
+            )
+            self.flushed.setdefault(key, result.scalar_one_or_none() or 0)
+
+    async def check(self, api_key: models.ApiKey) -> dict[str, str]:
+        """
+        Counts one request for the key. Returns the X-RateLimit-* headers for the response,
+        or raises 429 (with Retry-After) when the rate limit or the daily quota is exceeded.
+        """
+        bucket = self._bucket(api_key)
+        quota = api_key.daily_quota if api_key.daily_quota is not None else DEFAULT_DAILY_QUOTA
+        key = (api_key.id, datetime.now(timezone.utc).date())
+
+        headers = {
+            "X-RateLimit-Limit": str(round(bucket.rate * 60)),
+        }
+
+        if quota:
+            # One DB read per key and day per process, then in-memory
+            if key not in self.flushed:
+                await self._load_usage(key)
+            used = self.used_today(key)
+            headers["X-RateLimit-Quota-Limit"] = str(quota)
+            headers["X-RateLimit-Quota-Reset"] = str(_seconds_until_midnight_utc())
+            if used >= quota:
+                headers["X-RateLimit-Quota-Remaining"] = "0"
+                headers["Retry-After"] = headers["X-RateLimit-Quota-Reset"]
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Daily quota exceeded",
+                    headers=headers,
+                )
+
+        if not bucket.take():
+            headers["X-RateLimit-Remaining"] = "0"
+            headers["X-RateLimit-Reset"] = str(bucket.reset_after())
+            headers["Retry-After"] = str(bucket.retry_after())
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers=headers,
+            )
+
+        self.pending[key] = self.pending.get(key, 0) + 1
+        headers["X-RateLimit-Remaining"] = str(int(bucket.tokens))
+        headers["X-RateLimit-Reset"] = str(bucket.reset_after())
+        if quota:
+            headers["X-RateLimit-Quota-Remaining"] = str(max(0, quota - self.used_today(key)))
+        return headers
+
+    async def flush(self):
+        """Writes the pending counters to api_key_usage (one upsert per key and day)."""
+        async with self._flush_lock:
+            if not self.pending:
+                return
+            self.in_flight, self.pending = self.pending, {}
+            try:
+                totals = {}
+                async with AsyncSessionLocal() as db:
+                    for (api_key_id, day), count in self.in_flight.items():
+                        # INSERT ... SELECT: keys revoked meanwhile are skipped instead of failing the batch
+                        stmt = insert(models.ApiKeyUsage).from_select(
+                            ["api_key_id", "day", "requests"],
+                            select(models.ApiKey.id, literal(day, Date), literal(count, BigInteger))
+                            .where(models.ApiKey.id == api_key_id),
+                        )
+                        stmt = stmt.on_conflict_do_update(
+                            index_elements=[models.ApiKeyUsage.api_key_id, models.ApiKeyUsage.day],
+                            set_={"requests": models.ApiKeyUsage.requests + stmt.excluded.requests},
+                        ).returning(models.ApiKeyUsage.requests)
+                        result = await db.execute(stmt)
+                        total = result.scalar_one_or_none()
+                        if total is not None:
+                            totals[(api_key_id, day)] = total
+                    await db.commit()
+                # Totals across all processes
+                self.flushed.update(totals)
+            except Exception as e:
+                logger.error(f"Failed to flush API key usage: {e}")
+                # Keep the counts for the next attempt
+                for key, count in self.in_flight.items():
+                    self.pending[key] = self.pending.get(key, 0) + count
+            finally:
+                self.in_flight = {}
+
+            # Previous days are done
+            today = datetime.now(timezone.utc).date()
+            for key in [key for key in self.flushed if key[1] != today and key not in self.pending]:
+                del self.flushed[key]
+
+    async def run_flusher(self):
+        while True:
+            await asyncio.sleep(USAGE_FLUSH_SECONDS)
+            await self.flush()
+
+rate_limiter = RateLimiter()
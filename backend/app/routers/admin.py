@@ -0,0 +1,132 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from datetime import datetime
+from typing import Literal, Optional
+from uuid import UUID
+import json
+
+from shared.core import models, schemas, database
+from shared.core.cleanup import DEFAULT_BATCH_SIZE, DEFAULT_THROTTLE_MS
+from backend.app import auth, jobs
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(auth.get_current_user)])
+
+@router.post("/sites/{site_id}/cleanup", response_model=schemas.SiteCleanupRead, status_code=status.HTTP_202_ACCEPTED)
+async def start_site_cleanup(
+    site_id: UUID,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=10000),
+    throttle_ms: int = Query(DEFAULT_THROTTLE_MS, ge=0, le=60000),
+    db: AsyncSession = Depends(database.get_db)
+):
+    """
+    Deletes all pages and contents of a site in the background, in small batches.
+    Safe to call again: a running job is returned as-is, a finished one resumes with what is left.
+
+    The job lives in this backend process only (unlike re-extraction jobs, it isn't stored):
+    with several API processes, GET / DELETE find it only when they reach the same one.
+    """
+    result = await db.execute(select(models.Site.id).where(models.Site.id == site_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Site not found")
+
+    return jobs.start_site_cleanup(site_id, batch_size=batch_size, throttle_ms=throttle_ms)
+
+@router.get("/sites/{site_id}/cleanup", response_model=schemas.SiteCleanupRead)
+async def get_site_cleanup(site_id: UUID):
+    """The cleanup job of the site started in this backend process (see start_site_cleanup)."""
+    job = jobs.get_site_cleanup(site_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="No cleanup job for this site in this backend process")
+    return job
+
+@router.delete("/sites/{site_id}/cleanup", response_model=schemas.SiteCleanupRead)
+async def cancel_site_cleanup(site_id: UUID):
+    """Cancels the cleanup job of the site started in this backend process (see start_site_cleanup)."""
+    job = jobs.get_site_cleanup(site_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="No cleanup job for this site in this backend process")
+    job.cancel()
+    return job
+
+@router.post("/worker/profile", status_code=status.HTTP_202_ACCEPTED)
+async def profile_worker(
+    seconds: int = Query(30, ge=1, le=600),
+    site_id: Optional[UUID] = None,
+    mode: Literal["sample", "cprofile"] = "sample",
+    memory: bool = False,
+    db: AsyncSession = Depends(database.get_db)
+):
+    """
+    Asks the worker to profile itself for `seconds`, or for one scrape of `site_id`.
+    The worker writes the results to its WORKER_PROFILE_DIR and reports the file paths in the logs.
+    """
+    payload = {"command": "profile", "seconds": seconds, "mode": mode, "memory": memory}
+    if site_id:
+        payload["site_id"] = str(site_id)
+    await db.execute(select(func.pg_notify("worker_commands", json.dumps(payload))))
+    await db.commit()
+    return {"message": "Profile requested"}
+
+@router.post("/reextract", response_model=schemas.ReextractionJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def start_reextraction(
+    site_id: Optional[UUID] = None,
+    scraped_from: Optional[datetime] = None,
+    scraped_to: Optional[datetime] = None,
+    extraction_method: Optional[str] = None,
+    db: AsyncSession = Depends(database.get_db)
+):
+    """
+    Runs the current extractors again over the stored raw_html of the matching pages, in the worker.
+    Nothing is fetched. Filters: a site, a scraped_at range, the extraction method the content was stored with.
+    """
+    if extraction_method and extraction_method not in models.EXTRACTION_METHODS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown extraction_method {extraction_method!r} (expected one of {', '.join(models.EXTRACTION_METHODS)})",
+        )
+    if site_id:
+        result = await db.execute(select(models.Site.id).where(models.Site.id == site_id))
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Site not found")
+
+    job = models.ReextractionJob(
+        site_id=site_id, scraped_from=scraped_from, scraped_to=scraped_to, extraction_method=extraction_method
+    )
+    db.add(job)
+    await db.flush()
+    await db.execute(select(func.pg_notify("worker_commands", json.dumps({"command": "reextract", "job_id": str(job.id)}))))
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+@router.get("/reextract/{job_id}", response_model=schemas.ReextractionJobRead)
+async def get_reextraction(job_id: UUID, db: AsyncSession = Depends(database.get_db)):
+    job = await db.get(models.ReextractionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Re-extraction job not found")
+    return job
+
+@router.post("/reextract/{job_id}/resume", response_model=schemas.ReextractionJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def resume_reextraction(job_id: UUID, db: AsyncSession = Depends(database.get_db)):
+    """Continues a stopped, failed or cancelled job after its last committed batch."""
+    job = await db.get(models.ReextractionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Re-extraction job not found")
+    if job.status == "finished":
+        raise HTTPException(status_code=400, detail="Re-extraction job already finished")
+    await db.execute(select(func.pg_notify("worker_commands", json.dumps({"command": "reextract", "job_id": str(job.id)}))))
+    await db.commit()
+    return job
+
+@router.delete("/reextract/{job_id}", response_model=schemas.ReextractionJobRead)
+async def cancel_reextraction(job_id: UUID, db: AsyncSession = Depends(database.get_db)):
+    """The worker stops before its next batch; what was written so far stays."""
+    job = await db.get(models.ReextractionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Re-extraction job not found")
+    if job.status in ("pending", "running"):
+        job.status = "cancelled"
+        await db.commit()
+        await db.refresh(job)
+    return job
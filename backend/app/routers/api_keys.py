@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 import secrets
 import hashlib
@@ -10,16 +10,26 @@ import uuid
 
 from shared.core.database import get_db
 from shared.core.models import ApiKey
+from backend.app.auth_cache import publish_invalidation
 
 router = APIRouter(prefix="/api-keys", tags=["api-keys"])
 # Authenticated endpoints (assuming auth is handled globally or we need to add depends)
 # For now, assuming internal dashboard usage implies checked auth or open for dev (based on user context).
 # Ideally, we should add user auth dependency here if the app has it.
 
-class ApiKeyCreate(BaseModel):
+class ApiKeyLimits(BaseModel):
+    # None = backend defaults (PUBLIC_RATE_LIMIT_PER_MINUTE, PUBLIC_RATE_LIMIT_BURST, PUBLIC_DAILY_QUOTA)
+    rate_limit_per_minute: Optional[int] = Field(None, ge=1)
+    rate_limit_burst: Optional[int] = Field(None, ge=1)
+    daily_quota: Optional[int] = Field(None, ge=0)  # 0 = unlimited
+
+class ApiKeyCreate(ApiKeyLimits):
     name: str
 
-class ApiKeyResponse(BaseModel):
+class ApiKeyUpdate(ApiKeyLimits):
+    name: Optional[str] = None
+
+class ApiKeyResponse(ApiKeyLimits):
     id: uuid.UUID
     name: str
     prefix: str
@@ -43,7 +53,10 @@ async def create_api_key(data: ApiKeyCreate, db: AsyncSession = Depends(get_db))
         key_hash=key_hash,
         name=data.name,
         prefix=prefix,
-        is_active=True
+        is_active=True,
+        rate_limit_per_minute=data.rate_limit_per_minute,
+        rate_limit_burst=data.rate_limit_burst,
+        daily_quota=data.daily_quota
     )
     
     db.add(new_key)
@@ -57,6 +70,9 @@ async def create_api_key(data: ApiKeyCreate, db: AsyncSession = Depends(get_db))
         prefix=new_key.prefix,
         created_at=new_key.created_at,
         is_active=new_key.is_active,
+        rate_limit_per_minute=new_key.rate_limit_per_minute,
+        rate_limit_burst=new_key.rate_limit_burst,
+        daily_quota=new_key.daily_quota,
         key=raw_key
     )
 
@@ -66,8 +82,27 @@ async def list_api_keys(db: AsyncSession = Depends(get_db)):
     result = await db.execute(query)
     return result.scalars().all()
 
+@router.patch("/{id}", response_model=ApiKeyResponse)
+async def update_api_key(id: uuid.UUID, data: ApiKeyUpdate, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(ApiKey).where(ApiKey.id == id))
+    api_key = result.scalar_one_or_none()
+    if not api_key:
+        raise HTTPException(status_code=404, detail="API Key not found")
+
+    for key, value in data.dict(exclude_unset=True).items():
+        setattr(api_key, key, value)
+
+    # Cached copies carry the old limits
+    await publish_invalidation(db, "api_key", api_key.key_hash)
+    await db.commit()
+    await db.refresh(api_key)
+    return api_key
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
 async def revoke_api_key(id: uuid.UUID, db: AsyncSession = Depends(get_db)):
-    query = delete(ApiKey).where(ApiKey.id == id)
-    await db.execute(query)
+    query = delete(ApiKey).where(ApiKey.id == id).returning(ApiKey.key_hash)
+    result = await db.execute(query)
+    for key_hash in result.scalars().all():
+        # Every backend process drops the key as soon as the delete commits
+        await publish_invalidation(db, "api_key", key_hash)
     await db.commit()
@@ -1,29 +1,74 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, or_, func
+from sqlalchemy import select, desc, or_, func, tuple_
 from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 import math
 
 from shared.core import models, schemas, database
+from shared.core.search import build_search_query
 from backend.app import auth
+from backend.app.pagination import encode_cursor, decode_cursor, estimate_count
+from backend.app.cache import cached_json_response
+from backend.app.projection import parse_list_param, text_column, preview
 
 router = APIRouter(prefix="/feed", tags=["feed"], dependencies=[Depends(auth.get_current_user)])
 
+FEED_FIELDS = list(schemas.PageDetail.model_fields)
+FEED_INCLUDES = ["content"]
+
 @router.get("/new", response_model=schemas.PaginatedFeedResponse)
 async def get_new_feed(
+    request: Request,
     since: datetime,
     site_id: UUID = Query(None),
     q: Optional[str] = Query(None),
+    lang: Optional[str] = Query(None, description="Language of q (e.g. 'es', 'en'), selects the text search config"),
+    sort: str = Query("recent", pattern="^(recent|relevance)$"),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous response (keyset pagination, replaces page)"),
+    count: str = Query("estimate", pattern="^(exact|estimate|none)$", description="'exact' runs a full count(*)"),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return (default: all)"),
+    include: Optional[str] = Query(None, description="'content' returns the full extracted text instead of a preview"),
     db: AsyncSession = Depends(database.get_db)
 ):
     """
     Devuelve páginas processed donde (scraped_at > since) o (first_seen_at > since).
-    Incluye extracted_text completo.
+    latest_content.extracted_text es un extracto (truncated=true si se cortó);
+    include=content lo devuelve completo. fields=id,title,... limita los campos de cada item.
+    Con q, sort=relevance ordena por ranking (título > resumen > texto).
+    Para recorrer el feed usar cursor=next_cursor (costo constante en cualquier página);
+    sort=relevance no tiene cursor y se pagina con page. total es una estimación salvo
+    con count=exact (count(*) completo).
     """
+    if cursor and sort == "relevance":
+        raise HTTPException(status_code=400, detail="cursor can't be used with sort=relevance, use page")
+    wanted = parse_list_param(fields, FEED_FIELDS, "fields") or FEED_FIELDS
+    full_text = "content" in (parse_list_param(include, FEED_INCLUDES, "include") or [])
+
+    # Served from the response cache until the worker reports new content (see backend.app.cache)
+    return await cached_json_response(
+        request,
+        lambda: _build_feed(since, site_id, q, lang, sort, page, page_size, cursor, count, wanted, full_text, db),
+        site_id=site_id,
+    )
+
+async def _build_feed(
+    since: datetime,
+    site_id: Optional[UUID],
+    q: Optional[str],
+    lang: Optional[str],
+    sort: str,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    count: str,
+    wanted: list[str],
+    full_text: bool,
+    db: AsyncSession,
+) -> dict:
     # Base conditions
     conditions = [
         models.Page.status == models.PageStatus.PROCESSED,
@@ -37,71 +82,104 @@ async def get_new_feed(
     if site_id:
         conditions.append(models.Page.site_id == site_id)
 
+    # Keyset order: (sort_at, id) descending, served by ix_pages_feed_order
+    order_by = [desc(models.Page.sort_at), desc(models.Page.id)]
+    keyset = True
+
     if q:
-        # Use PostgreSQL Full Text Search for much better performance
-        # We use 'spanish' to match the GIN indexes created in the models
-        ts_query = func.plainto_tsquery('spanish', q)
-        conditions.append(or_(
-            func.to_tsvector('spanish', models.Page.title).op('@@')(ts_query),
-            models.Page.contents.any(
-                func.to_tsvector('spanish', models.PageContent.extracted_text).op('@@')(ts_query)
-            )
-        ))
+        # One GIN index scan over the stored, weighted search vector (see shared.core.search)
+        ts_query = build_search_query(q, lang)
+        conditions.append(models.Page.search_vector.op('@@')(ts_query))
+        if sort == "relevance":
+            order_by = [desc(func.ts_rank_cd(models.Page.search_vector, ts_query))] + order_by
+            keyset = False
 
     # Count query
-    count_query = select(func.count(models.Page.id)).join(
-        models.Site, models.Page.site_id == models.Site.id
-    ).where(*conditions)
+    total = None
+    if count != "none":
+        matching = select(models.Page.id).join(
+            models.Site, models.Page.site_id == models.Site.id
+        ).where(*conditions)
+        if count == "estimate":
+            total = await estimate_count(db, matching)
+        else:
+            total_result = await db.execute(select(func.count()).select_from(matching.subquery()))
+            total = total_result.scalar() or 0
     
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-    
-    # Data query
-    offset = (page - 1) * page_size
-    query = select(models.Page, models.Site.name.label("site_name")).join(
+    # Data query: only the requested columns, never whole ORM objects
+    columns = [models.Page.id, models.Page.sort_at.label("sort_at")]
+    for field in wanted:
+        if field == "site_name":
+            columns.append(models.Site.name.label("site_name"))
+        elif field not in ("id", "latest_content"):
+            columns.append(getattr(models.Page, field))
+    query = select(*columns).join(
         models.Site, models.Page.site_id == models.Site.id
-    ).where(*conditions).order_by(
-        desc(func.coalesce(models.Page.published_at, models.Page.scraped_at, models.Page.first_seen_at))
-    ).offset(offset).limit(page_size)
-    
-    result = await db.execute(query)
+    ).where(*conditions).order_by(*order_by)
+
+    if cursor and keyset:
+        cursor_sort_at, cursor_id = decode_cursor(cursor)
+        query = query.where(tuple_(models.Page.sort_at, models.Page.id) < tuple_(cursor_sort_at, cursor_id))
+    else:
+        query = query.offset((page - 1) * page_size)
+
+    # One extra row tells us whether there is a next page
+    result = await db.execute(query.limit(page_size + 1))
     rows = result.all()
-    
-    # Get all page IDs to fetch contents in one go
-    page_ids = [page_obj.id for page_obj, _ in rows]
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    next_cursor = None
+    if keyset and has_more and rows:
+        next_cursor = encode_cursor(rows[-1].sort_at, rows[-1].id)
     
     # Fetch latest content for all these pages in one batch
     # We use a subquery with DISTINCT ON to get only the latest PageContent per page_id
     latest_contents = {}
-    if page_ids:
+    page_ids = [row.id for row in rows]
+    if page_ids and "latest_content" in wanted:
         # PostgreSQL specific DISTINCT ON is very efficient for this
         content_query = (
-            select(models.PageContent)
+            select(
+                models.PageContent.page_id,
+                models.PageContent.id,
+                text_column(models.PageContent.extracted_text, full_text).label("extracted_text"),
+                models.PageContent.metadata_.label("metadata_"),
+                models.PageContent.created_at,
+            )
             .where(models.PageContent.page_id.in_(page_ids))
             .distinct(models.PageContent.page_id)
             .order_by(models.PageContent.page_id, desc(models.PageContent.created_at))
         )
         content_result = await db.execute(content_query)
-        for content in content_result.scalars().all():
-            latest_contents[content.page_id] = content
+        for content in content_result.all():
+            text, truncated = preview(content.extracted_text, full_text)
+            latest_contents[content.page_id] = schemas.PageContentRead(
+                id=content.id,
+                extracted_text=text,
+                truncated=truncated,
+                metadata_=content.metadata_,
+                created_at=content.created_at,
+            )
 
     items = []
-    for page_obj, site_name in rows:
-        page_detail = schemas.PageDetail.from_orm(page_obj)
-        page_detail.site_name = site_name
-        
-        content = latest_contents.get(page_obj.id)
-        if content:
-             page_detail.latest_content = schemas.PageContentRead.from_orm(content)
-        
-        items.append(page_detail)
+    for row in rows:
+        item = {field: row._mapping[field] for field in wanted if field != "latest_content"}
+        if "latest_content" in wanted:
+            item["latest_content"] = latest_contents.get(row.id)
+        items.append(item)
     
-    total_pages = math.ceil(total / page_size) if page_size > 0 else 0
+    total_pages = None
+    if total is not None:
+        total_pages = math.ceil(total / page_size) if page_size > 0 else 0
         
-    return schemas.PaginatedFeedResponse(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    # Plain dict: items only carry the requested fields, which PageDetail can't represent
+    return {
+        "items": items,
+        "total": total,
+        "total_estimated": count == "estimate",
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "next_cursor": next_cursor,
+    }
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc, func
 from typing import List, Optional
@@ -7,6 +7,7 @@ from datetime import datetime
 
 from shared.core import models, schemas, database
 from backend.app import auth
+from backend.app.cache import cached_json_response
 
 router = APIRouter(prefix="/pages", tags=["pages"], dependencies=[Depends(auth.get_current_user)])
 
@@ -44,7 +45,14 @@ async def read_pages(
     return result.scalars().all()
 
 @router.get("/{page_id}", response_model=schemas.PageDetail)
-async def read_page_detail(page_id: UUID, db: AsyncSession = Depends(database.get_db)):
+async def read_page_detail(page_id: UUID, request: Request, db: AsyncSession = Depends(database.get_db)):
+    return await cached_json_response(
+        request,
+        lambda: _build_page_detail(page_id, db),
+        site_of=lambda page_detail: page_detail.site_id,
+    )
+
+async def _build_page_detail(page_id: UUID, db: AsyncSession) -> schemas.PageDetail:
     result = await db.execute(select(models.Page).where(models.Page.id == page_id))
     page = result.scalar_one_or_none()
     if not page:
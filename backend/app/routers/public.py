@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query, Request
+from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, true
 from pydantic import BaseModel
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 import hashlib
+import json
+from contextlib import aclosing
 
 from shared.core.database import get_db
 from shared.core import models
+from backend.app.cache import cached_json_response
+from backend.app.auth_cache import api_key_cache
+from backend.app.rate_limit import rate_limiter
+from backend.app.projection import parse_list_param, text_column, preview
+from backend.app.export import PageExporter
+from backend.app.events import page_event_broker
 
 router = APIRouter(prefix="/public", tags=["public"])
 
@@ -16,15 +26,21 @@ async def verify_api_key(x_api_key: str = Header(...), db: AsyncSession = Depend
     """
     Dependency to verify the API key.
     The key provided by the client is hashed and compared with the stored hash.
+    Lookups (including misses) are cached; revoke_api_key invalidates them in every process.
     """
     key_hash = hashlib.sha256(x_api_key.encode()).hexdigest()
     
-    query = select(models.ApiKey).where(
-        models.ApiKey.key_hash == key_hash,
-        models.ApiKey.is_active == True
-    )
-    result = await db.execute(query)
-    api_key = result.scalar_one_or_none()
+    hit, api_key = api_key_cache.get(key_hash)
+    if not hit:
+        query = select(models.ApiKey).where(
+            models.ApiKey.key_hash == key_hash,
+            models.ApiKey.is_active == True
+        )
+        result = await db.execute(query)
+        api_key = result.scalar_one_or_none()
+        if api_key is not None:
+            db.expunge(api_key)
+        api_key_cache.set(key_hash, api_key)
     
     if not api_key:
         raise HTTPException(
@@ -33,6 +49,13 @@ async def verify_api_key(x_api_key: str = Header(...), db: AsyncSession = Depend
         )
     return api_key
 
+async def enforce_rate_limit(api_key: models.ApiKey = Depends(verify_api_key)) -> dict[str, str]:
+    """
+    Dependency applying the key's rate limit and daily quota (429 when exceeded).
+    Returns the X-RateLimit-* headers for the response.
+    """
+    return await rate_limiter.check(api_key)
+
 class PublicPageResponse(BaseModel):
     url: str
     canonical_url: str
@@ -44,6 +67,7 @@ class PublicPageResponse(BaseModel):
     published_at: Optional[datetime]
     scraped_at: Optional[datetime]
     content: Optional[str] = None
+    content_truncated: bool = False
     content_html: Optional[str] = None
     
     class Config:
@@ -58,17 +82,113 @@ class PublicSiteResponse(BaseModel):
     class Config:
         from_attributes = True
 
+PUBLIC_PAGE_FIELDS = [field for field in PublicPageResponse.model_fields if field != "content_truncated"]
+PUBLIC_INCLUDES = ["content", "html"]
+# content_html (the raw HTML) is only returned with include=html
+DEFAULT_PUBLIC_PAGE_FIELDS = [field for field in PUBLIC_PAGE_FIELDS if field != "content_html"]
+
+def resolve_public_projection(fields: Optional[str], include: Optional[str]) -> tuple[list[str], bool]:
+    """Parses fields= / include= into (fields to return, whether content is the full text)."""
+    wanted = list(parse_list_param(fields, PUBLIC_PAGE_FIELDS, "fields") or DEFAULT_PUBLIC_PAGE_FIELDS)
+    includes = parse_list_param(include, PUBLIC_INCLUDES, "include") or []
+    if "html" in includes and "content_html" not in wanted:
+        wanted.append("content_html")
+    return wanted, "content" in includes
+
+def _page_fields(wanted: list[str]) -> list[str]:
+    return [field for field in wanted if field not in ("content", "content_html")]
+
+def _content_columns(wanted: list[str], full_text: bool) -> list:
+    """Latest content columns to select: text and HTML only if asked for."""
+    columns = []
+    if "content" in wanted:
+        columns.append(text_column(models.PageContent.extracted_text, full_text).label("content"))
+    if "content_html" in wanted:
+        columns.append(models.PageContent.raw_html.label("content_html"))
+    return columns
+
+def public_page_item(page_row, content_row, wanted: list[str], full_text: bool) -> dict:
+    """One PublicPageResponse, restricted to the requested fields."""
+    item = {field: page_row._mapping[field] for field in _page_fields(wanted)}
+    if "content" in wanted:
+        item["content"], item["content_truncated"] = preview(content_row.content if content_row else None, full_text)
+    if "content_html" in wanted:
+        item["content_html"] = content_row.content_html if content_row else None
+    return item
+
+def public_item_fields(wanted: list[str]) -> list[str]:
+    """Keys of public_page_item() in order."""
+    fields = list(wanted)
+    if "content" in fields:
+        fields.insert(fields.index("content") + 1, "content_truncated")
+    return fields
+
+def _public_pages_query(wanted: list[str], full_text: bool, *extra_columns):
+    """Processed pages with the requested columns and their latest content (LATERAL join)."""
+    query = select(
+        models.Page.id, *extra_columns, *[getattr(models.Page, field) for field in _page_fields(wanted)]
+    ).where(
+        models.Page.status == models.PageStatus.PROCESSED,
+        models.Page.scraped_at.isnot(None)
+    )
+
+    content_columns = _content_columns(wanted, full_text)
+    if content_columns:
+        latest_content = (
+            select(*content_columns)
+            .where(models.PageContent.page_id == models.Page.id)
+            .order_by(desc(models.PageContent.created_at))
+            .limit(1)
+            .lateral("latest_content")
+        )
+        query = query.add_columns(*latest_content.c).outerjoin(latest_content, true())
+    return query
+
+def build_export_query(
+    site_id: UUID,
+    wanted: list[str],
+    full_text: bool,
+    scraped_from: Optional[datetime] = None,
+    scraped_to: Optional[datetime] = None,
+):
+    """
+    All processed pages of a site with their latest content, in one query to stream.
+    Ordered by id: walks ix_pages_site_id_id without sorting, so the server holds no result set either.
+    """
+    query = _public_pages_query(wanted, full_text).where(models.Page.site_id == site_id)
+    if scraped_from:
+        query = query.where(models.Page.scraped_at >= scraped_from)
+    if scraped_to:
+        query = query.where(models.Page.scraped_at < scraped_to)
+    return query.order_by(models.Page.id)
+
 @router.get("/sites/{site_id}", response_model=PublicSiteResponse)
 async def get_site_content(
     site_id: UUID, 
+    request: Request,
     limit: int = Query(100, le=100),
-    api_key: models.ApiKey = Depends(verify_api_key),
+    fields: Optional[str] = Query(None, description="Comma-separated page fields to return (default: all but content_html)"),
+    include: Optional[str] = Query(None, description="'content' for the full text instead of a preview, 'html' for content_html"),
+    rate_limit_headers: dict[str, str] = Depends(enforce_rate_limit),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Fetch content for a specific site.
     Returns site details and the last N processed pages.
+    `content` is a preview unless include=content; content_html is only sent with include=html.
+    Responses carry an ETag; send it back in If-None-Match to get a 304 when nothing changed.
+    For the whole corpus use /public/sites/{site_id}/export.
     """
+    wanted, full_text = resolve_public_projection(fields, include)
+
+    return await cached_json_response(
+        request,
+        lambda: _build_site_content(site_id, limit, wanted, full_text, db),
+        site_id=site_id,
+        headers=rate_limit_headers,
+    )
+
+async def _build_site_content(site_id: UUID, limit: int, wanted: list[str], full_text: bool, db: AsyncSession) -> dict:
     # Get Site
     site_query = select(models.Site).where(models.Site.id == site_id)
     result = await db.execute(site_query)
@@ -77,9 +197,9 @@ async def get_site_content(
     if not site:
         raise HTTPException(status_code=404, detail="Site not found")
         
-    # Get Pages (Processed only, latest first)
+    # Get Pages (Processed only, latest first), only the requested columns
     pages_query = (
-        select(models.Page)
+        select(models.Page.id, *[getattr(models.Page, field) for field in _page_fields(wanted)])
         .where(
             models.Page.site_id == site_id,
             models.Page.status == models.PageStatus.PROCESSED,
@@ -90,46 +210,160 @@ async def get_site_content(
     )
     
     pages_result = await db.execute(pages_query)
-    pages = pages_result.scalars().all()
-    
-    # Get all page IDs to fetch contents in one go
-    page_ids = [page.id for page in pages]
+    pages = pages_result.all()
     
     # Fetch latest content for all these pages in one batch
+    content_columns = _content_columns(wanted, full_text)
     latest_contents = {}
-    if page_ids:
+    page_ids = [page.id for page in pages]
+    if page_ids and content_columns:
         # PostgreSQL specific DISTINCT ON is very efficient for this
         content_query = (
-            select(models.PageContent)
+            select(models.PageContent.page_id, *content_columns)
             .where(models.PageContent.page_id.in_(page_ids))
             .distinct(models.PageContent.page_id)
             .order_by(models.PageContent.page_id, desc(models.PageContent.created_at))
         )
         content_result = await db.execute(content_query)
-        for content in content_result.scalars().all():
+        for content in content_result.all():
             latest_contents[content.page_id] = content
     
-    public_pages = []
-    for page in pages:
-        content_obj = latest_contents.get(page.id)
-        
-        public_pages.append(PublicPageResponse(
-            url=page.url,
-            canonical_url=page.canonical_url,
-            title=page.title,
-            author=page.author,
-            summary=page.summary,
-            image_url=page.image_url,
-            language=page.language,
-            published_at=page.published_at,
-            scraped_at=page.scraped_at,
-            content=content_obj.extracted_text if content_obj else None,
-            content_html=content_obj.raw_html if content_obj else None
-        ))
+    public_pages = [
+        public_page_item(page, latest_contents.get(page.id), wanted, full_text)
+        for page in pages
+    ]
     
-    return PublicSiteResponse(
-        id=site.id,
-        name=site.name,
-        base_url=site.base_url,
-        pages=public_pages
+    return {
+        "id": site.id,
+        "name": site.name,
+        "base_url": site.base_url,
+        "pages": public_pages,
+    }
+
+@router.get("/sites/{site_id}/export")
+async def export_site_content(
+    site_id: UUID,
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    scraped_from: Optional[datetime] = Query(None),
+    scraped_to: Optional[datetime] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated page fields to export (default: all but content_html)"),
+    include: Optional[str] = Query(None, description="'content' for the full text instead of a preview, 'html' for content_html"),
+    rate_limit_headers: dict[str, str] = Depends(enforce_rate_limit),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Streams every processed page of a site (optionally within a scraped_at range) as
+    NDJSON, CSV or Parquet, with the same fields as /public/sites/{site_id}.
+    Rows are read through a server-side cursor, so memory stays flat for any corpus size.
+    """
+    wanted, full_text = resolve_public_projection(fields, include)
+    try:
+        exporter = PageExporter(format, public_item_fields(wanted), PublicPageResponse)
+    except ImportError:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Parquet export is not available (pyarrow is not installed)")
+
+    site = await db.get(models.Site, site_id)
+    if not site:
+        raise HTTPException(status_code=404, detail="Site not found")
+
+    query = build_export_query(site_id, wanted, full_text, scraped_from, scraped_to)
+    return StreamingResponse(
+        exporter.stream(query, lambda row: public_page_item(row, row, wanted, full_text)),
+        media_type=exporter.media_type,
+        headers={**rate_limit_headers, "Content-Disposition": f'attachment; filename="{site_id}.{format}"'},
+    )
+
+@router.get("/changes")
+async def get_changes(
+    after: int = Query(0, ge=0, description="next_after of the previous response (0: from the beginning)"),
+    limit: int = Query(100, ge=1, le=1000),
+    site_id: Optional[UUID] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated page fields to return (default: all but content_html)"),
+    include: Optional[str] = Query(None, description="'content' for the full text instead of a preview, 'html' for content_html"),
+    rate_limit_headers: dict[str, str] = Depends(enforce_rate_limit),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Incremental sync: pages processed or re-processed after the change sequence `after`,
+    oldest change first. Store next_after and send it as `after` on the next call; a page
+    changed again shows up again with its new change_seq. Sequence values become visible
+    in commit order, so nothing is skipped between calls.
+    """
+    wanted, full_text = resolve_public_projection(fields, include)
+    query = _public_pages_query(wanted, full_text, models.Page.change_seq, models.Page.site_id).where(
+        models.Page.change_seq > after,
+        models.Page.site_id.in_(select(models.Site.id).where(models.Site.deleted == False))
+    )
+    if site_id:
+        query = query.where(models.Page.site_id == site_id)
+    # One range scan on ix_pages_change_seq
+    result = await db.execute(query.order_by(models.Page.change_seq).limit(limit + 1))
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    changes = [
+        {"change_seq": row.change_seq, "site_id": row.site_id, **public_page_item(row, row, wanted, full_text)}
+        for row in rows
+    ]
+    return JSONResponse(
+        jsonable_encoder({
+            "changes": changes,
+            "next_after": rows[-1].change_seq if rows else after,
+            "has_more": has_more,
+        }),
+        headers=rate_limit_headers,
+    )
+
+SSE_HEARTBEAT_SECONDS = 15
+
+@router.get("/events")
+async def stream_page_events(
+    site_id: Optional[UUID] = Query(None),
+    last_event_id: Optional[int] = Query(None, description="Resume after this event (same as the Last-Event-ID header)"),
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID"),
+    rate_limit_headers: dict[str, str] = Depends(enforce_rate_limit),
+):
+    """
+    Server-Sent Events stream of new ("created") and re-processed ("updated") articles,
+    optionally for one site. Each event's id can be sent back as Last-Event-ID
+    (browsers' EventSource does it on reconnect) to resume without losing events.
+    """
+    after = last_event_id_header if last_event_id_header is not None else last_event_id
+
+    async def event_source():
+        async with aclosing(page_event_broker.stream(after, site_id, SSE_HEARTBEAT_SECONDS)) as batches:
+            async for events in batches:
+                if not events:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield "".join(
+                    f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+                    for event in events
+                )
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={**rate_limit_headers, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/events/poll")
+async def poll_page_events(
+    after: int = Query(0, ge=0, description="Last event id received (0: from the oldest retained event)"),
+    site_id: Optional[UUID] = Query(None),
+    timeout: float = Query(30, ge=0, le=60),
+    rate_limit_headers: dict[str, str] = Depends(enforce_rate_limit),
+):
+    """
+    Long-poll alternative to /public/events: returns the events after `after` as soon as
+    there are any, or an empty list after `timeout` seconds. Pass last_event_id as the next `after`.
+    """
+    events = []
+    async with aclosing(page_event_broker.stream(after, site_id, timeout)) as batches:
+        async for events in batches:
+            break
+    return JSONResponse(
+        {"events": events, "last_event_id": max([event["id"] for event in events], default=after)},
+        headers=rate_limit_headers,
     )
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from typing import List
 from uuid import UUID
 import json
 
 from shared.core import models, schemas, database
-from backend.app import auth
+from backend.app import auth, jobs
+from backend.app.cache import response_cache, publish_site_invalidation
 
 router = APIRouter(prefix="/sites", tags=["sites"], dependencies=[Depends(auth.get_current_user)])
 
@@ -20,25 +21,25 @@ async def create_site(site: schemas.SiteCreate, db: AsyncSession = Depends(datab
 
 @router.get("/", response_model=List[schemas.SiteRead])
 async def read_sites(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(database.get_db)):
+    # Counters are kept up to date by triggers on pages (see models.SiteStats): a PK lookup per site
     stmt = (
-        select(
-            models.Site, 
-            func.count(models.Page.id).filter(models.Page.status == models.PageStatus.PROCESSED).label("pages_count"),
-            func.count(models.Page.id).filter(models.Page.status == models.PageStatus.NEW).label("pending_count")
-        )
-        .outerjoin(models.Page, models.Site.id == models.Page.site_id)
+        select(models.Site, models.SiteStats)
+        .outerjoin(models.SiteStats, models.SiteStats.site_id == models.Site.id)
         .where(models.Site.deleted == False)
-        .group_by(models.Site.id)
         .offset(skip).limit(limit)
     )
     result = await db.execute(stmt)
-    
+
     sites_with_counts = []
-    for site, p_count, pending in result:
-        setattr(site, "pages_count", p_count)
-        setattr(site, "pending_count", pending)
+    for site, stats in result:
+        setattr(site, "pages_count", stats.processed_count if stats else 0)
+        setattr(site, "pending_count", stats.new_count if stats else 0)
+        setattr(site, "failed_count", stats.failed_count if stats else 0)
+        setattr(site, "skipped_count", stats.skipped_count if stats else 0)
+        for field in ("last_processed_at", "last_run_finished_at", "last_run_processed", "last_run_failed"):
+            setattr(site, field, getattr(stats, field) if stats else None)
         sites_with_counts.append(site)
-        
+
     return sites_with_counts
 
 @router.get("/{site_id}", response_model=schemas.SiteRead)
@@ -49,6 +50,17 @@ async def read_site(site_id: UUID, db: AsyncSession = Depends(database.get_db)):
         raise HTTPException(status_code=404, detail="Site not found")
     return site
 
+@router.get("/{site_id}/runs", response_model=List[schemas.ScrapeRunRead])
+async def read_site_runs(site_id: UUID, limit: int = Query(20, ge=1, le=200), db: AsyncSession = Depends(database.get_db)):
+    """Latest scrape runs of the site, newest first, with their per-stage timings."""
+    result = await db.execute(
+        select(models.ScrapeRun)
+        .where(models.ScrapeRun.site_id == site_id)
+        .order_by(models.ScrapeRun.started_at.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
+
 @router.patch("/{site_id}", response_model=schemas.SiteRead)
 async def update_site(site_id: UUID, site_update: schemas.SiteUpdate, db: AsyncSession = Depends(database.get_db)):
     result = await db.execute(select(models.Site).where(models.Site.id == site_id))
@@ -60,8 +72,10 @@ async def update_site(site_id: UUID, site_update: schemas.SiteUpdate, db: AsyncS
     for key, value in update_data.items():
         setattr(db_site, key, value)
     
+    await publish_site_invalidation(db, site_id)
     await db.commit()
     await db.refresh(db_site)
+    response_cache.invalidate_site(site_id)
     return db_site
 
 @router.post("/{site_id}/run")
@@ -93,5 +107,10 @@ async def delete_site(site_id: UUID, db: AsyncSession = Depends(database.get_db)
         raise HTTPException(status_code=404, detail="Site not found")
     
     db_site.deleted = True
+    await publish_site_invalidation(db, site_id)
     await db.commit()
+    response_cache.invalidate_site(site_id)
+
+    # Reclaim the site's pages in the background (batched, see SiteDataCleaner)
+    jobs.start_site_cleanup(site_id)
     return None
@@ -0,0 +1,163 @@
+"""site_stats counters maintained by triggers
+
+Revision ID: 1c5a8e3f7b90
+Revises: b6e1d4c8f302
+Create Date: 2026-10-19 15:36:50.118274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c5a8e3f7b90'
+down_revision: Union[str, None] = 'b6e1d4c8f302'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Applies (site_id, status, scraped_at, n) deltas, n = +1 / -1 per row
+UPSERT_DELTAS = """
+        INSERT INTO site_stats AS s (site_id, new_count, processed_count, failed_count, skipped_count, last_processed_at)
+        SELECT
+            site_id,
+            coalesce(sum(n) FILTER (WHERE status = 'NEW'), 0),
+            coalesce(sum(n) FILTER (WHERE status = 'PROCESSED'), 0),
+            coalesce(sum(n) FILTER (WHERE status = 'FAILED'), 0),
+            coalesce(sum(n) FILTER (WHERE status = 'SKIPPED'), 0),
+            max(scraped_at) FILTER (WHERE status = 'PROCESSED' AND n > 0)
+        FROM ({deltas}) d
+        GROUP BY site_id
+        ON CONFLICT (site_id) DO UPDATE SET
+            new_count = s.new_count + EXCLUDED.new_count,
+            processed_count = s.processed_count + EXCLUDED.processed_count,
+            failed_count = s.failed_count + EXCLUDED.failed_count,
+            skipped_count = s.skipped_count + EXCLUDED.skipped_count,
+            last_processed_at = GREATEST(s.last_processed_at, EXCLUDED.last_processed_at);
+"""
+
+INSERT_DELTAS = "SELECT site_id, status, scraped_at, 1 AS n FROM new_rows"
+DELETE_DELTAS = "SELECT site_id, status, NULL::timestamptz AS scraped_at, -1 AS n FROM old_rows"
+# Only rows whose status (or processed time) changed; last_seen_at bumps etc. cost nothing
+UPDATE_DELTAS = """
+            SELECT n.site_id, n.status, n.scraped_at, 1 AS n
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE n.status IS DISTINCT FROM o.status OR n.scraped_at IS DISTINCT FROM o.scraped_at
+            UNION ALL
+            SELECT o.site_id, o.status, NULL::timestamptz, -1
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE n.status IS DISTINCT FROM o.status OR n.scraped_at IS DISTINCT FROM o.scraped_at
+"""
+
+
+def upgrade() -> None:
+    op.create_table('site_stats',
+    sa.Column('site_id', sa.UUID(), nullable=False),
+    sa.Column('new_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('processed_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('failed_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('skipped_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('last_processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_run_id', sa.UUID(), nullable=True),
+    sa.Column('last_run_finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_run_discovered', sa.Integer(), nullable=True),
+    sa.Column('last_run_processed', sa.Integer(), nullable=True),
+    sa.Column('last_run_failed', sa.Integer(), nullable=True),
+    sa.Column('reconciled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('site_id')
+    )
+
+    # Statement-level triggers with transition tables: one upsert per statement
+    # (a 500-row discovery batch or a cleanup batch), not one per row
+    op.execute(f"""
+        CREATE FUNCTION site_stats_pages_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {UPSERT_DELTAS.format(deltas=INSERT_DELTAS)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {UPSERT_DELTAS.format(deltas=DELETE_DELTAS)}
+            ELSE
+                {UPSERT_DELTAS.format(deltas=UPDATE_DELTAS)}
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER pages_site_stats_insert AFTER INSERT ON pages
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION site_stats_pages_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER pages_site_stats_update AFTER UPDATE ON pages
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION site_stats_pages_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER pages_site_stats_delete AFTER DELETE ON pages
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION site_stats_pages_trigger()
+    """)
+
+    # Last run outcome, when the worker closes a run
+    op.execute("""
+        CREATE FUNCTION site_stats_runs_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO site_stats AS s (site_id, last_run_id, last_run_finished_at, last_run_discovered, last_run_processed, last_run_failed)
+            VALUES (NEW.site_id, NEW.id, NEW.finished_at, NEW.pages_discovered, NEW.pages_processed, NEW.pages_failed)
+            ON CONFLICT (site_id) DO UPDATE SET
+                last_run_id = EXCLUDED.last_run_id,
+                last_run_finished_at = EXCLUDED.last_run_finished_at,
+                last_run_discovered = EXCLUDED.last_run_discovered,
+                last_run_processed = EXCLUDED.last_run_processed,
+                last_run_failed = EXCLUDED.last_run_failed;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER scrape_runs_site_stats AFTER UPDATE OF finished_at ON scrape_runs
+        FOR EACH ROW WHEN (NEW.finished_at IS NOT NULL)
+        EXECUTE FUNCTION site_stats_runs_trigger()
+    """)
+
+    # Backfill
+    op.execute("""
+        INSERT INTO site_stats (site_id, new_count, processed_count, failed_count, skipped_count, last_processed_at, reconciled_at)
+        SELECT
+            s.id,
+            count(p.id) FILTER (WHERE p.status = 'NEW'),
+            count(p.id) FILTER (WHERE p.status = 'PROCESSED'),
+            count(p.id) FILTER (WHERE p.status = 'FAILED'),
+            count(p.id) FILTER (WHERE p.status = 'SKIPPED'),
+            max(p.scraped_at) FILTER (WHERE p.status = 'PROCESSED'),
+            now()
+        FROM sites s LEFT JOIN pages p ON p.site_id = s.id
+        GROUP BY s.id
+    """)
+    op.execute("""
+        UPDATE site_stats st SET
+            last_run_id = r.id,
+            last_run_finished_at = r.finished_at,
+            last_run_discovered = r.pages_discovered,
+            last_run_processed = r.pages_processed,
+            last_run_failed = r.pages_failed
+        FROM (
+            SELECT DISTINCT ON (site_id) * FROM scrape_runs
+            WHERE finished_at IS NOT NULL
+            ORDER BY site_id, finished_at DESC
+        ) r
+        WHERE st.site_id = r.site_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER scrape_runs_site_stats ON scrape_runs")
+    op.execute("DROP FUNCTION site_stats_runs_trigger()")
+    op.execute("DROP TRIGGER pages_site_stats_delete ON pages")
+    op.execute("DROP TRIGGER pages_site_stats_update ON pages")
+    op.execute("DROP TRIGGER pages_site_stats_insert ON pages")
+    op.execute("DROP FUNCTION site_stats_pages_trigger()")
+    op.drop_table('site_stats')
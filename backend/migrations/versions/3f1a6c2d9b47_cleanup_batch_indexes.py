@@ -0,0 +1,29 @@
+"""cleanup batch indexes
+
+Revision ID: 3f1a6c2d9b47
+Revises: db44e8c3e90f
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a6c2d9b47'
+down_revision: Union[str, None] = 'db44e8c3e90f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Key-range batches walk pages by (site_id, id) and delete contents by page_id
+    op.create_index('ix_pages_site_id_id', 'pages', ['site_id', 'id'], unique=False)
+    op.create_index('ix_page_contents_page_id', 'page_contents', ['page_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_page_contents_page_id', table_name='page_contents')
+    op.drop_index('ix_pages_site_id_id', table_name='pages')
@@ -0,0 +1,40 @@
+"""page_events outbox
+
+Revision ID: 4f7c2a9e6d15
+Revises: 9d3b6f1e2a48
+Create Date: 2026-10-19 14:20:44.318706
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f7c2a9e6d15'
+down_revision: Union[str, None] = '9d3b6f1e2a48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # No foreign keys: it's a log, events outlive deleted pages until pruned
+    op.create_table('page_events',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('site_id', sa.UUID(), nullable=False),
+    sa.Column('page_id', sa.UUID(), nullable=False),
+    sa.Column('event_type', sa.String(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_page_events_site_id_id', 'page_events', ['site_id', 'id'], unique=False)
+    op.create_index(op.f('ix_page_events_created_at'), 'page_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_page_events_created_at'), table_name='page_events')
+    op.drop_index('ix_page_events_site_id_id', table_name='page_events')
+    op.drop_table('page_events')
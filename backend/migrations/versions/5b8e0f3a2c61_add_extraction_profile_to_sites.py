@@ -0,0 +1,27 @@
+"""add extraction_profile to sites
+
+Revision ID: 5b8e0f3a2c61
+Revises: a7d25e91c0b3
+Create Date: 2026-10-19 11:48:05.217713
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e0f3a2c61'
+down_revision: Union[str, None] = 'a7d25e91c0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sites', sa.Column('extraction_profile', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sites', 'extraction_profile')
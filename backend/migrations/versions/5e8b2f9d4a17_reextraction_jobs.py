@@ -0,0 +1,44 @@
+"""reextraction_jobs
+
+Revision ID: 5e8b2f9d4a17
+Revises: 7a2d9c4b1e63
+Create Date: 2026-10-19 19:02:47.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b2f9d4a17'
+down_revision: Union[str, None] = '7a2d9c4b1e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('reextraction_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.String(), server_default='pending', nullable=False),
+    sa.Column('site_id', sa.UUID(), nullable=True),
+    sa.Column('scraped_from', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('scraped_to', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('extraction_method', sa.String(), nullable=True),
+    sa.Column('last_content_id', sa.UUID(), nullable=True),
+    sa.Column('contents_done', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('pages_changed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('contents_failed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('reextraction_jobs')
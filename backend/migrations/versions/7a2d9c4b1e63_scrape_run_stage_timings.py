@@ -0,0 +1,30 @@
+"""scrape_runs stage_timings and site index
+
+Revision ID: 7a2d9c4b1e63
+Revises: 1c5a8e3f7b90
+Create Date: 2026-10-19 16:12:04.385917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2d9c4b1e63'
+down_revision: Union[str, None] = '1c5a8e3f7b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('scrape_runs', sa.Column('stage_timings', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    # GET /sites/{site_id}/runs
+    op.create_index('ix_scrape_runs_site_id_started_at', 'scrape_runs', ['site_id', sa.text('started_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scrape_runs_site_id_started_at', table_name='scrape_runs')
+    op.drop_column('scrape_runs', 'stage_timings')
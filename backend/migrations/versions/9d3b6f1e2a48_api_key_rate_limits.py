@@ -0,0 +1,40 @@
+"""api key rate limits and usage
+
+Revision ID: 9d3b6f1e2a48
+Revises: e41f9a07b3d2
+Create Date: 2026-10-19 13:42:17.603295
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3b6f1e2a48'
+down_revision: Union[str, None] = 'e41f9a07b3d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('api_keys', sa.Column('rate_limit_per_minute', sa.Integer(), nullable=True))
+    op.add_column('api_keys', sa.Column('rate_limit_burst', sa.Integer(), nullable=True))
+    op.add_column('api_keys', sa.Column('daily_quota', sa.Integer(), nullable=True))
+
+    op.create_table('api_key_usage',
+    sa.Column('api_key_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('requests', sa.BigInteger(), nullable=False),
+    # Revoking (deleting) a key drops its usage
+    sa.ForeignKeyConstraint(['api_key_id'], ['api_keys.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('api_key_id', 'day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('api_key_usage')
+    op.drop_column('api_keys', 'daily_quota')
+    op.drop_column('api_keys', 'rate_limit_burst')
+    op.drop_column('api_keys', 'rate_limit_per_minute')
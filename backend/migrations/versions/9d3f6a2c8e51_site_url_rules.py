@@ -0,0 +1,27 @@
+"""site_url_rules
+
+Revision ID: 9d3f6a2c8e51
+Revises: 5e8b2f9d4a17
+Create Date: 2026-10-19 20:14:09.336851
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f6a2c8e51'
+down_revision: Union[str, None] = '5e8b2f9d4a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sites', sa.Column('url_rules', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sites', 'url_rules')
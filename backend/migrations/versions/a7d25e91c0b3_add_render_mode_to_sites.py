@@ -0,0 +1,31 @@
+"""add render_mode to sites
+
+Revision ID: a7d25e91c0b3
+Revises: 3f1a6c2d9b47
+Create Date: 2026-10-19 11:02:17.640932
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d25e91c0b3'
+down_revision: Union[str, None] = '3f1a6c2d9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+render_mode_enum = postgresql.ENUM('STATIC', 'AUTO', 'BROWSER', name='rendermode')
+
+
+def upgrade() -> None:
+    render_mode_enum.create(op.get_bind(), checkfirst=True)
+    op.add_column('sites', sa.Column('render_mode', render_mode_enum, server_default='STATIC', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('sites', 'render_mode')
+    render_mode_enum.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,43 @@
+"""pages change_seq
+
+Revision ID: b6e1d4c8f302
+Revises: 4f7c2a9e6d15
+Create Date: 2026-10-19 14:58:12.740331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1d4c8f302'
+down_revision: Union[str, None] = '4f7c2a9e6d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence('pages_change_seq')))
+    op.add_column('pages', sa.Column('change_seq', sa.BigInteger(), nullable=True))
+
+    # Existing processed pages get sequence values in scrape order
+    op.execute("""
+        UPDATE pages p SET change_seq = o.seq
+        FROM (
+            SELECT id, row_number() OVER (ORDER BY scraped_at, id) AS seq
+            FROM pages
+            WHERE status = 'PROCESSED'
+        ) o
+        WHERE p.id = o.id
+    """)
+    op.execute("SELECT setval('pages_change_seq', COALESCE((SELECT max(change_seq) FROM pages), 0) + 1, false)")
+
+    op.create_index(op.f('ix_pages_change_seq'), 'pages', ['change_seq'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pages_change_seq'), table_name='pages')
+    op.drop_column('pages', 'change_seq')
+    op.execute(sa.schema.DropSequence(sa.Sequence('pages_change_seq')))
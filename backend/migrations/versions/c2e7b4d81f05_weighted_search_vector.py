@@ -0,0 +1,63 @@
+"""weighted search_vector on pages
+
+Revision ID: c2e7b4d81f05
+Revises: 5b8e0f3a2c61
+Create Date: 2026-10-19 12:31:52.904186
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e7b4d81f05'
+down_revision: Union[str, None] = '5b8e0f3a2c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same mapping as shared.core.utils.TEXT_SEARCH_CONFIGS at the time of this migration
+TEXT_SEARCH_CONFIGS = {
+    'es': 'spanish', 'en': 'english', 'pt': 'portuguese', 'fr': 'french',
+    'it': 'italian', 'de': 'german', 'nl': 'dutch', 'da': 'danish',
+    'fi': 'finnish', 'hu': 'hungarian', 'no': 'norwegian', 'ro': 'romanian',
+    'ru': 'russian', 'sv': 'swedish', 'tr': 'turkish',
+}
+
+
+def upgrade() -> None:
+    op.add_column('pages', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Backfill from the title, summary and latest content of every page
+    lang_code = "split_part(replace(lower(trim(p.language)), '_', '-'), '-', 1)"
+    config = "CASE {} {} ELSE 'spanish' END::regconfig".format(
+        lang_code,
+        " ".join(f"WHEN '{code}' THEN '{name}'" for code, name in TEXT_SEARCH_CONFIGS.items()),
+    )
+    op.execute(f"""
+        UPDATE pages p SET search_vector =
+            setweight(to_tsvector({config}, coalesce(p.title, '')), 'A') ||
+            setweight(to_tsvector({config}, coalesce(p.summary, '')), 'B') ||
+            setweight(to_tsvector({config}, left(coalesce(c.extracted_text, ''), 100000)), 'C')
+        FROM pages p2
+        LEFT JOIN (
+            SELECT DISTINCT ON (page_id) page_id, extracted_text
+            FROM page_contents
+            ORDER BY page_id, created_at DESC
+        ) c ON c.page_id = p2.id
+        WHERE p2.id = p.id AND p.status = 'PROCESSED'
+    """)
+
+    op.create_index('ix_pages_search_vector', 'pages', ['search_vector'], unique=False, postgresql_using='gin')
+    # Replaced by the stored vector
+    op.drop_index('ix_pages_title_fts', table_name='pages', postgresql_using='gin')
+    op.drop_index('ix_page_contents_text_fts', table_name='page_contents', postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.create_index('ix_page_contents_text_fts', 'page_contents', [sa.literal_column("to_tsvector('spanish', extracted_text)")], unique=False, postgresql_using='gin')
+    op.create_index('ix_pages_title_fts', 'pages', [sa.literal_column("to_tsvector('spanish', title)")], unique=False, postgresql_using='gin')
+    op.drop_index('ix_pages_search_vector', table_name='pages', postgresql_using='gin')
+    op.drop_column('pages', 'search_vector')
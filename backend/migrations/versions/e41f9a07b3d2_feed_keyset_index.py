@@ -0,0 +1,27 @@
+"""feed keyset index
+
+Revision ID: e41f9a07b3d2
+Revises: c2e7b4d81f05
+Create Date: 2026-10-19 13:05:29.481550
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41f9a07b3d2'
+down_revision: Union[str, None] = 'c2e7b4d81f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves ORDER BY Page.sort_at DESC, id DESC and the (sort_at, id) < cursor range scan
+    op.create_index('ix_pages_feed_order', 'pages', [sa.literal_column('coalesce(published_at, scraped_at, first_seen_at) DESC'), sa.literal_column('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pages_feed_order', table_name='pages')
@@ -2,7 +2,7 @@ import asyncio
 import sys
 import os
 import uuid
-from sqlalchemy import select, delete
+from sqlalchemy import select
 
 # Add project root to sys.path to allow imports from shared
 # Assumes script is located at <project_root>/backend/scripts/clean_site_data.py
@@ -17,20 +17,22 @@ if os.getcwd() not in sys.path:
 # Safer approach: try import, if fail, try adding paths.
 try:
     from shared.core.database import AsyncSessionLocal
-    from shared.core.models import Page, PageContent, Site
+    from shared.core.models import Site
+    from shared.core.cleanup import SiteDataCleaner, DEFAULT_BATCH_SIZE, DEFAULT_THROTTLE_MS
 except ImportError:
     # Try adding the parent directory of 'backend' (which is root or /app)
     # script is in backend/scripts/. Parent is backend. Parent of backend is root.
     sys.path.append(os.path.abspath(os.path.join(current_dir, "../..")))
     try:
         from shared.core.database import AsyncSessionLocal
-        from shared.core.models import Page, PageContent, Site
+        from shared.core.models import Site
+        from shared.core.cleanup import SiteDataCleaner, DEFAULT_BATCH_SIZE, DEFAULT_THROTTLE_MS
     except ImportError as e:
         print(f"Error importing modules: {e}")
         print("Please run this script from the project root (e.g. `python3 backend/scripts/clean_site_data.py`)")
         sys.exit(1)
 
-async def clean_site_data(site_id_str: str, force: bool = False):
+async def clean_site_data(site_id_str: str, force: bool = False, batch_size: int = None, throttle_ms: int = None):
     try:
         site_id = uuid.UUID(site_id_str)
     except ValueError:
@@ -59,39 +61,50 @@ async def clean_site_data(site_id_str: str, force: bool = False):
                     print("Operation cancelled.")
                     return
 
-        print(f"Deleting data for site {site_id}...")
+    print(f"Deleting data for site {site_id}...")
 
-        # Delete PageContents first (referencing pages)
-        # We delete PageContents where the associated page belongs to the site
-        stmt_contents = delete(PageContent).where(
-            PageContent.page_id.in_(
-                select(Page.id).where(Page.site_id == site_id)
-            )
+    async def report(cleaner):
+        print(
+            f"Batch {cleaner.batches}: {cleaner.pages_deleted} pages, "
+            f"{cleaner.contents_deleted} page content entries deleted so far (last id {cleaner.last_page_id})"
         )
-        result_contents = await session.execute(stmt_contents)
-        print(f"Deleted {result_contents.rowcount} page content entries.")
 
-        # Delete Pages
-        stmt_pages = delete(Page).where(Page.site_id == site_id)
-        result_pages = await session.execute(stmt_pages)
-        print(f"Deleted {result_pages.rowcount} pages.")
+    # Deletes in short, committed batches. If interrupted, just run the script again.
+    cleaner = SiteDataCleaner(
+        site_id,
+        batch_size=batch_size or DEFAULT_BATCH_SIZE,
+        throttle_ms=DEFAULT_THROTTLE_MS if throttle_ms is None else throttle_ms,
+        on_progress=report,
+    )
+    await cleaner.run()
 
-        await session.commit()
-        print("Deletion complete.")
+    if cleaner.status != "finished":
+        print(f"Deletion {cleaner.status}: {cleaner.error or ''}")
+        return
+
+    print(f"Deleted {cleaner.contents_deleted} page content entries.")
+    print(f"Deleted {cleaner.pages_deleted} pages.")
+    print("Deletion complete.")
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python3 backend/scripts/clean_site_data.py <site_id> [--force]")
+        print("Usage: python3 backend/scripts/clean_site_data.py <site_id> [--force] [--batch-size=N] [--throttle-ms=N]")
         sys.exit(1)
     
     site_id_arg = sys.argv[1]
     
     # Handle flag anywhere
     force_arg = False
+    batch_size_arg = None
+    throttle_ms_arg = None
     clean_args = []
     for arg in sys.argv[1:]:
         if arg == "--force":
             force_arg = True
+        elif arg.startswith("--batch-size="):
+            batch_size_arg = int(arg.split("=", 1)[1])
+        elif arg.startswith("--throttle-ms="):
+            throttle_ms_arg = int(arg.split("=", 1)[1])
         else:
             clean_args.append(arg)
             
@@ -102,7 +115,7 @@ if __name__ == "__main__":
     site_id_arg = clean_args[0]
     
     try:
-        asyncio.run(clean_site_data(site_id_arg, force_arg))
+        asyncio.run(clean_site_data(site_id_arg, force_arg, batch_size_arg, throttle_ms_arg))
     except (KeyboardInterrupt, SystemExit):
         pass
     except Exception as e:
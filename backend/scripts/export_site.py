@@ -0,0 +1,97 @@
+import asyncio
+import sys
+import os
+import uuid
+from datetime import datetime
+
+# Add project root to sys.path to allow imports from shared and backend
+# Assumes script is located at <project_root>/backend/scripts/export_site.py
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if os.getcwd() not in sys.path:
+    sys.path.append(os.getcwd())
+
+try:
+    from backend.app.export import PageExporter
+    from backend.app.routers.public import (
+        PublicPageResponse, build_export_query, public_item_fields, public_page_item, resolve_public_projection
+    )
+except ImportError:
+    # Try adding the parent directory of 'backend' (which is root or /app)
+    sys.path.append(os.path.abspath(os.path.join(current_dir, "../..")))
+    try:
+        from backend.app.export import PageExporter
+        from backend.app.routers.public import (
+            PublicPageResponse, build_export_query, public_item_fields, public_page_item, resolve_public_projection
+        )
+    except ImportError as e:
+        print(f"Error importing modules: {e}")
+        print("Please run this script from the project root (e.g. `python3 backend/scripts/export_site.py`)")
+        sys.exit(1)
+
+USAGE = (
+    "Usage: python3 backend/scripts/export_site.py <site_id> [--format=ndjson|csv|parquet] "
+    "[--from=ISO_DATE] [--to=ISO_DATE] [--fields=a,b,...] [--include=content,html] [--output=PATH]"
+)
+
+async def export_site(site_id_str: str, format: str, scraped_from, scraped_to, fields, include, output):
+    try:
+        site_id = uuid.UUID(site_id_str)
+    except ValueError:
+        print(f"Error: Invalid site ID format: {site_id_str}", file=sys.stderr)
+        return
+
+    # Same projection (and the same streaming) as GET /public/sites/{site_id}/export
+    wanted, full_text = resolve_public_projection(fields, include)
+    exporter = PageExporter(format, public_item_fields(wanted), PublicPageResponse)
+    query = build_export_query(site_id, wanted, full_text, scraped_from, scraped_to)
+
+    out = open(output, "wb") if output else sys.stdout.buffer
+    written = 0
+    try:
+        async for chunk in exporter.stream(query, lambda row: public_page_item(row, row, wanted, full_text)):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if output:
+            out.close()
+        else:
+            out.flush()
+
+    if output:
+        print(f"Exported {written} bytes to {output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    format_arg = "ndjson"
+    from_arg = None
+    to_arg = None
+    fields_arg = None
+    # The full text by default: an export is for the corpus, not a list view
+    include_arg = "content"
+    output_arg = None
+    clean_args = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--format="):
+            format_arg = arg.split("=", 1)[1]
+        elif arg.startswith("--from="):
+            from_arg = datetime.fromisoformat(arg.split("=", 1)[1])
+        elif arg.startswith("--to="):
+            to_arg = datetime.fromisoformat(arg.split("=", 1)[1])
+        elif arg.startswith("--fields="):
+            fields_arg = arg.split("=", 1)[1]
+        elif arg.startswith("--include="):
+            include_arg = arg.split("=", 1)[1]
+        elif arg.startswith("--output="):
+            output_arg = arg.split("=", 1)[1]
+        else:
+            clean_args.append(arg)
+
+    if not clean_args:
+        print(USAGE)
+        sys.exit(1)
+
+    try:
+        asyncio.run(export_site(clean_args[0], format_arg, from_arg, to_arg, fields_arg, include_arg, output_arg))
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    except Exception as e:
+        print(f"An error occurred: {e}", file=sys.stderr)
@@ -0,0 +1,337 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+# Add project root to sys.path to allow imports from shared and backend
+# Assumes script is located at <project_root>/backend/scripts/query_plans.py
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if os.getcwd() not in sys.path:
+    sys.path.append(os.getcwd())
+
+try:
+    from sqlalchemy import Select, desc, literal_column, select, text
+    from sqlalchemy.dialects.postgresql import insert
+    from shared.core import models, utils
+    from shared.core.database import AsyncSessionLocal
+    from backend.app.routers.feed import FEED_FIELDS, _build_feed
+    from backend.app.routers.pages import read_pages
+    from backend.app.routers.public import _build_site_content, resolve_public_projection
+    from backend.app.routers.sites import read_sites
+except ImportError:
+    # Try adding the parent directory of 'backend' (which is root or /app)
+    sys.path.append(os.path.abspath(os.path.join(current_dir, "../..")))
+    try:
+        from sqlalchemy import Select, desc, literal_column, select, text
+        from sqlalchemy.dialects.postgresql import insert
+        from shared.core import models, utils
+        from shared.core.database import AsyncSessionLocal
+        from backend.app.routers.feed import FEED_FIELDS, _build_feed
+        from backend.app.routers.pages import read_pages
+        from backend.app.routers.public import _build_site_content, resolve_public_projection
+        from backend.app.routers.sites import read_sites
+    except ImportError as e:
+        print(f"Error importing modules: {e}")
+        print("Please run this script from the project root (e.g. `python3 backend/scripts/query_plans.py`)")
+        sys.exit(1)
+
+USAGE = (
+    "Usage: python3 backend/scripts/query_plans.py [--repeat=3] [--output=report.json] [--baseline=old_report.json] "
+    "[--max-slowdown=0.5] [--min-delta-ms=2] [--seq-scan-min-rows=10000] [--q=gobierno] [--only=a,b] [--plans=DIR]"
+)
+
+class PlanRecorder:
+    """
+    Stands in for the AsyncSession in the endpoint code: statements it executes still run
+    (so the code gets its rows and goes on to its next query), and every SELECT is kept
+    to be explained afterwards. Anything else is delegated to the real session.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        if isinstance(statement, Select):
+            self.statements.append(statement)
+        return await self.session.execute(statement, *args, **kwargs)
+
+    def record(self, statement):
+        """Explains a statement without running it (for writes)."""
+        self.statements.append(statement)
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+# --- Hot queries. Each runs the application code (or mirrors it, for the worker's queries) ---
+
+async def processing_selection(db, params):
+    # Same query as ScraperEngine.run_processing_phase
+    await db.execute(
+        select(models.Page)
+        .where(models.Page.site_id == params["site_id"], models.Page.status == models.PageStatus.NEW)
+        .order_by(models.Page.first_seen_at.desc())
+        .limit(200)
+    )
+
+async def discovery_upsert(db, params):
+    # Same statement as ScraperEngine.run_discovery_phase, for a chunk of 500 URLs (half already known)
+    now = datetime.now(timezone.utc)
+    values = [{
+        # The model's Python-side default is not applied when compiling to literal SQL
+        "id": uuid.uuid4(),
+        "site_id": params["site_id"],
+        "url": url,
+        "canonical_url": url,
+        "url_hash": utils.compute_url_hash(url),
+        "discovered_via": models.DiscoverySource.SITEMAP,
+        "status": models.PageStatus.NEW,
+        "first_seen_at": now,
+        "last_seen_at": now,
+    } for url in params["discovery_urls"]]
+    stmt = insert(models.Page).values(values)
+    stmt = stmt.on_conflict_do_update(index_elements=['url_hash'], set_={"last_seen_at": now})
+    db.record(stmt.returning(literal_column("xmax = 0")))
+
+async def feed_new(db, params):
+    await _build_feed(params["since"], None, None, None, "recent", 1, 50, None, "exact", FEED_FIELDS, False, db)
+
+async def feed_new_site(db, params):
+    await _build_feed(params["since"], params["site_id"], None, None, "recent", 1, 50, None, "exact", FEED_FIELDS, False, db)
+
+async def feed_new_q(db, params):
+    await _build_feed(params["since"], None, params["q"], None, "recent", 1, 50, None, "exact", FEED_FIELDS, False, db)
+
+async def feed_new_q_relevance(db, params):
+    await _build_feed(params["since"], None, params["q"], None, "relevance", 1, 50, None, "exact", FEED_FIELDS, False, db)
+
+async def pages_ilike(db, params):
+    await read_pages(
+        site_id=None, status=None, discovered_via=None, published_from=None, published_to=None,
+        q=params["q"], limit=100, db=db,
+    )
+
+async def sites(db, params):
+    await read_sites(skip=0, limit=100, db=db)
+
+async def public_site_content(db, params):
+    wanted, full_text = resolve_public_projection(None, None)
+    await _build_site_content(params["site_id"], 100, wanted, full_text, db)
+
+# name: (function, labels of the statements it runs, in order)
+CASES = {
+    "processing_selection": (processing_selection, ["pages"]),
+    "discovery_upsert": (discovery_upsert, ["upsert"]),
+    "feed_new": (feed_new, ["count", "page", "latest_content"]),
+    "feed_new_site": (feed_new_site, ["count", "page", "latest_content"]),
+    "feed_new_q": (feed_new_q, ["count", "page", "latest_content"]),
+    "feed_new_q_relevance": (feed_new_q_relevance, ["count", "page", "latest_content"]),
+    "pages_ilike": (pages_ilike, ["page"]),
+    "sites": (sites, ["sites"]),
+    "public_site_content": (public_site_content, ["site", "page", "latest_content"]),
+}
+
+# --- Plans ---
+
+async def explain(session, statement) -> dict:
+    # Inlined literals and raw driver SQL, as in backend.app.pagination.estimate_count
+    compiled = statement.compile(dialect=session.bind.dialect, compile_kwargs={"literal_binds": True})
+    conn = await session.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+def summarize(plan: dict, table_rows: dict, seq_scan_min_rows: int) -> dict:
+    scans = []
+    seq_scans = []
+
+    def walk(node):
+        node_type = node["Node Type"]
+        if "Scan" in node_type:
+            scan = f"{node_type} on {node.get('Relation Name', node.get('Alias', '?'))}"
+            if node.get("Index Name"):
+                scan += f" using {node['Index Name']}"
+            scans.append(scan)
+        # Small tables (sites) are read whole on purpose
+        if node_type == "Seq Scan" and table_rows.get(node.get("Relation Name"), 0) >= seq_scan_min_rows:
+            seq_scans.append(node["Relation Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan["Plan"])
+    top = plan["Plan"]
+    return {
+        "execution_ms": round(plan["Execution Time"], 3),
+        "planning_ms": round(plan["Planning Time"], 3),
+        "rows": top.get("Actual Rows"),
+        "shared_hit_blocks": top.get("Shared Hit Blocks", 0),
+        "shared_read_blocks": top.get("Shared Read Blocks", 0),
+        "temp_written_blocks": top.get("Temp Written Blocks", 0),
+        "scans": sorted(set(scans)),
+        "seq_scans": sorted(set(seq_scans)),
+    }
+
+async def pick_params(session, q: str) -> dict:
+    # The biggest live site: the worst case for the per-site queries
+    site_id = await session.scalar(
+        select(models.SiteStats.site_id)
+        .join(models.Site, models.Site.id == models.SiteStats.site_id)
+        .where(models.Site.deleted == False)
+        .order_by(desc(models.SiteStats.processed_count + models.SiteStats.new_count))
+        .limit(1)
+    )
+    if site_id is None:
+        raise RuntimeError("No pages to run the queries on (see backend/scripts/synthetic_data.py)")
+    base_url = await session.scalar(select(models.Site.base_url).where(models.Site.id == site_id))
+    known = (await session.execute(
+        select(models.Page.url).where(models.Page.site_id == site_id).order_by(desc(models.Page.first_seen_at)).limit(250)
+    )).scalars().all()
+    unknown = [f"{base_url.rstrip('/')}/plan-check/{uuid.uuid4()}" for _ in range(500 - len(known))]
+    return {
+        "site_id": site_id,
+        "since": datetime.now(timezone.utc) - timedelta(days=1),
+        "q": q,
+        "discovery_urls": list(known) + unknown,
+    }
+
+async def run_suite(cases: list[str], repeat: int, q: str, seq_scan_min_rows: int, plans_dir=None) -> dict:
+    async with AsyncSessionLocal() as session:
+        table_rows = dict((await session.execute(text(
+            "SELECT relname, reltuples::bigint FROM pg_class "
+            "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+        ))).all())
+        server_version = await session.scalar(text("SHOW server_version"))
+        params = await pick_params(session, q)
+        await session.rollback()
+
+        queries = {}
+        timings = {}
+        for _ in range(repeat):
+            for name in cases:
+                function, labels = CASES[name]
+                recorder = PlanRecorder(session)
+                await function(recorder, params)
+                for index, statement in enumerate(recorder.statements):
+                    key = f"{name}.{labels[index] if index < len(labels) else index}"
+                    plan = await explain(session, statement)
+                    queries[key] = summarize(plan, table_rows, seq_scan_min_rows)
+                    timings.setdefault(key, []).append(plan["Execution Time"])
+                    if plans_dir:
+                        with open(os.path.join(plans_dir, f"{key}.json"), "w") as f:
+                            json.dump([plan], f, indent=1)
+                # Nothing is kept: the upsert was really executed by EXPLAIN ANALYZE
+                await session.rollback()
+
+    # The first round warms the cache; the median of all rounds is reported
+    for key, values in timings.items():
+        queries[key]["execution_ms"] = round(statistics.median(values), 3)
+    return {
+        "meta": {
+            "postgres": server_version,
+            "table_rows": {table: table_rows.get(table) for table in ("sites", "pages", "page_contents", "page_events")},
+            "params": {"site_id": str(params["site_id"]), "since": params["since"].isoformat(), "q": q},
+        },
+        "queries": queries,
+    }
+
+def compare_reports(report: dict, baseline: dict, max_slowdown: float, min_delta_ms: float) -> tuple[list[str], list[str]]:
+    """(regressions, plan changes) against an older report."""
+    regressions = []
+    changes = []
+    for key, now in report["queries"].items():
+        before = baseline.get("queries", {}).get(key)
+        if not before:
+            continue
+        slower = now["execution_ms"] - before["execution_ms"]
+        if now["execution_ms"] > before["execution_ms"] * (1 + max_slowdown) and slower >= min_delta_ms:
+            regressions.append(f"{key}: {before['execution_ms']} -> {now['execution_ms']} ms")
+        new_seq_scans = sorted(set(now["seq_scans"]) - set(before["seq_scans"]))
+        if new_seq_scans:
+            regressions.append(f"{key}: new sequential scan on {', '.join(new_seq_scans)}")
+        if now["scans"] != before["scans"]:
+            changes.append(f"{key}: {before['scans']} -> {now['scans']}")
+    return regressions, changes
+
+def same_volume(before: dict, now: dict, tolerance: float = 0.1) -> bool:
+    """Whether two runs saw about the same table sizes (planner row estimates, so never exact)."""
+    for table, rows in now.items():
+        previous = before.get(table)
+        if previous is None or rows is None:
+            return False
+        if abs(rows - previous) > tolerance * max(previous, 1):
+            return False
+    return True
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+async def main(options: dict) -> int:
+    cases = options["only"].split(",") if options.get("only") else list(CASES)
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        print(f"Unknown queries: {', '.join(unknown)} (available: {', '.join(CASES)})")
+        return 2
+    if options.get("plans"):
+        os.makedirs(options["plans"], exist_ok=True)
+
+    report = await run_suite(
+        cases,
+        repeat=int(options.get("repeat", 3)),
+        q=options.get("q", "gobierno"),
+        seq_scan_min_rows=int(options.get("seq-scan-min-rows", 10_000)),
+        plans_dir=options.get("plans"),
+    )
+    report["meta"].update({
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "repeat": int(options.get("repeat", 3)),
+    })
+
+    text_report = json.dumps(report, indent=2, sort_keys=True)
+    if options.get("output"):
+        with open(options["output"], "w") as f:
+            f.write(text_report + "\n")
+    else:
+        print(text_report)
+
+    for key, query in report["queries"].items():
+        flag = f"  SEQ SCAN on {', '.join(query['seq_scans'])}" if query["seq_scans"] else ""
+        print(
+            f"{key:>36}: {query['execution_ms']:>10} ms  {query['shared_hit_blocks'] + query['shared_read_blocks']:>8} blocks{flag}",
+            file=sys.stderr,
+        )
+
+    if options.get("baseline"):
+        with open(options["baseline"]) as f:
+            baseline = json.load(f)
+        if not same_volume(baseline.get("meta", {}).get("table_rows") or {}, report["meta"]["table_rows"]):
+            print("Warning: the baseline was run on a different amount of data", file=sys.stderr)
+        regressions, changes = compare_reports(
+            report, baseline, float(options.get("max-slowdown", 0.5)), float(options.get("min-delta-ms", 2))
+        )
+        for change in changes:
+            print(f"PLAN CHANGED {change}", file=sys.stderr)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    options = {}
+    for arg in sys.argv[1:]:
+        if not arg.startswith("--") or "=" not in arg:
+            print(USAGE)
+            sys.exit(2)
+        key, value = arg[2:].split("=", 1)
+        options[key] = value
+    sys.exit(asyncio.run(main(options)))
@@ -0,0 +1,228 @@
+import asyncio
+import sys
+import os
+import time
+
+# Add project root to sys.path to allow imports from shared
+# Assumes script is located at <project_root>/backend/scripts/synthetic_data.py
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if os.getcwd() not in sys.path:
+    sys.path.append(os.getcwd())
+
+try:
+    from sqlalchemy import select, text
+    from shared.core.database import AsyncSessionLocal, engine
+    from shared.core.models import Site
+    from shared.core.cleanup import SiteDataCleaner
+except ImportError:
+    # Try adding the parent directory of 'backend' (which is root or /app)
+    sys.path.append(os.path.abspath(os.path.join(current_dir, "../..")))
+    try:
+        from sqlalchemy import select, text
+        from shared.core.database import AsyncSessionLocal, engine
+        from shared.core.models import Site
+        from shared.core.cleanup import SiteDataCleaner
+    except ImportError as e:
+        print(f"Error importing modules: {e}")
+        print("Please run this script from the project root (e.g. `python3 backend/scripts/synthetic_data.py`)")
+        sys.exit(1)
+
+USAGE = (
+    "Usage: python3 backend/scripts/synthetic_data.py [--sites=200] [--pages=1000000] [--days=90] "
+    "[--extra-contents=0.2] [--batch-size=50000] [--force]\n"
+    "       python3 backend/scripts/synthetic_data.py --drop [--force]"
+)
+
+# Synthetic sites are recognized (and dropped) by their base_url
+SYNTHETIC_BASE_URL = "https://synthetic-{n}.example.com/"
+SYNTHETIC_BASE_URL_LIKE = "https://synthetic-%.example.com/"
+
+WORDS = (
+    "gobierno economía inflación dólar elecciones congreso presidente ministro reforma ley salud educación "
+    "seguridad justicia tribunal provincia ciudad municipio intendente obra transporte tren subte colectivo "
+    "energía petróleo gas tarifa aumento salario jubilación empleo industria campo cosecha exportación "
+    "importación banco central tasa deuda acuerdo fondo crisis mercado bolsa acciones bonos inversión "
+    "empresa tecnología inteligencia artificial datos ciencia universidad investigación clima lluvia calor "
+    "tormenta incendio inundación fútbol selección partido campeonato gol técnico club estadio hinchas "
+    "música cine teatro festival libro autor premio serie streaming policía detenido causa fiscal juez "
+    "sentencia protesta marcha sindicato paro negociación diputados senadores votación proyecto sesión "
+    "internacional estados unidos china brasil europa guerra paz cumbre canciller embajada frontera"
+).split()
+
+# Status mix of a mature installation: (enum name, share)
+STATUSES = [("PROCESSED", 0.72), ("NEW", 0.18), ("SKIPPED", 0.07), ("FAILED", 0.03)]
+
+# One statement per batch of a site's pages and their contents: one per processed page, plus a
+# re-scraped version for a share of them. Words are drawn per row: the subqueries reference g so
+# Postgres evaluates them for every row instead of once.
+INSERT_BATCH_SQL = """
+WITH words AS (SELECT CAST(:words AS text[]) AS w),
+rows AS (
+    SELECT
+        g,
+        now() - random() * make_interval(days => :days) AS first_seen_at,
+        CASE
+            WHEN g % 100 < :processed_pct THEN 'PROCESSED'
+            WHEN g % 100 < :new_pct THEN 'NEW'
+            WHEN g % 100 < :skipped_pct THEN 'SKIPPED'
+            ELSE 'FAILED'
+        END AS status,
+        (SELECT string_agg(w[1 + floor(random() * array_length(w, 1))::int], ' ')
+           FROM words, generate_series(1, 6 + g % 5)) AS title,
+        (SELECT string_agg(w[1 + floor(random() * array_length(w, 1))::int], ' ')
+           FROM words, generate_series(1, 25 + g % 10)) AS summary,
+        :base_url || (ARRAY['politica','economia','sociedad','deportes','el-mundo','espectaculos','tecnologia'])[1 + g % 7]
+            || '/nota-' || g AS url
+    FROM generate_series(:first, :last) AS g
+),
+inserted AS (
+    INSERT INTO pages (
+        id, site_id, url, canonical_url, url_hash, discovered_via, first_seen_at, last_seen_at, scraped_at, status,
+        http_status, title, author, summary, language, published_at, search_vector, change_seq
+    )
+    SELECT
+        gen_random_uuid(), CAST(:site_id AS uuid), url, url, encode(sha256(convert_to(url, 'UTF8')), 'hex'),
+        CAST(CASE WHEN g % 10 = 0 THEN 'RSS' ELSE 'SITEMAP' END AS discoverysource),
+        first_seen_at, first_seen_at,
+        CASE WHEN status <> 'NEW' THEN first_seen_at + random() * interval '2 hours' END,
+        CAST(status AS pagestatus),
+        CASE WHEN status = 'PROCESSED' THEN 200 WHEN status = 'FAILED' THEN 500 END,
+        CASE WHEN status = 'PROCESSED' THEN initcap(title) END,
+        CASE WHEN status = 'PROCESSED' AND g % 3 = 0 THEN 'Redacción' END,
+        CASE WHEN status = 'PROCESSED' THEN summary END,
+        CASE WHEN status = 'PROCESSED' THEN 'es' END,
+        CASE WHEN status = 'PROCESSED' AND g % 10 <> 0 THEN first_seen_at - random() * interval '6 hours' END,
+        CASE WHEN status = 'PROCESSED' THEN
+            setweight(to_tsvector('spanish', title), 'A') || setweight(to_tsvector('spanish', summary), 'B')
+        END,
+        CASE WHEN status = 'PROCESSED' THEN nextval('pages_change_seq') END
+    FROM rows
+    RETURNING id, url, title, summary, scraped_at, status
+)
+INSERT INTO page_contents (id, page_id, extracted_text, raw_html, metadata, created_at)
+SELECT
+    gen_random_uuid(), i.id,
+    i.title || E'\\n\\n' || repeat(i.summary || E'.\\n', 8 + abs(hashtext(i.url)) % 12),
+    NULL,
+    jsonb_build_object('title', i.title, 'language', 'es', 'extraction_method', 'trafilatura'),
+    i.scraped_at + version * interval '1 day'
+FROM inserted i
+CROSS JOIN generate_series(0, 1) AS version
+WHERE i.status = 'PROCESSED'
+  AND (version = 0 OR abs(hashtext(i.url)) % 1000 < :extra_permille)
+"""
+
+def site_page_counts(sites: int, pages: int) -> list[int]:
+    """Skewed like real installations: a few big publishers, a long tail of small sites."""
+    weights = [1 / (k + 1) ** 0.8 for k in range(sites)]
+    total = sum(weights)
+    counts = [int(pages * w / total) for w in weights]
+    counts[0] += pages - sum(counts)
+    return counts
+
+async def generate(sites: int, pages: int, days: int, extra_contents: float, batch_size: int):
+    cumulative = 0
+    thresholds = {}
+    for name, share in STATUSES:
+        cumulative += share
+        thresholds[name] = round(cumulative * 100)
+
+    started = time.monotonic()
+    async with AsyncSessionLocal() as session:
+        existing = await session.scalar(
+            text("SELECT count(*) FROM sites WHERE base_url LIKE :pattern"), {"pattern": SYNTHETIC_BASE_URL_LIKE}
+        )
+    counts = site_page_counts(sites, pages)
+    inserted = 0
+    for index, count in enumerate(counts):
+        n = existing + index
+        base_url = SYNTHETIC_BASE_URL.format(n=n)
+        async with AsyncSessionLocal() as session:
+            site_id = await session.scalar(
+                text(
+                    "INSERT INTO sites (id, name, base_url, enabled, deleted, crawl_strategy, render_mode, rate_limit_ms) "
+                    "VALUES (gen_random_uuid(), :name, :base_url, false, :deleted, 'SITEMAP', 'STATIC', 1000) RETURNING id"
+                ),
+                # A few deleted sites, so the queries' deleted filter has something to do
+                {"name": f"Synthetic site {n}", "base_url": base_url, "deleted": n % 50 == 49},
+            )
+            await session.commit()
+
+            for first in range(0, count, batch_size):
+                last = min(count, first + batch_size) - 1
+                await session.execute(text(INSERT_BATCH_SQL), {
+                    "words": WORDS,
+                    "days": days,
+                    "processed_pct": thresholds["PROCESSED"],
+                    "new_pct": thresholds["NEW"],
+                    "skipped_pct": thresholds["SKIPPED"],
+                    "base_url": base_url,
+                    "site_id": str(site_id),
+                    "first": first,
+                    "last": last,
+                    "extra_permille": round(extra_contents * 1000),
+                })
+                await session.commit()
+                inserted += last - first + 1
+
+        elapsed = time.monotonic() - started
+        print(f"Site {index + 1}/{len(counts)}: {count} pages ({inserted}/{pages} total, {inserted / elapsed:.0f} pages/s)")
+
+    # Fresh planner statistics, as autovacuum would have after a while
+    async with engine.connect() as conn:
+        await conn.execute(text("ANALYZE sites, pages, page_contents, site_stats"))
+        await conn.commit()
+    print(f"Done: {len(counts)} sites, {inserted} pages in {time.monotonic() - started:.0f}s")
+
+async def drop():
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(Site.id, Site.name).where(Site.base_url.like(SYNTHETIC_BASE_URL_LIKE)))
+        sites = result.all()
+
+    for site_id, name in sites:
+        cleaner = await SiteDataCleaner(site_id, batch_size=5000, throttle_ms=0).run()
+        print(f"{name}: {cleaner.pages_deleted} pages, {cleaner.contents_deleted} contents deleted")
+        if cleaner.status != "finished":
+            print(f"Cleanup {cleaner.status}: {cleaner.error or ''}")
+            return
+        async with AsyncSessionLocal() as session:
+            await session.execute(text("DELETE FROM page_events WHERE site_id = :id"), {"id": site_id})
+            await session.execute(text("DELETE FROM scrape_runs WHERE site_id = :id"), {"id": site_id})
+            await session.execute(text("DELETE FROM sites WHERE id = :id"), {"id": site_id})
+            await session.commit()
+    print(f"Dropped {len(sites)} synthetic sites.")
+
+if __name__ == "__main__":
+    options = {}
+    flags = set()
+    for arg in sys.argv[1:]:
+        if arg.startswith("--") and "=" in arg:
+            key, value = arg[2:].split("=", 1)
+            options[key] = value
+        elif arg.startswith("--"):
+            flags.add(arg[2:])
+        else:
+            print(USAGE)
+            sys.exit(1)
+
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    if "force" not in flags:
+        action = "DELETE all synthetic sites from" if "drop" in flags else "write synthetic sites and pages to"
+        confirm = input(f"This will {action} this database. Continue? (yes/no): ")
+        if confirm.lower() != 'yes':
+            print("Operation cancelled.")
+            sys.exit(0)
+
+    try:
+        if "drop" in flags:
+            asyncio.run(drop())
+        else:
+            asyncio.run(generate(
+                sites=int(options.get("sites", 200)),
+                pages=int(options.get("pages", 1_000_000)),
+                days=int(options.get("days", 90)),
+                extra_contents=float(options.get("extra-contents", 0.2)),
+                batch_size=int(options.get("batch-size", 50_000)),
+            ))
+    except KeyboardInterrupt:
+        pass
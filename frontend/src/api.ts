@@ -63,8 +63,12 @@ export async function fetchSites() {
     return res.json();
 }
 
-export async function fetchFeed(since: string, siteId?: string, page: number = 1, pageSize: number = 50, q?: string) {
-    let url = `/feed/new?since=${since}&page=${page}&page_size=${pageSize}`;
+// cursor is the next_cursor of the previous page; the total is the planner's estimate
+export async function fetchFeed(since: string, siteId?: string, cursor?: string, pageSize: number = 50, q?: string) {
+    let url = `/feed/new?since=${since}&page_size=${pageSize}&count=estimate`;
+    if (cursor) {
+        url += `&cursor=${encodeURIComponent(cursor)}`;
+    }
     if (siteId) {
         url += `&site_id=${siteId}`;
     }
@@ -75,6 +79,11 @@ export async function fetchFeed(since: string, siteId?: string, page: number = 1
     return res.json();
 }
 
+export async function fetchPage(id: string) {
+    const res = await request(`/pages/${id}`);
+    return res.json();
+}
+
 export async function createSite(site: any) {
     const res = await request('/sites/', {
         method: 'POST',
@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react';
-import { fetchFeed, fetchSites } from '../api';
+import { fetchFeed, fetchPage, fetchSites } from '../api';
 
 export default function Feed() {
     const [pages, setPages] = useState<any[]>([]);
@@ -8,21 +8,35 @@ export default function Feed() {
     const [search, setSearch] = useState('');
     const [since, setSince] = useState(new Date(Date.now() - 24 * 60 * 60 * 1000).toISOString().slice(0, 16));
     const [selectedPage, setSelectedPage] = useState<any | null>(null);
-    const [page, setPage] = useState(1);
-    const [totalPages, setTotalPages] = useState(1);
+    // Keyset pagination: cursors[i] loads page i + 1, so Previous just drops the last one
+    const [cursors, setCursors] = useState<(string | undefined)[]>([undefined]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [totalPages, setTotalPages] = useState<number | null>(null);
+    const page = cursors.length;
+    const firstPage = () => setCursors([undefined]);
     const [loading, setLoading] = useState(false);
 
     const load = async () => {
         setLoading(true);
         try {
-            const data = await fetchFeed(new Date(since).toISOString(), selectedSite, page, 50, search);
+            const data = await fetchFeed(new Date(since).toISOString(), selectedSite, cursors[cursors.length - 1], 50, search);
             setPages(data.items);
+            setNextCursor(data.next_cursor);
             setTotalPages(data.total_pages);
         } finally {
             setLoading(false);
         }
     };
 
+    // The feed only carries a preview of the text; the reader loads the full page
+    const openPage = async (item: any) => {
+        setSelectedPage(item);
+        if (item.latest_content?.truncated) {
+            const detail = await fetchPage(item.id);
+            setSelectedPage((current: any) => current?.id === item.id ? { ...item, ...detail, site_name: item.site_name } : current);
+        }
+    };
+
     const loadSites = async () => {
         const data = await fetchSites();
         setSites(data);
@@ -54,7 +68,7 @@ export default function Feed() {
                             <input
                                 type="text"
                                 value={search}
-                                onChange={e => { setSearch(e.target.value); setPage(1); }}
+                                onChange={e => { setSearch(e.target.value); firstPage(); }}
                                 onKeyDown={e => { if (e.key === 'Enter') load(); }}
                                 placeholder="Title or content..."
                                 className="w-full border border-gray-200 rounded-xl pl-10 pr-10 py-2.5 text-sm bg-gray-50/50 focus:ring-2 focus:ring-blue-500 outline-none transition-all"
@@ -77,7 +91,7 @@ export default function Feed() {
                         <label className="text-[10px] uppercase font-bold text-gray-400 ml-1">Filter by Site</label>
                         <select
                             value={selectedSite}
-                            onChange={e => { setSelectedSite(e.target.value); setPage(1); }}
+                            onChange={e => { setSelectedSite(e.target.value); firstPage(); }}
                             className="border border-gray-200 rounded-xl px-4 py-2.5 text-sm bg-gray-50/50 focus:ring-2 focus:ring-blue-500 outline-none transition-all"
                         >
                             <option value="">All Sites</option>
@@ -92,7 +106,7 @@ export default function Feed() {
                         <input
                             type="datetime-local"
                             value={since}
-                            onChange={e => setSince(e.target.value)}
+                            onChange={e => { setSince(e.target.value); firstPage(); }}
                             className="border border-gray-200 rounded-xl px-4 py-2.5 text-sm bg-gray-50/50 focus:ring-2 focus:ring-blue-500 outline-none transition-all"
                         />
                     </div>
@@ -162,7 +176,7 @@ export default function Feed() {
                             <div className="flex items-center gap-2 shrink-0">
                                 {page.latest_content && (
                                     <button
-                                        onClick={() => setSelectedPage(page)}
+                                        onClick={() => openPage(page)}
                                         className="inline-flex items-center text-[10px] font-bold text-blue-600 hover:text-blue-700 transition-colors bg-blue-50 hover:bg-blue-100 px-2.5 py-1.5 rounded-lg whitespace-nowrap"
                                     >
                                         <svg className="w-3.5 h-3.5 mr-1" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -193,19 +207,20 @@ export default function Feed() {
             {pages.length > 0 && (
                 <div className="flex items-center justify-between bg-white p-4 rounded-xl border border-gray-100 shadow-sm">
                     <div className="text-sm text-gray-500">
-                        Page <span className="font-semibold text-gray-900">{page}</span> of <span className="font-semibold text-gray-900">{totalPages}</span>
+                        Page <span className="font-semibold text-gray-900">{page}</span>
+                        {totalPages !== null && <> of about <span className="font-semibold text-gray-900">{Math.max(totalPages, page)}</span></>}
                     </div>
                     <div className="flex gap-2">
                         <button
-                            onClick={() => setPage(p => Math.max(1, p - 1))}
+                            onClick={() => setCursors(c => c.length > 1 ? c.slice(0, -1) : c)}
                             disabled={page === 1}
                             className="px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-200 rounded-lg hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed transition-colors"
                         >
                             Previous
                         </button>
                         <button
-                            onClick={() => setPage(p => Math.min(totalPages, p + 1))}
-                            disabled={page >= totalPages}
+                            onClick={() => nextCursor && setCursors(c => [...c, nextCursor])}
+                            disabled={!nextCursor}
                             className="px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-200 rounded-lg hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed transition-colors"
                         >
                             Next
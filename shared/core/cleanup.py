@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional, Callable, Awaitable
+
+from sqlalchemy import select, delete
+
+from shared.core.database import AsyncSessionLocal
+from shared.core.models import Page, PageContent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_THROTTLE_MS = 100
+
+
+class SiteDataCleaner:
+    """
+    Deletes all pages (and their contents) of a site in bounded batches.
+
+    Every batch takes the next key range of page ids for the site (ordered by id),
+    deletes their contents and then the pages, and commits. Locks are only held
+    for one batch at a time, so the worker and the API keep running meanwhile.
+
+    Since each batch is committed on its own, an interrupted cleanup can simply be
+    started again: it continues with whatever is left (or after `resume_after`).
+    """
+
+    def __init__(
+        self,
+        site_id: uuid.UUID,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        throttle_ms: int = DEFAULT_THROTTLE_MS,
+        resume_after: Optional[uuid.UUID] = None,
+        session_factory=AsyncSessionLocal,
+        on_progress: Optional[Callable[["SiteDataCleaner"], Awaitable[None]]] = None,
+    ):
+        self.site_id = site_id
+        self.batch_size = batch_size
+        self.throttle_ms = throttle_ms
+        self.session_factory = session_factory
+        self.on_progress = on_progress
+
+        self.status = "pending"
+        self.pages_deleted = 0
+        self.contents_deleted = 0
+        self.batches = 0
+        self.last_page_id: Optional[uuid.UUID] = resume_after
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self._cancelled = False
+
+    @property
+    def is_running(self) -> bool:
+        return self.status in ("pending", "running")
+
+    def cancel(self):
+        self._cancelled = True
+
+    async def _delete_batch(self) -> bool:
+        """Deletes the next batch. Returns False when there is nothing left."""
+        async with self.session_factory() as session:
+            query = select(Page.id).where(Page.site_id == self.site_id)
+            if self.last_page_id is not None:
+                query = query.where(Page.id > self.last_page_id)
+            query = query.order_by(Page.id).limit(self.batch_size)
+
+            result = await session.execute(query)
+            page_ids = result.scalars().all()
+            if not page_ids:
+                return False
+
+            result_contents = await session.execute(
+                delete(PageContent).where(PageContent.page_id.in_(page_ids))
+            )
+            result_pages = await session.execute(
+                delete(Page).where(Page.id.in_(page_ids))
+            )
+            await session.commit()
+
+        self.contents_deleted += result_contents.rowcount or 0
+        self.pages_deleted += result_pages.rowcount or 0
+        self.last_page_id = page_ids[-1]
+        self.batches += 1
+        return True
+
+    async def run(self) -> "SiteDataCleaner":
+        self.status = "running"
+        self.started_at = datetime.now(timezone.utc)
+        try:
+            while not self._cancelled:
+                batch_started = time.monotonic()
+                if not await self._delete_batch():
+                    break
+
+                if self.on_progress:
+                    await self.on_progress(self)
+
+                # Throttle: never spend more than half of the wall time deleting
+                elapsed = time.monotonic() - batch_started
+                await asyncio.sleep(max(self.throttle_ms / 1000.0, elapsed))
+
+            self.status = "cancelled" if self._cancelled else "finished"
+        except Exception as e:
+            logger.error(f"Cleanup for site {self.site_id} failed after {self.batches} batches: {e}")
+            self.status = "failed"
+            self.error = str(e)
+        finally:
+            self.finished_at = datetime.now(timezone.utc)
+
+        logger.info(
+            f"Cleanup for site {self.site_id} {self.status}: "
+            f"{self.pages_deleted} pages, {self.contents_deleted} contents in {self.batches} batches"
+        )
+        return self
@@ -0,0 +1,59 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+
+from shared.core import models
+
+# NOTIFY channel carrying each committed page event (payload: the event, see event_dict)
+PAGE_EVENTS_CHANNEL = "page_events"
+EVENT_CREATED = "created"
+EVENT_UPDATED = "updated"
+# Transaction-level advisory lock serializing page commits that take a change_seq / event id
+PAGE_CHANGE_LOCK_ID = 7146391
+
+def event_dict(event: models.PageEvent) -> dict:
+    """The event as sent to consumers."""
+    return {"id": event.id, "type": event.event_type, **event.payload}
+
+async def record_page_event(db, page: models.Page, event_type: str) -> models.PageEvent:
+    """
+    Adds a page event to the outbox and queues its NOTIFY, both part of the caller's
+    transaction: consumers only hear about it once the page itself is committed.
+    """
+    event = models.PageEvent(
+        site_id=page.site_id,
+        page_id=page.id,
+        event_type=event_type,
+        payload={
+            "site_id": str(page.site_id),
+            "page_id": str(page.id),
+            "url": page.url,
+            "title": page.title[:500] if page.title else None,
+            "published_at": page.published_at.isoformat() if page.published_at else None,
+            "scraped_at": page.scraped_at.isoformat() if page.scraped_at else None,
+        },
+    )
+    db.add(event)
+    await db.flush()  # assigns the id
+    await db.execute(select(func.pg_notify(PAGE_EVENTS_CHANNEL, json.dumps(event_dict(event)))))
+    return event
+
+async def mark_page_changed(db, page: models.Page, event_type: str) -> models.PageEvent:
+    """
+    Stamps the page with the next change_seq and records its page event. Call right before commit.
+
+    The advisory lock is held until that commit, so sequence values and event ids become
+    visible in increasing order: a consumer that read up to N can never later find a
+    smaller one committed behind it. Writers only wait for each other's final commit.
+    """
+    await db.execute(select(func.pg_advisory_xact_lock(PAGE_CHANGE_LOCK_ID)))
+    page.change_seq = await db.scalar(models.page_change_seq.next_value())
+    return await record_page_event(db, page, event_type)
+
+async def prune_page_events(db, retention_days: int) -> int:
+    """Deletes events older than retention_days; consumers can't resume from before that."""
+    threshold = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    result = await db.execute(delete(models.PageEvent).where(models.PageEvent.created_at < threshold))
+    await db.commit()
+    return result.rowcount
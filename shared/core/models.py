@@ -1,11 +1,11 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, date
 from enum import Enum
 from typing import Optional, Any
-from sqlalchemy import String, Boolean, Integer, ForeignKey, DateTime, Text, Enum as PgEnum, Index
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy.sql import func, literal_column
+from sqlalchemy import String, Boolean, Integer, BigInteger, ForeignKey, DateTime, Date, Text, Enum as PgEnum, Index, Identity, Sequence
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, column_property
+from sqlalchemy.sql import func
 
 class Base(DeclarativeBase):
     pass
@@ -15,6 +15,11 @@ class CrawlStrategy(str, Enum):
     RSS = "rss"
     LINKS = "links"
 
+class RenderMode(str, Enum):
+    STATIC = "static"    # plain HTTP fetch only
+    AUTO = "auto"        # HTTP fetch, render with a browser only if the static HTML isn't usable
+    BROWSER = "browser"  # always render with a browser
+
 class ApiKey(Base):
     __tablename__ = "api_keys"
 
@@ -25,6 +30,19 @@ class ApiKey(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
+    # Limits for the public API; None means the backend defaults (PUBLIC_RATE_LIMIT_* env vars)
+    rate_limit_per_minute: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    rate_limit_burst: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    daily_quota: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # 0 = unlimited
+
+class ApiKeyUsage(Base):
+    """Requests per API key and (UTC) day, flushed in batches by the backend rate limiter."""
+    __tablename__ = "api_key_usage"
+
+    api_key_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("api_keys.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    requests: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -59,10 +77,15 @@ class Site(Base):
     
     # strategy default priority: sitemap -> rss -> links
     crawl_strategy: Mapped[CrawlStrategy] = mapped_column(PgEnum(CrawlStrategy), default=CrawlStrategy.SITEMAP)
+    render_mode: Mapped[RenderMode] = mapped_column(PgEnum(RenderMode), default=RenderMode.STATIC, server_default="STATIC")
     
     rate_limit_ms: Mapped[int] = mapped_column(Integer, default=1000)
     user_agent: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     config_warning: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Learned by the worker: which content extraction tier works for this site
+    extraction_profile: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    # Allow / deny / priority rules for discovered URLs, before the defaults (see shared.core.url_rules)
+    url_rules: Mapped[Optional[list[dict[str, Any]]]] = mapped_column(JSONB, nullable=True)
     
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -70,6 +93,9 @@ class Site(Base):
     pages: Mapped[list["Page"]] = relationship("Page", back_populates="site")
     scrape_runs: Mapped[list["ScrapeRun"]] = relationship("ScrapeRun", back_populates="site")
 
+# Change sequence of pages (Page.change_seq), see shared.core.events.mark_page_changed
+page_change_seq = Sequence("pages_change_seq", metadata=Base.metadata)
+
 class Page(Base):
     __tablename__ = "pages"
 
@@ -99,16 +125,22 @@ class Page(Base):
     content_hash: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
+    # Weighted FTS document (title A, summary B, latest extracted text C), set at ingest
+    search_vector: Mapped[Optional[Any]] = mapped_column(TSVECTOR, nullable=True, deferred=True)
+    # Bumped every time the page is (re)processed, in commit order: incremental sync cursor
+    change_seq: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True, index=True)
+
+    # Feed ordering key: the real publication date when known (indexed with id, see ix_pages_feed_order)
+    sort_at: Mapped[datetime] = column_property(func.coalesce(published_at, scraped_at, first_seen_at))
+
     site: Mapped["Site"] = relationship("Site", back_populates="pages")
     contents: Mapped[list["PageContent"]] = relationship("PageContent", back_populates="page")
     
     __table_args__ = (
-        Index(
-            "ix_pages_title_fts",
-            func.to_tsvector(literal_column("'spanish'"), title),
-            postgresql_using="gin",
-        ),
+        Index("ix_pages_search_vector", search_vector, postgresql_using="gin"),
         Index("ix_pages_published_at", published_at.desc()),
+        Index("ix_pages_site_id_id", site_id, id),
+        Index("ix_pages_feed_order", func.coalesce(published_at, scraped_at, first_seen_at).desc(), id.desc()),
     )
 
 class PageContent(Base):
@@ -126,14 +158,50 @@ class PageContent(Base):
     page: Mapped["Page"] = relationship("Page", back_populates="contents")
 
     __table_args__ = (
-        Index(
-            "ix_page_contents_text_fts",
-            func.to_tsvector(literal_column("'spanish'"), extracted_text),
-            postgresql_using="gin",
-        ),
         Index("ix_page_contents_created_at", created_at.desc()),
+        Index("ix_page_contents_page_id", page_id),
     )
 
+class PageEvent(Base):
+    """
+    Outbox of article events ("created" / "updated"), written by the worker in the same
+    transaction as the page. Feeds the public event stream (SSE / long-poll); the id is the event id.
+    """
+    __tablename__ = "page_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    site_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    page_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    event_type: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    __table_args__ = (
+        Index("ix_page_events_site_id_id", site_id, id),
+    )
+
+class SiteStats(Base):
+    """
+    Per-site page counters and last run outcome, maintained by triggers on pages and
+    scrape_runs (see migration 1c5a8e3f7b90) and periodically reconciled by the worker.
+    """
+    __tablename__ = "site_stats"
+
+    site_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("sites.id", ondelete="CASCADE"), primary_key=True)
+    new_count: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    processed_count: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    failed_count: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    skipped_count: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    last_processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    last_run_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    last_run_finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_run_discovered: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_run_processed: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_run_failed: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    reconciled_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
 class ScrapeRun(Base):
     __tablename__ = "scrape_runs"
 
@@ -148,11 +216,49 @@ class ScrapeRun(Base):
     pages_processed: Mapped[int] = mapped_column(Integer, default=0)
     pages_failed: Mapped[int] = mapped_column(Integer, default=0)
     pages_skipped: Mapped[int] = mapped_column(Integer, default=0)
+    # Per stage (fetch, validate, content, commit, ...): count, total_ms and p50/p90/p99/max_ms
+    stage_timings: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
     
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     site: Mapped["Site"] = relationship("Site", back_populates="scrape_runs")
 
+    __table_args__ = (
+        Index("ix_scrape_runs_site_id_started_at", site_id, started_at.desc()),
+    )
+
+# Values of PageContent.metadata_["extraction_method"]: the ContentExtractor.TIERS, in order
+# (the worker's extractor, which the backend image doesn't ship), and "failed"
+EXTRACTION_METHODS = ("arc_fusion", "trafilatura", "bs4_article", "bs4_paragraphs", "failed")
+
+class ReextractionJob(Base):
+    """
+    Offline re-extraction of stored raw_html with the current extractors (see worker.app.reextract).
+    Filters are fixed at creation; last_content_id is the checkpoint, committed with every batch,
+    that a stopped job resumes after.
+    """
+    __tablename__ = "reextraction_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # pending, running, finished, failed, cancelled
+    status: Mapped[str] = mapped_column(String, default="pending", server_default="pending", nullable=False)
+
+    site_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    scraped_from: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    scraped_to: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    extraction_method: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+    last_content_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    contents_done: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    pages_changed: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    contents_failed: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
 class Setting(Base):
     __tablename__ = "settings"
 
@@ -1,9 +1,10 @@
 from datetime import datetime
-from typing import Optional, Any
+from typing import Literal, Optional, Any
 from uuid import UUID
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, HttpUrl, Field, field_validator
 
-from shared.core.models import CrawlStrategy, PageStatus, DiscoverySource
+from shared.core import url_rules
+from shared.core.models import CrawlStrategy, PageStatus, DiscoverySource, RenderMode
 
 
 # --- Auth Schemas ---
@@ -21,6 +22,20 @@ class UserLogin(BaseModel):
 
 # --- Site Schemas ---
 
+class UrlRule(BaseModel):
+    """A site's URL rule. Patterns are checked when the site is created or updated, not on reads."""
+    action: Literal["allow", "deny", "priority"]
+    match: Literal["substring", "glob", "regex"] = "substring"
+    pattern: str = Field(min_length=1)
+    priority: int = 0
+    ignore_case: bool = False
+
+def check_url_rules(rules: Optional[list[UrlRule]]) -> Optional[list[UrlRule]]:
+    """The site's rules compile as discovery uses them: joined, before the defaults."""
+    if rules:
+        url_rules.validate([rule.model_dump() for rule in rules] + url_rules.DEFAULT_RULES)
+    return rules
+
 class SiteBase(BaseModel):
     name: str
     base_url: str
@@ -29,12 +44,14 @@ class SiteBase(BaseModel):
     sitemap_url: Optional[str] = None
     rss_url: Optional[str] = None
     crawl_strategy: CrawlStrategy = CrawlStrategy.SITEMAP
+    render_mode: RenderMode = RenderMode.STATIC
     rate_limit_ms: int = 1000
     user_agent: Optional[str] = None
     config_warning: Optional[str] = None
+    url_rules: Optional[list[UrlRule]] = None
 
 class SiteCreate(SiteBase):
-    pass
+    _check_url_rules = field_validator("url_rules")(check_url_rules)
 
 class SiteUpdate(BaseModel):
     name: Optional[str] = None
@@ -45,6 +62,10 @@ class SiteUpdate(BaseModel):
     rate_limit_ms: Optional[int] = None
     user_agent: Optional[str] = None
     crawl_strategy: Optional[CrawlStrategy] = None
+    render_mode: Optional[RenderMode] = None
+    url_rules: Optional[list[UrlRule]] = None
+
+    _check_url_rules = field_validator("url_rules")(check_url_rules)
 
 class SiteRead(SiteBase):
     id: UUID
@@ -52,6 +73,30 @@ class SiteRead(SiteBase):
     updated_at: datetime
     pages_count: int = 0
     pending_count: int = 0
+    failed_count: int = 0
+    skipped_count: int = 0
+    last_processed_at: Optional[datetime] = None
+    last_run_finished_at: Optional[datetime] = None
+    last_run_processed: Optional[int] = None
+    last_run_failed: Optional[int] = None
+    extraction_profile: Optional[dict[str, Any]] = None
+
+    class Config:
+        from_attributes = True
+
+class ScrapeRunRead(BaseModel):
+    id: UUID
+    site_id: UUID
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    pages_discovered: int = 0
+    pages_new: int = 0
+    pages_processed: int = 0
+    pages_failed: int = 0
+    pages_skipped: int = 0
+    # {stage: {count, total_ms, p50_ms, p90_ms, p99_ms, max_ms}}
+    stage_timings: Optional[dict[str, dict[str, float]]] = None
+    error: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -86,6 +131,7 @@ class PageRead(BaseModel):
 class PageContentRead(BaseModel):
     id: UUID
     extracted_text: str
+    truncated: bool = False  # extracted_text is a preview (list views)
     metadata: dict[str, Any] = Field(alias="metadata_")
     created_at: datetime
 
@@ -97,7 +143,44 @@ class PageDetail(PageRead):
 
 class PaginatedFeedResponse(BaseModel):
     items: list[PageDetail]
-    total: int
+    total: Optional[int] = None  # None when count=none
+    total_estimated: bool = False
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+# --- Admin Job Schemas ---
+
+class ReextractionJobRead(BaseModel):
+    id: UUID
+    status: str
+    site_id: Optional[UUID] = None
+    scraped_from: Optional[datetime] = None
+    scraped_to: Optional[datetime] = None
+    extraction_method: Optional[str] = None
+    last_content_id: Optional[UUID] = None
+    contents_done: int = 0
+    pages_changed: int = 0
+    contents_failed: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class SiteCleanupRead(BaseModel):
+    site_id: UUID
+    status: str
+    pages_deleted: int
+    contents_deleted: int
+    batches: int
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,30 @@
+from typing import Optional
+from sqlalchemy import func, literal_column
+
+from shared.core.utils import text_search_config
+
+# Body text past this point is not indexed (keeps tsvectors far from Postgres' 1MB limit)
+SEARCH_BODY_MAX_CHARS = 100_000
+
+def _regconfig(language: Optional[str]):
+    # Safe to inline: the name always comes from the TEXT_SEARCH_CONFIGS whitelist
+    return literal_column(f"'{text_search_config(language)}'::regconfig")
+
+def build_search_vector(language: Optional[str], title: Optional[str], summary: Optional[str], body: Optional[str]):
+    """
+    SQL expression for Page.search_vector: title weighted A, summary B and body C,
+    using the text search config for the page language.
+    """
+    config = _regconfig(language)
+
+    def weighted(text: Optional[str], weight: str):
+        return func.setweight(func.to_tsvector(config, text or ""), literal_column(f"'{weight}'"))
+
+    return (
+        weighted(title, "A")
+        .op("||")(weighted(summary, "B"))
+        .op("||")(weighted((body or "")[:SEARCH_BODY_MAX_CHARS], "C"))
+    )
+
+def build_search_query(q: str, language: Optional[str] = None):
+    return func.plainto_tsquery(_regconfig(language), q)
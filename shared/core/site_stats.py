@@ -0,0 +1,47 @@
+import logging
+
+from sqlalchemy import select, text
+
+from shared.core import models
+
+logger = logging.getLogger(__name__)
+
+# Waits for writers that already applied a delta to the row; later ones wait for us
+LOCK_SQL = text("SELECT 1 FROM site_stats WHERE site_id = :site_id FOR UPDATE")
+
+# Recomputes one site's counters from pages. Same as the migration backfill.
+RECONCILE_SQL = text("""
+    INSERT INTO site_stats AS s (site_id, new_count, processed_count, failed_count, skipped_count, last_processed_at, reconciled_at)
+    SELECT
+        :site_id,
+        count(*) FILTER (WHERE status = 'NEW'),
+        count(*) FILTER (WHERE status = 'PROCESSED'),
+        count(*) FILTER (WHERE status = 'FAILED'),
+        count(*) FILTER (WHERE status = 'SKIPPED'),
+        max(scraped_at) FILTER (WHERE status = 'PROCESSED'),
+        now()
+    FROM pages
+    WHERE site_id = :site_id
+    ON CONFLICT (site_id) DO UPDATE SET
+        new_count = EXCLUDED.new_count,
+        processed_count = EXCLUDED.processed_count,
+        failed_count = EXCLUDED.failed_count,
+        skipped_count = EXCLUDED.skipped_count,
+        last_processed_at = EXCLUDED.last_processed_at,
+        reconciled_at = EXCLUDED.reconciled_at
+""")
+
+async def reconcile_site_stats(db) -> int:
+    """
+    Rewrites every site's counters from pages, one site per transaction so the
+    site_stats row is only locked for that site's count. Returns the number of sites.
+    The triggers keep the counters exact; this only repairs drift (e.g. manual SQL with triggers disabled).
+    """
+    result = await db.execute(select(models.Site.id))
+    site_ids = result.scalars().all()
+    for site_id in site_ids:
+        # Lock first: the count then runs on a snapshot taken after every delta applied so far
+        await db.execute(LOCK_SQL, {"site_id": site_id})
+        await db.execute(RECONCILE_SQL, {"site_id": site_id})
+        await db.commit()
+    return len(site_ids)
@@ -0,0 +1,143 @@
+"""
+URL rules of a site: which discovered URLs are kept and in which order they are processed.
+
+Rules are stored on the site (Site.url_rules) as a list of dicts:
+
+    {"action": "deny", "pattern": "/opinion/"}
+    {"action": "allow", "match": "regex", "pattern": "/tema/elecciones-\\d{4}/"}
+    {"action": "priority", "match": "glob", "pattern": "*/ultimas-noticias/*", "priority": -5}
+
+- action: "deny" drops matching URLs, "allow" keeps them even when a deny rule matches,
+  "priority" orders them (lower first; URLs matching no priority rule get 0).
+- match: "substring" (default) and "regex" match anywhere in the URL, "glob" the whole URL.
+  Regex rules are joined into one pattern, so they can't have capturing groups (use (?:...))
+  or backreferences.
+- ignore_case: false by default.
+
+A site's rules go before DEFAULT_RULES, so for priorities the first matching rule wins and a
+site rule overrides a default one. Every rule set is compiled once (and cached) into one
+combined regex per outcome: deny, allow and each priority level. Filtering a URL is one
+search, two when a deny rule matches and there are allow rules.
+"""
+import fnmatch
+import json
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+
+ACTIONS = ("allow", "deny", "priority")
+MATCH_TYPES = ("substring", "glob", "regex")
+
+DEFAULT_DENY = [
+    "/category/", "/tag/", "/archive/", "/author/", "/page/", "/search/", "/search?",
+    "/etiqueta/", "/categoria/", "/autor/", "/pag/", "/busqueda/", "/busqueda?", "/tema/",  # Spanish common patterns
+]
+# Sections processed last / first when a run can't take every new URL
+DEFAULT_LOW_PRIORITY = ["/clima/", "/loterias/", "/quiniela/", "/horoscopo/", "/avisos-funebres/"]
+DEFAULT_HIGH_PRIORITY = ["/economia/", "/politica/", "/negocios/", "/el-mundo/", "/sociedad/"]
+
+DEFAULT_RULES = [
+    *({"action": "deny", "pattern": pattern} for pattern in DEFAULT_DENY),
+    *({"action": "priority", "pattern": pattern, "priority": 10, "ignore_case": True} for pattern in DEFAULT_LOW_PRIORITY),
+    *({"action": "priority", "pattern": pattern, "priority": -1, "ignore_case": True} for pattern in DEFAULT_HIGH_PRIORITY),
+]
+
+def _regex(rules: list[dict]) -> Optional[re.Pattern]:
+    """One regex, searched in a URL, that matches when any of the rules matches it."""
+    if not rules:
+        return None
+    parts, ignore_case = [], []
+    for rule in rules:
+        match = rule.get("match", "substring")
+        pattern = rule["pattern"]
+        if match == "substring":
+            body = re.escape(pattern)
+        elif match == "regex":
+            if re.compile(pattern).groups:
+                raise ValueError(f"Regex rule {pattern!r} has a capturing group (use (?:...) instead)")
+            body = f"(?:{pattern})"
+        elif match == "glob":
+            body = r"\A" + fnmatch.translate(pattern)
+        else:
+            raise ValueError(f"Unknown match type {match!r} (expected one of {', '.join(MATCH_TYPES)})")
+        (ignore_case if rule.get("ignore_case") else parts).append(body)
+    # Only one alternation, without capturing groups, and one (?i:) around all the case-insensitive
+    # parts: otherwise CPython's regex engine can't skip ahead to the possible first characters
+    # of a match, which makes the search several times slower
+    if ignore_case:
+        parts.append("(?i:" + "|".join(ignore_case) + ")")
+    return re.compile("|".join(parts))
+
+class UrlRules:
+    """A compiled rule set; get one with for_site()."""
+
+    def __init__(self, rules: list[dict]):
+        self.rules = rules
+        for rule in rules:
+            if rule.get("action") not in ACTIONS:
+                raise ValueError(f"Unknown rule action {rule.get('action')!r} (expected one of {', '.join(ACTIONS)})")
+            if not rule.get("pattern"):
+                raise ValueError("URL rule without a pattern")
+
+        self._deny = _regex([rule for rule in rules if rule["action"] == "deny"])
+        self._allow = _regex([rule for rule in rules if rule["action"] == "allow"])
+
+        # Consecutive rules with the same priority share a regex; levels are tried in rule order
+        levels: list[tuple[int, list[dict]]] = []
+        for rule in rules:
+            if rule["action"] != "priority":
+                continue
+            priority = int(rule.get("priority", 0))
+            if levels and levels[-1][0] == priority:
+                levels[-1][1].append(rule)
+            else:
+                levels.append((priority, [rule]))
+        self._levels = [(priority, _regex(level_rules)) for priority, level_rules in levels]
+
+    def allows(self, url: str) -> bool:
+        if self._deny is None or self._deny.search(url) is None:
+            return True
+        return self._allow is not None and self._allow.search(url) is not None
+
+    def priority(self, url: str) -> int:
+        for priority, regex in self._levels:
+            if regex.search(url):
+                return priority
+        return 0
+
+    def filter(self, urls: Iterable[str]) -> list[str]:
+        """The allowed URLs, in order."""
+        if self._deny is None:
+            return list(urls)
+        if self._allow is None:
+            denied = self._deny.search
+            return [url for url in urls if denied(url) is None]
+        allows = self.allows
+        return [url for url in urls if allows(url)]
+
+    def sort(self, urls: Iterable[str]) -> list[str]:
+        """By priority, lowest first; stable within a priority."""
+        return sorted(urls, key=self.priority)
+
+@lru_cache(maxsize=256)
+def _compiled(site_rules: str) -> UrlRules:
+    return UrlRules(json.loads(site_rules) + DEFAULT_RULES)
+
+def for_site(site_rules: Optional[list[dict]]) -> UrlRules:
+    """The site's rules followed by the defaults, compiled once per distinct rule set."""
+    return _compiled(json.dumps(site_rules or [], sort_keys=True))
+
+def validate(rules: list[dict]):
+    """Raises ValueError when the rules don't compile (together, as they are used)."""
+    try:
+        UrlRules(rules)
+    except re.error as e:
+        raise ValueError(f"Invalid URL rule pattern: {e}")
+
+def rules_warning(site_rules: Optional[list[dict]]) -> Optional[str]:
+    """Why the site's rules can't be used, or None. Discovery then runs with the defaults only."""
+    try:
+        for_site(site_rules)
+    except Exception as e:
+        return f"Invalid URL rules, using the default ones: {e}"
+    return None
@@ -1,4 +1,5 @@
 import hashlib
+from typing import Optional
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 
 TRACKING_PARAMS = {
@@ -6,6 +7,15 @@ TRACKING_PARAMS = {
     'gclid', 'fbclid', 'yclid', '_ga', 'mc_cid', 'mc_eid'
 }
 
+# Postgres text search configurations, keyed by ISO 639-1 language code
+TEXT_SEARCH_CONFIGS = {
+    'es': 'spanish', 'en': 'english', 'pt': 'portuguese', 'fr': 'french',
+    'it': 'italian', 'de': 'german', 'nl': 'dutch', 'da': 'danish',
+    'fi': 'finnish', 'hu': 'hungarian', 'no': 'norwegian', 'ro': 'romanian',
+    'ru': 'russian', 'sv': 'swedish', 'tr': 'turkish',
+}
+DEFAULT_TEXT_SEARCH_CONFIG = 'spanish'
+
 def canonicalize_url(url: str) -> str:
     """
     Canonicalize URL:
@@ -54,3 +64,13 @@ def compute_content_hash(text: str) -> str:
     if not text:
         return ""
     return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def text_search_config(language: Optional[str]) -> str:
+    """
+    Maps a page language ('es', 'es-AR', 'pt_BR', ...) to a Postgres text search config.
+    Unknown or missing languages use the default ('spanish').
+    """
+    if not language:
+        return DEFAULT_TEXT_SEARCH_CONFIG
+    code = language.strip().lower().replace('_', '-').split('-')[0]
+    return TEXT_SEARCH_CONFIGS.get(code, DEFAULT_TEXT_SEARCH_CONFIG)
@@ -1,7 +1,9 @@
 import json
 import re
+from typing import Optional
 import trafilatura
 from bs4 import BeautifulSoup
+from soupsieve import SelectorSyntaxError
 
 class ContentExtractor:
     """
@@ -9,7 +11,7 @@ class ContentExtractor:
     Primary: Trafilatura
     Fallback: BeautifulSoup heuristics
     """
-    
+
     MIN_TEXT_LENGTH = 100
 
     @staticmethod
@@ -17,6 +19,42 @@ class ContentExtractor:
         """
         Returns (extracted_text, method_used)
         """
+        text, method, _ = ContentExtractor._extract_all(html)
+        return text, method
+
+    @staticmethod
+    def extract_with_hint(html: str, method: Optional[str] = None, selector: Optional[str] = None) -> tuple[str, str, Optional[str]]:
+        """
+        Tries only the given method (e.g. learned by an ExtractionProfile) and falls back
+        to the full chain if it doesn't produce enough text.
+        Returns (extracted_text, method_used, content_selector)
+        """
+        tier = ContentExtractor.TIERS.get(method)
+        if tier:
+            state = {}
+            result = tier(html, selector, state)
+            if result:
+                return result[0], method, result[1]
+            # The hinted tier already missed: only worth another run without a learned selector
+            return ContentExtractor._extract_all(html, state, skip=None if selector else method)
+        return ContentExtractor._extract_all(html)
+
+    @staticmethod
+    def _extract_all(html: str, state: Optional[dict] = None, skip: Optional[str] = None) -> tuple[str, str, Optional[str]]:
+        # `state` lets tiers share work (the cleaned soup) within one extraction
+        state = {} if state is None else state
+        for method, tier in ContentExtractor.TIERS.items():
+            if method == skip:
+                continue
+            result = tier(html, None, state)
+            if result:
+                return result[0], method, result[1]
+        return "", "failed", None
+
+    # Each tier returns (text, content_selector) or None if it didn't find enough text
+
+    @staticmethod
+    def _arc_fusion(html: str, selector: Optional[str], state: dict) -> Optional[tuple[str, Optional[str]]]:
         # 0. Arc Publishing (Fusion CMS)
         try:
             if "Fusion.globalContent" in html:
@@ -43,32 +81,58 @@ class ContentExtractor:
 
                             fusion_text = "\n\n".join(text_blocks)
                             if len(fusion_text) >= ContentExtractor.MIN_TEXT_LENGTH:
-                                return fusion_text, "arc_fusion"
+                                return fusion_text, None
         except Exception:
             pass
+        return None
 
+    @staticmethod
+    def _trafilatura(html: str, selector: Optional[str], state: dict) -> Optional[tuple[str, Optional[str]]]:
         # 1. Trafilatura
         try:
             text = trafilatura.extract(html, include_tables=False, include_comments=False)
             if text and len(text) >= ContentExtractor.MIN_TEXT_LENGTH:
-                return text, "trafilatura"
+                return text, None
         except Exception:
             pass
-            
-        # 2. BS4 Fallback
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove scripts and styles
-        for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
-            script.decompose()
-
-        # Try specific tags
-        article = soup.find('article')
+        return None
+
+    @staticmethod
+    def _clean_soup(html: str, state: dict) -> BeautifulSoup:
+        # 2. BS4 Fallback (parsed once, shared by the bs4 tiers)
+        if "clean_soup" not in state:
+            soup = BeautifulSoup(html, 'html.parser')
+
+            # Remove scripts and styles
+            for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
+                script.decompose()
+            state["clean_soup"] = soup
+        return state["clean_soup"]
+
+    @staticmethod
+    def _bs4_article(html: str, selector: Optional[str], state: dict) -> Optional[tuple[str, Optional[str]]]:
+        soup = ContentExtractor._clean_soup(html, state)
+
+        # Try specific tags (or the exact container learned for the site)
+        article = None
+        if selector:
+            try:
+                article = soup.select_one(selector)
+            except (SelectorSyntaxError, NotImplementedError):
+                # A stored selector soupsieve can't parse: the generic container is learned again
+                selector = None
+        if not selector:
+            article = soup.find('article')
         if article:
             text = article.get_text(separator='\n', strip=True)
             if len(text) >= ContentExtractor.MIN_TEXT_LENGTH:
-                return text, "bs4_article"
-                
+                return text, selector or ContentExtractor._css_selector(article)
+        return None
+
+    @staticmethod
+    def _bs4_paragraphs(html: str, selector: Optional[str], state: dict) -> Optional[tuple[str, Optional[str]]]:
+        soup = ContentExtractor._clean_soup(html, state)
+
         # Try generic body paragraphs
         body = soup.find('body')
         if body:
@@ -76,6 +140,21 @@ class ContentExtractor:
             text_blocks = [p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 20]
             text = "\n\n".join(text_blocks)
             if len(text) >= ContentExtractor.MIN_TEXT_LENGTH:
-                return text, "bs4_paragraphs"
-                
-        return "", "failed"
+                return text, None
+        return None
+
+    @staticmethod
+    def _css_selector(tag) -> str:
+        """Selector for the tag: its name plus its first class, e.g. 'article.nota'"""
+        classes = tag.get('class') or []
+        if classes and re.fullmatch(r'[A-Za-z_-][\w-]*', classes[0]):
+            return f"{tag.name}.{classes[0]}"
+        return tag.name
+
+# Extraction chain, in priority order
+ContentExtractor.TIERS = {
+    "arc_fusion": ContentExtractor._arc_fusion,
+    "trafilatura": ContentExtractor._trafilatura,
+    "bs4_article": ContentExtractor._bs4_article,
+    "bs4_paragraphs": ContentExtractor._bs4_paragraphs,
+}
@@ -1,9 +1,32 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional, Tuple
 import dateutil.parser
 import re
 import json
 
+# Precompiled lookups, in priority order
+META_TARGETS = [
+    ('property', 'article:published_time'),
+    ('property', 'og:published_time'),
+    ('name', 'parsely-pub-date'),
+    ('name', 'citation_publication_date'),
+    ('name', 'dc.date.issued'),
+]
+META_GENERIC_NAMES = ['date', 'pubdate', 'datePublished']
+
+WANTED_META = set(META_TARGETS)
+for _name in META_GENERIC_NAMES:
+    WANTED_META.add(('name', _name))
+    WANTED_META.add(('itemprop', _name))
+META_ATTRS = ('property', 'name', 'itemprop')
+
+URL_DATE_RE = re.compile(r'/(\d{4})/(\d{2})/(\d{2})/')
+# ISO-8601 / RFC-3339 shapes that datetime.fromisoformat parses exactly like dateutil
+ISO_DATE_RE = re.compile(
+    r'\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(?:Z|[+-]\d{2}:?\d{2})?)?'
+)
+
 class DateExtractor:
     """
     Extracts publication date with strict priority:
@@ -12,41 +35,37 @@ class DateExtractor:
     3. Time tag
     4. JSON-LD
     5. URL Pattern (Fallback)
+
+    All candidate tags are collected in a single walk of the tree, then checked in that order.
     """
 
     @staticmethod
-    def extract(html: str, url: str, soup) -> Tuple[Optional[datetime], str, str]:
+    def extract(html: str, url: str, soup, json_ld: Optional[list] = None) -> Tuple[Optional[datetime], str, str]:
         """
         Returns (dt, source, confidence)
         confidence: high, medium, low
+
+        json_ld: already decoded JSON-LD blocks (see ScraperEngine._parse_json_ld), to avoid decoding them twice.
         """
-        
+        metas, time_tag, scripts = DateExtractor._collect_candidates(soup)
+
         # 1. Metadata High Confidence
-        meta_targets = [
-            {'property': 'article:published_time'},
-            {'property': 'og:published_time'},
-            {'name': 'parsely-pub-date'},
-            {'name': 'citation_publication_date'},
-            {'name': 'dc.date.issued'},
-        ]
-        
-        for attrs in meta_targets:
-            tag = soup.find('meta', attrs=attrs)
+        for attr, value in META_TARGETS:
+            tag = metas.get((attr, value))
             if tag and tag.get('content'):
                 dt = DateExtractor._parse_date(tag['content'])
                 if dt:
-                    return dt, f"meta_{list(attrs.values())[0]}", "high"
+                    return dt, f"meta_{value}", "high"
 
         # 2. Meta Name generic
-        for name in ['date', 'pubdate', 'datePublished']:
-            tag = soup.find('meta', attrs={'name': name}) or soup.find('meta', attrs={'itemprop': name})
+        for name in META_GENERIC_NAMES:
+            tag = metas.get(('name', name)) or metas.get(('itemprop', name))
             if tag and tag.get('content'):
                 dt = DateExtractor._parse_date(tag['content'])
                 if dt:
                     return dt, f"meta_{name}", "high"
 
         # 3. Time tag
-        time_tag = soup.find('time')
         if time_tag:
             if time_tag.get('datetime'):
                 dt = DateExtractor._parse_date(time_tag['datetime'])
@@ -56,10 +75,18 @@ class DateExtractor:
 
         # 4. JSON-LD (Search for datePublished)
         # Often in <script type="application/ld+json">
-        scripts = soup.find_all('script', type='application/ld+json')
-        for script in scripts:
+        if json_ld is None:
+            json_ld = []
+            for script in scripts:
+                try:
+                    json_ld.append(json.loads(script.string))
+                except:
+                    json_ld.append(None)
+
+        for data in json_ld:
+            if data is None:
+                continue
             try:
-                data = json.loads(script.string)
                 if isinstance(data, list):
                     data = data[0] # Try first
                 if isinstance(data, dict):
@@ -68,7 +95,7 @@ class DateExtractor:
                          dt = DateExtractor._parse_date(date_str)
                          if dt:
                              return dt, "json_ld", "high"
-                    
+
                     # Nested graph?
                     if '@graph' in data:
                         for item in data['@graph']:
@@ -81,23 +108,63 @@ class DateExtractor:
 
         # 5. URL Pattern (Low confidence)
         # /2024/01/29/
-        match = re.search(r'/(\d{4})/(\d{2})/(\d{2})/', url)
+        match = URL_DATE_RE.search(url)
         if match:
             try:
                 dt = datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)))
                 return dt, "url_pattern", "low"
             except:
                 pass
-        
+
         return None, "none", "none"
 
+    @staticmethod
+    def _collect_candidates(soup):
+        """
+        One pass over <meta>, <time> and <script> tags.
+        Returns ({(attr, value): first matching meta}, first <time> tag, JSON-LD scripts in order)
+        """
+        metas = {}
+        time_tag = None
+        scripts = []
+        for tag in soup.find_all(['meta', 'time', 'script']):
+            if tag.name == 'meta':
+                for attr in META_ATTRS:
+                    value = tag.get(attr)
+                    if value is not None:
+                        key = (attr, value)
+                        if key in WANTED_META and key not in metas:
+                            metas[key] = tag
+            elif tag.name == 'time':
+                if time_tag is None:
+                    time_tag = tag
+            elif tag.get('type') == 'application/ld+json':
+                scripts.append(tag)
+        return metas, time_tag, scripts
+
     @staticmethod
     def _parse_date(date_str: str) -> Optional[datetime]:
+        if not isinstance(date_str, str):
+            return None
+        return _parse_date_cached(date_str)
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str) -> Optional[datetime]:
+    # Fast path: plain ISO-8601 / RFC-3339 (the vast majority of meta and JSON-LD dates)
+    candidate = date_str.strip()
+    if ISO_DATE_RE.fullmatch(candidate):
         try:
-            from datetime import timezone
-            dt = dateutil.parser.parse(date_str)
+            dt = datetime.fromisoformat(candidate)
             if dt.tzinfo is None:
                 dt = dt.replace(tzinfo=timezone.utc)
             return dt
-        except:
-            return None
+        except ValueError:
+            pass
+
+    try:
+        dt = dateutil.parser.parse(date_str)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt
+    except:
+        return None
@@ -0,0 +1,73 @@
+import os
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional, Any
+
+class ExtractionProfile:
+    """
+    Learns which ContentExtractor tier (and content selector) works for a site.
+
+    Keeps the winning (method, selector) of the last `window` pages. Once all of them
+    agree, later pages go straight to that tier instead of running the whole chain.
+    Every `revalidate_every` pages the full chain runs again, so a site redesign (or a
+    tier that starts working again) is picked up.
+
+    Stored as JSON in Site.extraction_profile.
+    """
+
+    def __init__(self, window: Optional[int] = None, revalidate_every: Optional[int] = None):
+        self.window = window or int(os.getenv("EXTRACTION_PROFILE_WINDOW", 10))
+        self.revalidate_every = revalidate_every or int(os.getenv("EXTRACTION_PROFILE_REVALIDATE", 50))
+        self.history: deque = deque(maxlen=self.window)
+        self.since_validation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict[str, Any]]) -> "ExtractionProfile":
+        profile = cls()
+        if data:
+            for method, selector in data.get("history", [])[-profile.window:]:
+                profile.history.append((method, selector))
+            profile.since_validation = data.get("since_validation", 0)
+            profile.hits = data.get("hits", 0)
+            profile.misses = data.get("misses", 0)
+        return profile
+
+    def to_dict(self) -> dict[str, Any]:
+        preferred = self.preferred()
+        return {
+            "history": [list(entry) for entry in self.history],
+            "preferred_method": preferred[0] if preferred else None,
+            "preferred_selector": preferred[1] if preferred else None,
+            "since_validation": self.since_validation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def preferred(self) -> Optional[tuple[str, Optional[str]]]:
+        """The (method, selector) that won every one of the last `window` pages, if any."""
+        if len(self.history) < self.window:
+            return None
+        first = self.history[0]
+        if first[0] == "failed" or any(entry != first for entry in self.history):
+            return None
+        return first
+
+    def hint(self) -> Optional[tuple[str, Optional[str]]]:
+        """What to try first for the next page. None means: run the full chain."""
+        if self.since_validation >= self.revalidate_every:
+            return None
+        return self.preferred()
+
+    def record(self, hint: Optional[tuple[str, Optional[str]]], method: str, selector: Optional[str]):
+        if hint is None:
+            self.since_validation = 0
+        else:
+            self.since_validation += 1
+            if (method, selector) == hint:
+                self.hits += 1
+            else:
+                self.misses += 1
+        self.history.append((method, selector))
@@ -43,7 +43,8 @@ class RemoteLogger:
             return str(obj)
 
         try:
-            await self.conn.execute(f"NOTIFY worker_logs, '{json.dumps(payload, default=json_serial)}'")
+            # Bound parameter: messages may contain quotes (URLs, stack traces)
+            await self.conn.execute("SELECT pg_notify('worker_logs', $1)", json.dumps(payload, default=json_serial))
         except Exception as e:
             logger.error(f"Failed to send notification: {e}")
             # Try to reconnect if closed
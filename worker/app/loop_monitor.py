@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from typing import Optional
+
+from worker.app import metrics
+from worker.app.logger import remote_logger
+
+logger = logging.getLogger(__name__)
+
+# A loop that doesn't run for this long is reported with the stack of what blocked it
+LOOP_BLOCK_THRESHOLD_MS = int(os.getenv("LOOP_BLOCK_THRESHOLD_MS", 250))
+HEARTBEAT_INTERVAL = 0.1
+STACK_FRAMES = 15
+
+class LoopMonitor:
+    """
+    Measures event loop lag and catches the code that blocks the loop.
+
+    A heartbeat coroutine wakes every HEARTBEAT_INTERVAL and records how late it woke
+    (the lag histogram). A watchdog thread checks the last heartbeat; once the loop has
+    been stuck for LOOP_BLOCK_THRESHOLD_MS it captures the loop thread's stack, together
+    with the URL and stage of the task running at that moment (see set_activity/set_stage).
+    The report is logged when the loop runs again, with the full duration of the block.
+    """
+
+    def __init__(self, threshold_ms: int = LOOP_BLOCK_THRESHOLD_MS):
+        self.threshold = threshold_ms / 1000
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread_id: Optional[int] = None
+        self.last_beat = time.monotonic()
+        # What each task is working on: {"site_id", "url", "stage"}
+        self.activities: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.pending_report: Optional[dict] = None
+        self._watchdog: Optional[threading.Thread] = None
+
+    def set_activity(self, **activity):
+        """Tags the current task (e.g. url=..., site_id=...) for block reports. Cheap: a dict update."""
+        task = asyncio.current_task()
+        if task is not None:
+            self.activities[task] = activity
+
+    def set_stage(self, stage: Optional[str]):
+        task = asyncio.current_task()
+        if task is not None:
+            self.activities.setdefault(task, {})["stage"] = stage
+
+    def get_stage(self) -> Optional[str]:
+        task = asyncio.current_task()
+        activity = self.activities.get(task) if task is not None else None
+        return activity.get("stage") if activity else None
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        while True:
+            self.last_beat = time.monotonic()
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            now = time.monotonic()
+            metrics.LOOP_LAG.observe(max(0.0, now - self.last_beat - HEARTBEAT_INTERVAL))
+            if self.pending_report is not None:
+                report, self.pending_report = self.pending_report, None
+                report["blocked_ms"] = round((now - report.pop("since")) * 1000)
+                await self._report(report)
+
+    def _watch(self):
+        reported_beat = None
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL / 2)
+            beat = self.last_beat
+            # Heartbeat due at beat + HEARTBEAT_INTERVAL; report each stuck beat once
+            if beat == reported_beat or time.monotonic() - beat - HEARTBEAT_INTERVAL < self.threshold:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            reported_beat = beat
+            task = self._running_task()
+            activity = dict(self.activities.get(task) or {}) if task is not None else {}
+            self.pending_report = {
+                "since": beat + HEARTBEAT_INTERVAL,
+                "task": task.get_name() if task is not None else None,
+                "stack": traceback.format_stack(frame, limit=STACK_FRAMES),
+                **activity,
+            }
+
+    def _running_task(self):
+        # Read from the watchdog thread: the task the loop is running right now, if any
+        try:
+            return asyncio.current_task(self.loop)
+        except RuntimeError:
+            return None
+
+    async def _report(self, report: dict):
+        stage = report.get("stage") or "unknown"
+        metrics.LOOP_BLOCKS.labels(stage).inc()
+        where = f" on {report['url']}" if report.get("url") else ""
+        message = f"Event loop blocked for {report['blocked_ms']} ms in stage {stage}{where}"
+        logger.warning(f"{message}\n{''.join(report['stack'])}")
+        await remote_logger.log(message, level="warning", extra={
+            "site_id": report.get("site_id"),
+            "url": report.get("url"),
+            "stage": stage,
+            "blocked_ms": report["blocked_ms"],
+            "stack": "".join(report["stack"][-5:]),
+        })
+
+loop_monitor = LoopMonitor()
@@ -1,14 +1,22 @@
 import asyncio
 import logging
 import os
+import uuid
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from shared.core import database, models
 from worker.app.scraper import ScraperEngine
 from worker.app.logger import remote_logger
+from worker.app import metrics
+from worker.app.loop_monitor import loop_monitor
+from worker.app.stages import StageTimer
+from worker.app.profiling import worker_profiler, DEFAULT_SECONDS, MODES as PROFILE_MODES
+from worker.app.reextract import Reextractor
 from sqlalchemy import select
 import json
 import asyncpg
 from shared.core.database import DATABASE_URL
+from shared.core.events import prune_page_events
+from shared.core.site_stats import reconcile_site_stats
 
 # Configure logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -60,12 +68,19 @@ async def process_site(db, site):
         await db.commit()
         await db.refresh(run)
         
-        # Discovery
-        await scraper.run_discovery_phase(db, site, run.id)
-        
-        # Processing
-        pages_per_run = int(os.getenv("PAGES_PER_RUN", 200))
-        await scraper.run_processing_phase(db, site, run.id, limit=pages_per_run)
+        # Stage timings of both phases, stored on the run when it finishes
+        stages = StageTimer()
+        with metrics.track_run(site.id, run.id):
+            # Discovery
+            await scraper.run_discovery_phase(db, site, run.id, stages)
+            
+            # Processing
+            pages_per_run = int(os.getenv("PAGES_PER_RUN", 200))
+            await scraper.run_processing_phase(db, site, run.id, limit=pages_per_run, stages=stages)
+
+        # Remaining NEW pages (counter kept by the site_stats triggers)
+        backlog = await db.scalar(select(models.SiteStats.new_count).where(models.SiteStats.site_id == site.id))
+        metrics.BACKLOG.labels(str(site.id)).set(backlog or 0)
         
     except Exception as e:
         logger.error(f"Error processing site {site.name}: {e}")
@@ -96,6 +111,24 @@ async def scrape_job():
 
     await remote_logger.log("Scheduled scrape job finished.", level="info")
 
+async def prune_events_job():
+    retention_days = int(os.getenv("PAGE_EVENTS_RETENTION_DAYS", 7))
+    try:
+        async with database.AsyncSessionLocal() as db:
+            deleted = await prune_page_events(db, retention_days)
+            if deleted:
+                logger.info(f"Pruned {deleted} page events older than {retention_days} days")
+    except Exception as e:
+        logger.error(f"Error pruning page events: {e}")
+
+async def reconcile_stats_job():
+    try:
+        async with database.AsyncSessionLocal() as db:
+            count = await reconcile_site_stats(db)
+            logger.info(f"Reconciled page counters of {count} sites")
+    except Exception as e:
+        logger.error(f"Error reconciling site stats: {e}")
+
 async def run_manual_scrape(site_id: str):
     logger.info(f"Starting manual scrape for site {site_id}...")
     await remote_logger.log(f"Manual scrape triggered for site {site_id}", level="info")
@@ -112,6 +145,60 @@ async def run_manual_scrape(site_id: str):
     
     await remote_logger.log(f"Manual scrape finished for site {site.name}", level="info")
 
+async def run_profile(data: dict):
+    """
+    {"command": "profile", "seconds": 30} profiles whatever the worker does for that long;
+    {"command": "profile", "site_id": "..."} profiles one manual scrape of the site.
+    Optional: "mode": "sample" (default) or "cprofile", "memory": true for tracemalloc.
+    """
+    mode = data.get("mode") or "sample"
+    memory = bool(data.get("memory"))
+    site_id = data.get("site_id")
+    if mode not in PROFILE_MODES:
+        await remote_logger.log(f"Profile not started: unknown mode {mode}", level="warning")
+        return
+    if worker_profiler.running:
+        await remote_logger.log("Profile not started: another profile is running", level="warning")
+        return
+
+    await remote_logger.log(f"Profiling started ({mode}{', memory' if memory else ''})", level="info", extra={"site_id": site_id})
+    try:
+        if site_id:
+            paths = await worker_profiler.profile(f"site-{site_id}", target=run_manual_scrape(site_id), mode=mode, memory=memory)
+        else:
+            seconds = float(data.get("seconds") or DEFAULT_SECONDS)
+            paths = await worker_profiler.profile(f"{int(seconds)}s", seconds=seconds, mode=mode, memory=memory)
+    except Exception as e:
+        logger.error(f"Profiling failed: {e}")
+        await remote_logger.log(f"Profiling failed: {e}", level="error")
+        return
+    await remote_logger.log(f"Profile written: {', '.join(paths)}", level="info", extra={"site_id": site_id, "files": paths})
+
+# Re-extraction jobs running in this worker, by id
+reextractions = {}
+
+async def run_reextraction(job_id: str):
+    """{"command": "reextract", "job_id": "..."}: runs (or resumes) a re-extraction job created by the API."""
+    if job_id in reextractions:
+        await remote_logger.log(f"Re-extraction {job_id} is already running", level="warning")
+        return
+    reextractions[job_id] = Reextractor(uuid.UUID(job_id))
+    await remote_logger.log(f"Re-extraction {job_id} started", level="info")
+    try:
+        job = await reextractions[job_id].run()
+    except Exception as e:
+        logger.error(f"Re-extraction {job_id} failed: {e}")
+        await remote_logger.log(f"Re-extraction {job_id} failed: {e}", level="error")
+        return
+    finally:
+        reextractions.pop(job_id, None)
+    await remote_logger.log(
+        f"Re-extraction {job_id} {job.status}: {job.contents_done} contents, {job.pages_changed} pages changed, "
+        f"{job.contents_failed} failed",
+        level="error" if job.status == "failed" else "info",
+        extra={"site_id": job.site_id},
+    )
+
 async def listen_for_commands():
     # asyncpg expects 'postgresql://' not 'postgresql+asyncpg://'
     dsn = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
@@ -129,6 +216,12 @@ async def listen_for_commands():
                 elif data.get("command") == "reload_settings":
                     interval = await get_scrape_interval()
                     update_scheduler(interval)
+                elif data.get("command") == "profile":
+                    asyncio.create_task(run_profile(data))
+                elif data.get("command") == "reextract":
+                    job_id = data.get("job_id")
+                    if job_id:
+                        asyncio.create_task(run_reextraction(job_id))
             except Exception as e:
                 logger.error(f"Error handling command: {e}")
 
@@ -148,12 +241,18 @@ async def listen_for_commands():
 async def main():
     logger.info("Worker initializing...")
     await remote_logger.initialize()
+    metrics.start_metrics_server()
+    # Loop lag metric + reports of whatever blocks the loop (URL, stage, stack)
+    asyncio.create_task(loop_monitor.run())
     
     # Add job
     interval = await get_scrape_interval()
     global current_interval
     current_interval = interval
     scheduler.add_job(scrape_job, 'interval', seconds=interval, id='scrape_job')
+    scheduler.add_job(prune_events_job, 'interval', hours=6, id='prune_events_job')
+    reconcile_hours = int(os.getenv("SITE_STATS_RECONCILE_HOURS", 24))
+    scheduler.add_job(reconcile_stats_job, 'interval', hours=reconcile_hours, id='reconcile_stats_job')
     
     scheduler.start()
     
@@ -0,0 +1,95 @@
+import logging
+import os
+from contextlib import contextmanager
+from time import perf_counter
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+logger = logging.getLogger(__name__)
+
+# 0 disables the listener
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", 9101))
+
+# Every per-site metric is labeled site_id (sites.id); runs are tied in through RUN_IN_PROGRESS
+PAGES = Counter(
+    "web2text_worker_pages_total",
+    "Pages handled by the processing phase, by outcome (processed, skipped, failed)",
+    ["site_id", "outcome"],
+)
+PAGES_FETCHED = Counter("web2text_worker_pages_fetched_total", "Page fetches", ["site_id"])
+HTTP_RESPONSES = Counter(
+    "web2text_worker_http_responses_total",
+    "Page fetch responses by status class (2xx, 3xx, 4xx, 5xx; error: no response)",
+    ["site_id", "status_class"],
+)
+DISCOVERED_URLS = Counter("web2text_worker_discovered_urls_total", "URLs found by the discovery phase", ["site_id"])
+
+FETCH_SECONDS = Histogram(
+    "web2text_worker_fetch_seconds",
+    "Page download time",
+    ["site_id"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+PARSE_SECONDS = Histogram(
+    "web2text_worker_parse_seconds",
+    "CPU time spent on one page: HTML parsing, validation and date, content and metadata extraction",
+    ["site_id"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_WRITE_SECONDS = Histogram(
+    "web2text_worker_db_write_seconds",
+    "Database write time (operation: page, discovery_upsert)",
+    ["site_id", "operation"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+
+BACKLOG = Gauge("web2text_worker_backlog_pages", "Pages waiting to be processed (status NEW)", ["site_id"])
+RUN_IN_PROGRESS = Gauge(
+    "web2text_worker_run_in_progress",
+    "Start time (unix seconds) of the scrape run in progress, labeled with its scrape_runs.id",
+    ["site_id", "run_id"],
+)
+LOOP_LAG = Histogram(
+    "web2text_worker_event_loop_lag_seconds",
+    "How late the event loop runs a timer: time the loop was blocked by synchronous work",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+LOOP_BLOCKS = Counter(
+    "web2text_worker_event_loop_blocks_total",
+    "Times the event loop was blocked longer than LOOP_BLOCK_THRESHOLD_MS, by the stage running then",
+    ["stage"],
+)
+
+def status_class(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+class Stopwatch:
+    """Adds up the time of several code sections, e.g. the CPU steps of a page around its awaits."""
+
+    def __init__(self):
+        self.elapsed = 0.0
+
+    @contextmanager
+    def measure(self):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.elapsed += perf_counter() - start
+
+@contextmanager
+def track_run(site_id, run_id):
+    """Exposes the run as in progress (RUN_IN_PROGRESS) while the block runs."""
+    labels = (str(site_id), str(run_id))
+    RUN_IN_PROGRESS.labels(*labels).set_to_current_time()
+    try:
+        yield
+    finally:
+        RUN_IN_PROGRESS.remove(*labels)
+
+def start_metrics_server():
+    """Serves /metrics for Prometheus on WORKER_METRICS_PORT, from a background thread."""
+    if not WORKER_METRICS_PORT:
+        return
+    start_http_server(WORKER_METRICS_PORT)
+    logger.info(f"Serving metrics on port {WORKER_METRICS_PORT}")
@@ -1,9 +1,13 @@
 import logging
 import asyncio
+import gzip
 from datetime import datetime, timedelta, timezone
 from typing import List, Set, Optional
 from shared.core.models import Site, CrawlStrategy
 from shared.core.utils import canonicalize_url
+from shared.core import url_rules
+from shared.core.url_rules import UrlRules
+from worker.app.stages import StageTimer
 import httpx
 from bs4 import BeautifulSoup
 import feedparser
@@ -19,26 +23,18 @@ class DiscoveryPipeline:
     
     def __init__(self, http_client: httpx.AsyncClient):
         self.client = http_client
-        self.blacklist_patterns = [
-            "/category/", "/tag/", "/archive/", "/author/", "/page/", "/search/", "/search?",
-            "/etiqueta/", "/categoria/", "/autor/", "/pag/", "/busqueda/", "/busqueda?", "/tema/" # Spanish common patterns
-        ]
 
-    def _is_valid_url(self, url: str) -> bool:
-        """
-        Checks if the URL is valid by ensuring it doesn't contain blacklisted patterns.
-        """
-        for pattern in self.blacklist_patterns:
-            if pattern in url:
-                return False
-        return True
-
-    async def run(self, site: Site, lookback_days: int = 30) -> List[str]:
+    async def run(self, site: Site, lookback_days: int = 30, stages: Optional[StageTimer] = None,
+                  rules: Optional[UrlRules] = None) -> List[str]:
+        stages = stages or StageTimer()
+        # The site's allow / deny / priority rules plus the defaults, compiled once per rule set
+        rules = rules or url_rules.for_site(site.url_rules)
         urls = set()
         sitemaps_to_check = []
         
         # 0. Auto-discover sitemaps
-        discovered = await self._discover_sitemaps(site.base_url)
+        with stages.span("robots"):
+            discovered = await self._discover_sitemaps(site.base_url)
         if discovered:
             sitemaps_to_check.extend(discovered)
             if not site.sitemap_url:
@@ -52,7 +48,7 @@ class DiscoveryPipeline:
         # 1. Sitemap Strategy
         for sm_url in sitemaps_to_check:
             logger.info(f"Trying sitemap for {site.name}: {sm_url}")
-            s_urls = await self._fetch_sitemap(sm_url, lookback_days)
+            s_urls = await self._fetch_sitemap(sm_url, lookback_days, stages, rules)
             if s_urls:
                 logger.info(f"Found {len(s_urls)} URLs via sitemap {sm_url}")
                 urls.update(s_urls)
@@ -60,7 +56,8 @@ class DiscoveryPipeline:
         # 2. RSS Strategy
         if site.rss_url:
             logger.info(f"Trying RSS for {site.name}: {site.rss_url}")
-            rss_urls = await self._fetch_rss(site.rss_url, lookback_days)
+            with stages.span("rss"):
+                rss_urls = await self._fetch_rss(site.rss_url, lookback_days, rules)
             if rss_urls:
                 logger.info(f"Found {len(rss_urls)} URLs via RSS")
                 urls.update(rss_urls)
@@ -68,29 +65,13 @@ class DiscoveryPipeline:
         # 3. Links Strategy
         # We always check the home page for links, especially if other sources are thin
         logger.info(f"Adding Links crawl for {site.name}")
-        link_urls = await self._fetch_links(site.base_url)
+        with stages.span("links"):
+            link_urls = await self._fetch_links(site.base_url, rules)
         urls.update(link_urls)
         
-        # Convert to list and filter/prioritize
-        res_urls = list(urls)
-        
         # Prioritize URLs from "important" sections if they exist in the set
         # This helps when we cap at 1000 in the scraper
-        def url_priority(url):
-            low_priority = ["/clima/", "/loterias/", "/quiniela/", "/horoscopo/", "/avisos-funebres/"]
-            high_priority = ["/economia/", "/politica/", "/negocios/", "/el-mundo/", "/sociedad/"]
-            
-            for pattern in low_priority:
-                if pattern in url.lower():
-                    return 10
-            for pattern in high_priority:
-                if pattern in url.lower():
-                    return -1
-            return 0
-
-        res_urls.sort(key=url_priority)
-        
-        return res_urls
+        return rules.sort(urls)
 
     async def _discover_sitemaps(self, base_url: str) -> List[str]:
         """Attempts to find all sitemaps by checking robots.txt and common paths."""
@@ -134,20 +115,32 @@ class DiscoveryPipeline:
         
         return found_sitemaps
 
-    async def _fetch_sitemap(self, url: str, lookback_days: int) -> Set[str]:
+    async def _fetch_sitemap(
+        self, url: str, lookback_days: int, stages: Optional[StageTimer] = None, rules: Optional[UrlRules] = None
+    ) -> Set[str]:
         # Minimal sitemap parser (handles sitemap index recursively 1 level)
+        stages = stages or StageTimer()
+        rules = rules or url_rules.for_site(None)
         urls = set()
         threshold = datetime.now(timezone.utc) - timedelta(days=lookback_days)
         
         try:
-            response = await self.client.get(url, timeout=30.0)
+            with stages.span("sitemap_fetch"):
+                response = await self.client.get(url, timeout=30.0)
             if response.status_code != 200:
                 return set()
             
-            soup = BeautifulSoup(response.content, 'xml')
-            
-            # Check if index
-            sitemaps = soup.find_all('sitemap')
+            with stages.span("sitemap_parse"):
+                content = response.content
+                # Sitemaps published as .xml.gz files (not gzip transfer encoding, which httpx decodes)
+                if content[:2] == b"\x1f\x8b":
+                    content = gzip.decompress(content)
+                soup = BeautifulSoup(content, 'xml')
+                # Check if index
+                sitemaps = soup.find_all('sitemap')
+                if not sitemaps:
+                    urls.update(self._parse_urlset(soup, threshold, rules))
+
             if sitemaps:
                 # Is index, fetch children
                 for sm in sitemaps: 
@@ -164,41 +157,45 @@ class DiscoveryPipeline:
                         except: pass
                         
                     if loc:
-                        subset = await self._fetch_sitemap(loc.text.strip(), lookback_days)
+                        subset = await self._fetch_sitemap(loc.text.strip(), lookback_days, stages, rules)
                         urls.update(subset)
-            else:
-                # Is urlset
-                for u in soup.find_all('url'):
-                    loc = u.find('loc')
-                    lastmod = u.find('lastmod')
-                    
-                    if lastmod:
-                        try:
-                            dt = dateutil.parser.parse(lastmod.text.strip())
-                            if dt.tzinfo is None: dt = dt.replace(tzinfo=timezone.utc)
-                            if dt < threshold:
-                                continue
-                        except: pass
-                        
-                    if loc:
-                         # Filter pattern
-                         raw_url = loc.text.strip()
-                         if not self._is_valid_url(raw_url):
-                             continue
-                             
-                         c_url = canonicalize_url(raw_url)
-                         urls.add(c_url)
         except Exception as e:
             logger.error(f"Sitemap error at {url}: {e}")
             
         return urls
 
-    async def _fetch_rss(self, url: str, lookback_days: int) -> Set[str]:
+    def _parse_urlset(self, soup, threshold: datetime, rules: UrlRules) -> Set[str]:
+        found = []
+        for u in soup.find_all('url'):
+            loc = u.find('loc')
+            lastmod = u.find('lastmod')
+            
+            if lastmod:
+                try:
+                    dt = dateutil.parser.parse(lastmod.text.strip())
+                    if dt.tzinfo is None: dt = dt.replace(tzinfo=timezone.utc)
+                    if dt < threshold:
+                        continue
+                except: pass
+                
+            if loc:
+                found.append(loc.text.strip())
+
+        # Filter pattern
+        return {canonicalize_url(raw_url) for raw_url in rules.filter(found)}
+
+    async def _fetch_rss(self, url: str, lookback_days: int, rules: Optional[UrlRules] = None) -> Set[str]:
+        rules = rules or url_rules.for_site(None)
         urls = set()
         threshold = datetime.now(timezone.utc) - timedelta(days=lookback_days)
         try:
+            # Fetched with the shared client (timeout, User-Agent), not by feedparser itself
+            response = await self.client.get(url, timeout=30.0)
+            if response.status_code != 200:
+                return set()
             # feedparser is blocking, run in executor
-            feed = await asyncio.to_thread(feedparser.parse, url)
+            feed = await asyncio.to_thread(feedparser.parse, response.content)
+            found = []
             for entry in feed.entries:
                 if 'published_parsed' in entry:
                     dt = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
@@ -206,29 +203,27 @@ class DiscoveryPipeline:
                         continue
                 
                 if 'link' in entry:
-                    if not self._is_valid_url(entry.link):
-                        continue
-                    c_url = canonicalize_url(entry.link)
-                    urls.add(c_url)
+                    found.append(entry.link)
+            urls = {canonicalize_url(link) for link in rules.filter(found)}
         except Exception as e:
              logger.error(f"RSS error: {e}")
         return urls
 
-    async def _fetch_links(self, url: str) -> Set[str]:
+    async def _fetch_links(self, url: str, rules: Optional[UrlRules] = None) -> Set[str]:
+        rules = rules or url_rules.for_site(None)
         urls = set()
         try:
             response = await self.client.get(url, timeout=20.0)
             soup = BeautifulSoup(response.content, 'html.parser')
+            found = []
             for a in soup.find_all('a', href=True):
                 href = a['href']
                 # Normalize absolute
                 full_url = str(httpx.URL(url).join(href))
                 # Basic Host check
                 if httpx.URL(full_url).host == httpx.URL(url).host:
-                    if not self._is_valid_url(full_url):
-                        continue
-                    c_url = canonicalize_url(full_url)
-                    urls.add(c_url)
+                    found.append(full_url)
+            urls = {canonicalize_url(link) for link in rules.filter(found)}
         except Exception as e:
              logger.error(f"Links crawl error: {e}")
         return urls
@@ -0,0 +1,183 @@
+import asyncio
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Awaitable, Optional
+
+logger = logging.getLogger(__name__)
+
+WORKER_PROFILE_DIR = os.getenv("WORKER_PROFILE_DIR", "/tmp/web2text-profiles")
+DEFAULT_SECONDS = 30
+MAX_SECONDS = 600
+SAMPLE_INTERVAL = 0.01
+TOP_ALLOCATIONS = 50
+TOP_FUNCTIONS = 60
+MODES = ("sample", "cprofile")
+
+class StackSampler:
+    """
+    Samples the stack of one thread (the event loop's) from a background thread every
+    `interval` seconds and counts identical stacks. write_folded() produces the collapsed
+    format read by flamegraph.pl, speedscope and inferno.
+    Blocking code shows up with its full stack; an idle loop shows as the selector wait.
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        filename = code.co_filename
+        # Shorter labels for the project's own code and for libraries
+        for marker in ("/worker/", "/shared/", "/site-packages/", "/lib/python"):
+            index = filename.find(marker)
+            if index != -1:
+                filename = filename[index + 1:]
+                break
+        return f"{code.co_qualname} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_folded(self, path: str):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class WorkerProfiler:
+    """
+    On-demand profiling of the running worker (the `profile` command on worker_commands).
+
+    Profiles for `seconds`, or for as long as `target` runs (e.g. one site scrape). Modes:
+    - sample: stack sampling every SAMPLE_INTERVAL, written as collapsed stacks (.folded)
+    - cprofile: deterministic cProfile of the event loop thread (.pstats + top functions .txt)
+    With memory=True, tracemalloc also runs and the top allocations are written (-alloc.txt).
+    Files go to WORKER_PROFILE_DIR; only one profile runs at a time.
+    """
+
+    def __init__(self, output_dir: str = WORKER_PROFILE_DIR):
+        self.output_dir = output_dir
+        self.running = False
+
+    async def profile(
+        self,
+        label: str,
+        seconds: Optional[float] = None,
+        target: Optional[Awaitable] = None,
+        mode: str = "sample",
+        memory: bool = False,
+    ) -> list[str]:
+        """Returns the paths of the files written."""
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (expected one of {', '.join(MODES)})")
+        if self.running:
+            raise RuntimeError("A profile is already running")
+        self.running = True
+        try:
+            return await self._profile(label, seconds, target, mode, memory)
+        finally:
+            self.running = False
+
+    async def _profile(self, label, seconds, target, mode, memory) -> list[str]:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        base = os.path.join(self.output_dir, f"{stamp}-{label}")
+
+        sampler = None
+        profiler = None
+        started_tracemalloc = False
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            started_tracemalloc = True
+        if mode == "sample":
+            sampler = StackSampler(threading.get_ident())
+            sampler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        started = time.perf_counter()
+        try:
+            if target is not None:
+                await target
+            else:
+                await asyncio.sleep(min(seconds or DEFAULT_SECONDS, MAX_SECONDS))
+        finally:
+            elapsed = time.perf_counter() - started
+            if sampler:
+                sampler.stop()
+            if profiler:
+                profiler.disable()
+            snapshot = tracemalloc.take_snapshot() if memory else None
+            if started_tracemalloc:
+                tracemalloc.stop()
+
+        paths = []
+        if sampler:
+            path = f"{base}.folded"
+            sampler.write_folded(path)
+            paths.append(path)
+            logger.info(f"Profile {label}: {sampler.samples} samples over {elapsed:.1f}s")
+        if profiler:
+            path = f"{base}.pstats"
+            profiler.dump_stats(path)
+            paths.append(path)
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            path = f"{base}.txt"
+            with open(path, "w") as f:
+                f.write(text.getvalue())
+            paths.append(path)
+        if snapshot:
+            path = f"{base}-alloc.txt"
+            self._write_allocations(snapshot, path)
+            paths.append(path)
+        return paths
+
+    @staticmethod
+    def _write_allocations(snapshot, path: str):
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        stats = snapshot.statistics("traceback")
+        total = sum(stat.size for stat in stats)
+        with open(path, "w") as f:
+            f.write(f"Traced memory: {total / 1024 / 1024:.1f} MiB in {len(stats)} allocation sites\n\n")
+            for stat in stats[:TOP_ALLOCATIONS]:
+                f.write(f"{stat.size / 1024:.1f} KiB in {stat.count} blocks\n")
+                for line in stat.traceback.format(most_recent_first=True)[:20]:
+                    f.write(f"    {line}\n")
+                f.write("\n")
+
+worker_profiler = WorkerProfiler()
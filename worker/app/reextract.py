@@ -0,0 +1,349 @@
+"""
+Offline re-extraction: runs the current extractors again over the raw_html stored with each
+page's latest content and writes the results back. Nothing is fetched.
+
+    python -m worker.app.reextract [--site-id=ID] [--from=2026-01-01] [--to=2026-02-01]
+        [--method=bs4_paragraphs] [--processes=N] [--batch-size=200]
+    python -m worker.app.reextract --resume=JOB_ID
+
+--from / --to filter on the pages' scraped_at, --method on the extraction_method the content
+was stored with: one of the ContentExtractor tiers (arc_fusion, trafilatura, bs4_article,
+bs4_paragraphs) or failed, e.g. to redo everything a weak fallback produced. The same job can be
+started from the admin API (POST /admin/reextract), which hands it to the running worker.
+
+Contents are read in id order through a server-side cursor and parsed in a process pool,
+one batch while the previous one is written. Every batch is one transaction that also moves
+the job's checkpoint, so a stopped or failed job resumes exactly after its last batch.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import uuid
+from contextlib import aclosing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+from bs4 import BeautifulSoup
+from sqlalchemy import exists, select, update
+from sqlalchemy.orm import aliased
+
+from shared.core import models, utils
+from shared.core.database import AsyncSessionLocal
+from shared.core.events import mark_page_changed, EVENT_UPDATED
+from shared.core.search import build_search_vector
+from worker.app.content_extractor import ContentExtractor
+from worker.app.date_extractor import DateExtractor
+from worker.app.metadata_extractor import MetadataExtractor
+from worker.app.scraper import ScraperEngine
+
+logger = logging.getLogger(__name__)
+
+REEXTRACT_PROCESSES = int(os.getenv("REEXTRACT_PROCESSES", 0)) or os.cpu_count() or 1
+DEFAULT_BATCH_SIZE = 200
+# Rows per server-side cursor: it is reopened after the checkpoint every so often instead of
+# keeping one snapshot open for the hours a large job takes
+CURSOR_ROWS = 20_000
+PAGE_FIELDS = ("title", "author", "summary", "image_url", "language", "published_at", "content_hash")
+
+def extract_page(item: tuple) -> dict:
+    """
+    Extraction of one stored page, in a pool process. Same steps as the scraper's, without the
+    site's extraction hint: the point is to let the current extractors decide again.
+    """
+    content_id, url, html = item
+    try:
+        soup = BeautifulSoup(html, "html.parser")
+        json_ld = ScraperEngine._parse_json_ld(soup)
+        published_at, date_source, conf = DateExtractor.extract(html, url, soup, json_ld)
+        if published_at and published_at.tzinfo is None:
+            published_at = published_at.replace(tzinfo=timezone.utc)
+        text, method_used, content_selector = ContentExtractor.extract_with_hint(html)
+        meta = MetadataExtractor.extract(html, soup)
+        title = meta.get("title") or (str(soup.title.string) if soup.title and soup.title.string else None)
+        return {
+            "content_id": content_id,
+            "text": text,
+            "page": {
+                "title": title,
+                "author": meta.get("author"),
+                "summary": meta.get("summary"),
+                "image_url": meta.get("image_url"),
+                "language": meta.get("language"),
+                "published_at": published_at,
+                "content_hash": utils.compute_content_hash(text),
+            },
+            "metadata": {
+                "date_source": date_source,
+                "date_confidence": conf,
+                "extraction_method": method_used,
+                "content_selector": content_selector,
+                "og_title": title,
+            },
+        }
+    except Exception as e:
+        return {"content_id": content_id, "error": f"{type(e).__name__}: {e}"}
+
+class Reextractor:
+    """
+    Runs one ReextractionJob. Progress lives on the job row (see ReextractionJobRead); setting
+    its status to "cancelled" stops the job before its next batch.
+    """
+
+    def __init__(
+        self,
+        job_id: uuid.UUID,
+        processes: int = REEXTRACT_PROCESSES,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.job_id = job_id
+        self.processes = processes
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self.job: Optional[models.ReextractionJob] = None
+        self.cancelled = False
+
+    def _query(self, after: Optional[uuid.UUID]):
+        job = self.job
+        newer = aliased(models.PageContent)
+        query = (
+            select(
+                models.PageContent.id,
+                models.PageContent.page_id,
+                models.PageContent.raw_html,
+                models.PageContent.extracted_text,
+                models.PageContent.metadata_,
+                models.Page.url,
+                *(getattr(models.Page, name) for name in PAGE_FIELDS),
+            )
+            .join(models.Page, models.Page.id == models.PageContent.page_id)
+            .where(
+                models.PageContent.raw_html.isnot(None),
+                models.Page.status == models.PageStatus.PROCESSED,
+                # Only the latest content of each page: it is what the page's fields came from
+                ~exists().where(newer.page_id == models.PageContent.page_id, newer.created_at > models.PageContent.created_at),
+            )
+        )
+        if job.site_id:
+            query = query.where(models.Page.site_id == job.site_id)
+        if job.scraped_from:
+            query = query.where(models.Page.scraped_at >= job.scraped_from)
+        if job.scraped_to:
+            query = query.where(models.Page.scraped_at < job.scraped_to)
+        if job.extraction_method:
+            query = query.where(models.PageContent.metadata_["extraction_method"].astext == job.extraction_method)
+        if after:
+            query = query.where(models.PageContent.id > after)
+        return query.order_by(models.PageContent.id)
+
+    async def _batches(self) -> AsyncIterator[list]:
+        after = self.job.last_content_id
+        while True:
+            read = 0
+            async with self.session_factory() as session:
+                result = await session.stream(
+                    self._query(after).limit(CURSOR_ROWS).execution_options(yield_per=self.batch_size)
+                )
+                async for rows in result.partitions():
+                    read += len(rows)
+                    after = rows[-1].id
+                    yield rows
+            if read < CURSOR_ROWS:
+                return
+
+    async def _write(self, rows: list, results: list[dict]):
+        """Writes one batch and moves the checkpoint past it, in one transaction."""
+        by_id = {row.id: row for row in rows}
+        now = datetime.now(timezone.utc)
+        content_updates = []
+        page_updates = {}
+        failed = 0
+        for result in results:
+            row = by_id[result["content_id"]]
+            if "error" in result:
+                failed += 1
+                logger.warning(f"Re-extraction failed for {row.url}: {result['error']}")
+                continue
+            if not result["text"]:
+                # Never replace stored text with nothing
+                continue
+            stored = row.metadata_ or {}
+            if result["text"] != row.extracted_text or any(stored.get(k) != v for k, v in result["metadata"].items()):
+                metadata = {**stored, **result["metadata"], "extraction_hinted": False, "reextracted_at": now.isoformat()}
+                content_updates.append({"id": row.id, "extracted_text": result["text"], "metadata_": metadata})
+            if any(result["page"][name] != getattr(row, name) for name in PAGE_FIELDS):
+                page_updates[row.page_id] = (row, result["page"], result["text"])
+
+        async with self.session_factory() as db:
+            # The job row stays locked until the batch commits: a cancel waits for it, and the
+            # next batch sees it
+            status = await db.scalar(
+                select(models.ReextractionJob.status).where(models.ReextractionJob.id == self.job_id).with_for_update()
+            )
+            if status == "cancelled":
+                self.cancelled = True
+                return
+
+            if content_updates:
+                await db.execute(update(models.PageContent), content_updates)
+            pages_changed = 0
+            if page_updates:
+                # The snapshot can be minutes old: pages re-scraped since (a newer content, or
+                # another hash) or changed by another job keep what they have
+                pages = (await db.scalars(
+                    select(models.Page).where(models.Page.id.in_(page_updates)).with_for_update()
+                )).all()
+                # Checked with the pages locked: a scrape of one of them now waits for this batch
+                current, newer = aliased(models.PageContent), aliased(models.PageContent)
+                superseded = set(await db.scalars(
+                    select(current.page_id).where(
+                        current.id.in_([row.id for row, _, _ in page_updates.values()]),
+                        exists().where(newer.page_id == current.page_id, newer.created_at > current.created_at),
+                    )
+                ))
+                for page in pages:
+                    row, fields, text = page_updates[page.id]
+                    if page.id in superseded or page.content_hash != row.content_hash:
+                        continue
+                    pages_changed += 1
+                    for name, value in fields.items():
+                        setattr(page, name, value)
+                    page.search_vector = build_search_vector(page.language, page.title, page.summary, text)
+                    await mark_page_changed(db, page, EVENT_UPDATED)
+
+            self.job.last_content_id = rows[-1].id
+            self.job.contents_done += len(rows)
+            self.job.pages_changed += pages_changed
+            self.job.contents_failed += failed
+            await db.execute(
+                update(models.ReextractionJob)
+                .where(models.ReextractionJob.id == self.job_id)
+                .values(
+                    last_content_id=self.job.last_content_id,
+                    contents_done=self.job.contents_done,
+                    pages_changed=self.job.pages_changed,
+                    contents_failed=self.job.contents_failed,
+                )
+            )
+            await db.commit()
+
+    async def _set(self, **values):
+        async with self.session_factory() as db:
+            await db.execute(update(models.ReextractionJob).where(models.ReextractionJob.id == self.job_id).values(**values))
+            await db.commit()
+
+    async def run(self) -> models.ReextractionJob:
+        async with self.session_factory() as db:
+            self.job = await db.get(models.ReextractionJob, self.job_id)
+        if self.job is None:
+            raise ValueError(f"Re-extraction job {self.job_id} not found")
+        if self.job.status == "finished":
+            return self.job
+
+        self.job.status = "running"
+        await self._set(status="running", started_at=self.job.started_at or datetime.now(timezone.utc), finished_at=None, error=None)
+        logger.info(f"Re-extraction {self.job_id} started after {self.job.last_content_id} ({self.processes} processes)")
+
+        loop = asyncio.get_running_loop()
+        # spawn: the worker has threads (loop monitor, metrics server) that fork would copy mid-state
+        pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+        writing = None
+        try:
+            async with aclosing(self._batches()) as batches:
+                async for rows in batches:
+                    extracting = asyncio.gather(*(
+                        loop.run_in_executor(pool, extract_page, (row.id, row.url, row.raw_html)) for row in rows
+                    ))
+                    # Batch N is written while batch N+1 is parsed
+                    if writing:
+                        await writing
+                    results = await extracting
+                    if self.cancelled:
+                        break
+                    writing = asyncio.create_task(self._write(rows, results))
+            if writing:
+                await writing
+        except Exception as e:
+            if writing and not writing.done():
+                writing.cancel()
+            self.job.status = "failed"
+            self.job.error = f"{type(e).__name__}: {e}"
+            await self._set(status="failed", error=self.job.error, finished_at=datetime.now(timezone.utc))
+            logger.error(f"Re-extraction {self.job_id} failed: {e}")
+            return self.job
+        finally:
+            # Waits for the pool processes to exit: not on the event loop the worker shares
+            await asyncio.to_thread(pool.shutdown, cancel_futures=True)
+
+        self.job.status = "cancelled" if self.cancelled else "finished"
+        self.job.finished_at = datetime.now(timezone.utc)
+        if not self.cancelled:
+            await self._set(status="finished", finished_at=self.job.finished_at)
+        logger.info(
+            f"Re-extraction {self.job_id} {self.job.status}: {self.job.contents_done} contents, "
+            f"{self.job.pages_changed} pages changed, {self.job.contents_failed} failed"
+        )
+        return self.job
+
+async def create_job(
+    site_id: Optional[uuid.UUID] = None,
+    scraped_from: Optional[datetime] = None,
+    scraped_to: Optional[datetime] = None,
+    extraction_method: Optional[str] = None,
+) -> models.ReextractionJob:
+    async with AsyncSessionLocal() as db:
+        job = models.ReextractionJob(
+            site_id=site_id, scraped_from=scraped_from, scraped_to=scraped_to, extraction_method=extraction_method
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+def _parse_date(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+async def main(argv: list[str]) -> int:
+    options = {}
+    for arg in argv:
+        if not arg.startswith("--") or "=" not in arg:
+            print(__doc__)
+            return 2
+        key, value = arg[2:].split("=", 1)
+        options[key] = value
+
+    if options.get("method", models.EXTRACTION_METHODS[0]) not in models.EXTRACTION_METHODS:
+        print(f"Unknown extraction method: {options['method']} (available: {', '.join(models.EXTRACTION_METHODS)})")
+        return 2
+
+    if "resume" in options:
+        job_id = uuid.UUID(options["resume"])
+    else:
+        job = await create_job(
+            site_id=uuid.UUID(options["site-id"]) if "site-id" in options else None,
+            scraped_from=_parse_date(options["from"]) if "from" in options else None,
+            scraped_to=_parse_date(options["to"]) if "to" in options else None,
+            extraction_method=options.get("method"),
+        )
+        job_id = job.id
+        print(f"Job {job_id} (resume with --resume={job_id})", file=sys.stderr)
+
+    job = await Reextractor(
+        job_id,
+        processes=int(options.get("processes", REEXTRACT_PROCESSES)),
+        batch_size=int(options.get("batch-size", DEFAULT_BATCH_SIZE)),
+    ).run()
+    print(
+        f"{job.status}: {job.contents_done} contents, {job.pages_changed} pages changed, {job.contents_failed} failed"
+        + (f" ({job.error})" if job.error else ""),
+        file=sys.stderr,
+    )
+    return 0 if job.status in ("finished", "cancelled") else 1
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    sys.exit(asyncio.run(main(sys.argv[1:])))
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import os
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class BrowserRenderer:
+    """
+    Renders JS-heavy pages with Playwright (Chromium).
+
+    The browser is launched once, on the first render, and keeps a pool of warm
+    browser contexts. Each render checks out a context, so the pool size bounds how
+    many pages are rendered at the same time. Images, fonts and media are never
+    downloaded since they don't affect the extracted text.
+
+    Enabled with USE_PLAYWRIGHT=true (the browser must be installed in the image).
+    """
+
+    BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+    def __init__(self, user_agent: str = "Web2TextBot/1.0"):
+        self.enabled = os.getenv("USE_PLAYWRIGHT", "false").lower() == "true"
+        self.pool_size = int(os.getenv("PLAYWRIGHT_CONTEXTS", 2))
+        self.timeout_ms = int(os.getenv("PLAYWRIGHT_TIMEOUT_MS", 30000))
+        # Contexts are recycled after this many renders to bound their memory
+        self.max_renders_per_context = int(os.getenv("PLAYWRIGHT_CONTEXT_MAX_RENDERS", 100))
+        # How long a render waits for a free context before failing
+        self.checkout_timeout_ms = int(os.getenv("PLAYWRIGHT_CHECKOUT_TIMEOUT_MS", 120000))
+        self.user_agent = user_agent
+
+        self._playwright = None
+        self._browser = None
+        self._contexts: Optional[asyncio.Queue] = None
+        self._render_counts = {}
+        self._start_lock = asyncio.Lock()
+
+    async def _start(self):
+        async with self._start_lock:
+            if self._browser:
+                return
+            # Optional dependency: only imported when rendering is actually used
+            from playwright.async_api import async_playwright
+
+            logger.info(f"Launching Chromium with {self.pool_size} warm contexts")
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._contexts = asyncio.Queue()
+            for _ in range(self.pool_size):
+                self._contexts.put_nowait(await self._new_context())
+
+    async def _relaunch(self):
+        """Starts a new browser when the current one is gone (crashed, killed for memory)."""
+        async with self._start_lock:
+            if self._browser.is_connected():
+                return
+            logger.warning("Chromium is disconnected, relaunching it")
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing disconnected browser: {e}")
+            self._render_counts.clear()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+
+    async def _new_context(self):
+        context = await self._browser.new_context(user_agent=self.user_agent, java_script_enabled=True)
+        await context.route("**/*", self._filter_request)
+        self._render_counts[id(context)] = 0
+        return context
+
+    async def _filter_request(self, route):
+        if route.request.resource_type in self.BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _checkout(self):
+        """
+        A context from the pool. Empty slots (None) left by a failed replacement, and contexts
+        of a browser that has since been relaunched, get a new context here, after relaunching
+        the browser if it died.
+        """
+        try:
+            context = await asyncio.wait_for(self._contexts.get(), timeout=self.checkout_timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"No browser context free after {self.checkout_timeout_ms} ms")
+        if context is not None and context.browser is not self._browser:
+            context = None
+        if context is None:
+            try:
+                await self._relaunch()
+                context = await self._new_context()
+            except Exception:
+                self._contexts.put_nowait(None)
+                raise
+        return context
+
+    async def _release(self, context):
+        """
+        Returns the context to the pool, or a new one once it is due for recycling. If that
+        fails, or the browser is gone, an empty slot goes back instead: the pool never shrinks.
+        """
+        self._render_counts[id(context)] = self._render_counts.get(id(context), 0) + 1
+        stale = context.browser is not self._browser or not self._browser.is_connected()
+        if stale or self._render_counts[id(context)] >= self.max_renders_per_context:
+            self._render_counts.pop(id(context), None)
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser context: {e}")
+            try:
+                context = await self._new_context() if self._browser.is_connected() else None
+            except Exception as e:
+                logger.error(f"Could not replace browser context: {e}")
+                context = None
+        self._contexts.put_nowait(context)
+
+    async def render(self, url: str) -> tuple[int, str]:
+        """
+        Returns (http_status, rendered_html)
+        """
+        if not self._browser:
+            await self._start()
+
+        context = await self._checkout()
+        try:
+            page = await context.new_page()
+            try:
+                response = await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout_ms)
+                try:
+                    # Give client-side rendering a moment to settle, without waiting for trackers forever
+                    await page.wait_for_load_state("networkidle", timeout=min(5000, self.timeout_ms))
+                except Exception:
+                    pass
+                html = await page.content()
+                return (response.status if response else 200), html
+            finally:
+                await page.close()
+        finally:
+            await self._release(context)
+
+    async def close(self):
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
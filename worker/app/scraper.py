@@ -2,16 +2,24 @@ import logging
 import asyncio
 import json
 from datetime import datetime, timedelta, timezone
-from sqlalchemy import select, update
+from typing import Optional
+from sqlalchemy import select, update, literal_column
 from sqlalchemy.dialects.postgresql import insert
 import httpx
 from bs4 import BeautifulSoup
 
-from shared.core import models, database, utils
+from shared.core import models, database, utils, url_rules
+from shared.core.search import build_search_vector
+from shared.core.events import mark_page_changed, EVENT_CREATED, EVENT_UPDATED
 from worker.app.pipeline import DiscoveryPipeline
 from worker.app.content_extractor import ContentExtractor
+from worker.app.extraction_profile import ExtractionProfile
 from worker.app.date_extractor import DateExtractor
+from worker.app.renderer import BrowserRenderer
 from worker.app.logger import remote_logger
+from worker.app import metrics
+from worker.app.stages import StageTimer
+from worker.app.loop_monitor import loop_monitor
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +27,8 @@ class ScraperEngine:
     def __init__(self):
         self.http_client = httpx.AsyncClient(headers={"User-Agent": "Web2TextBot/1.0"}, follow_redirects=True, timeout=30.0)
         self.discovery = DiscoveryPipeline(self.http_client)
+        self.renderer = BrowserRenderer()
+        self.extraction_profiles = {}
         self.lookback_days = 30 # Default
         import os
         self.save_raw_html = os.getenv("SAVE_RAW_HTML", "true").lower() == "true"
@@ -33,7 +43,34 @@ class ScraperEngine:
         except Exception as e:
             logger.error(f"Error reloading scraper settings: {e}")
 
-    def _is_valid_article(self, html: str) -> bool:
+    @staticmethod
+    def _parse_json_ld(soup) -> list:
+        """
+        Decodes every <script type="application/ld+json"> block, in document order.
+        Empty or invalid blocks are returned as None.
+        """
+        blocks = []
+        for script in soup.find_all('script', type='application/ld+json'):
+            content = script.get_text()
+            if not content:
+                blocks.append(None)
+                continue
+            try:
+                blocks.append(json.loads(content, strict=False))
+            except json.JSONDecodeError:
+                blocks.append(None)
+        return blocks
+
+    def _analyze(self, html: str):
+        """
+        Parses the page once for the validation and extraction steps.
+        Returns (soup, json_ld, is_article)
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        json_ld = self._parse_json_ld(soup)
+        return soup, json_ld, self._is_valid_article(html, soup, json_ld)
+
+    def _is_valid_article(self, html: str, soup=None, json_ld: Optional[list] = None) -> bool:
         """
         Validates if the page is a relevant article.
         Checks for:
@@ -41,40 +78,37 @@ class ScraperEngine:
         2. OpenGraph/Meta tags (og:type == 'article')
         """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            if soup is None:
+                soup = BeautifulSoup(html, 'html.parser')
+            if json_ld is None:
+                json_ld = self._parse_json_ld(soup)
             
             # 1. JSON-LD Check
-            scripts = soup.find_all('script', type='application/ld+json')
             valid_types = {'NewsArticle', 'Article', 'BlogPosting', 'Report'}
             
-            for script in scripts:
-                content = script.get_text()
-                if not content:
+            for data in json_ld:
+                if data is None:
                     continue
-                try:
-                    data = json.loads(content, strict=False)
-                    if isinstance(data, dict):
-                        data = [data]
+                if isinstance(data, dict):
+                    data = [data]
+                
+                for item in data:
+                    item_type = item.get('@type')
                     
-                    for item in data:
-                        item_type = item.get('@type')
-                        
-                        if isinstance(item_type, list):
-                            if any(t in valid_types for t in item_type):
-                                return True
-                        elif item_type in valid_types:
+                    if isinstance(item_type, list):
+                        if any(t in valid_types for t in item_type):
                             return True
-                            
-                        if '@graph' in item:
-                            for node in item['@graph']:
-                                node_type = node.get('@type')
-                                if isinstance(node_type, list):
-                                    if any(t in valid_types for t in node_type):
-                                        return True
-                                elif node_type in valid_types:
+                    elif item_type in valid_types:
+                        return True
+                        
+                    if '@graph' in item:
+                        for node in item['@graph']:
+                            node_type = node.get('@type')
+                            if isinstance(node_type, list):
+                                if any(t in valid_types for t in node_type):
                                     return True
-                except json.JSONDecodeError:
-                    continue
+                            elif node_type in valid_types:
+                                return True
             
             # 2. OpenGraph / Meta Check (Fallback for Sites like Boletin Oficial)
             # Check og:type
@@ -83,7 +117,7 @@ class ScraperEngine:
                 return True
                 
             # Check standard meta tags or twitter tags
-            twitter_type = soup.find('meta', name='twitter:card')
+            twitter_type = soup.find('meta', attrs={'name': 'twitter:card'})
             if twitter_type and twitter_type.get('content', '').lower() == 'article':
                 return True
 
@@ -93,10 +127,12 @@ class ScraperEngine:
             return False
 
 
-    async def run_discovery_phase(self, db, site: models.Site, run_id):
+    async def run_discovery_phase(self, db, site: models.Site, run_id, stages: Optional[StageTimer] = None):
         """
         Discovers URLs and doing dedupe upserts.
         """
+        stages = stages or StageTimer()
+        loop_monitor.set_activity(site_id=str(site.id), url=site.base_url)
         # Ensure settings are current
         await self.reload_settings(db)
         
@@ -104,7 +140,13 @@ class ScraperEngine:
         
         # Capture sitemap_url before running to detect if it was auto-discovered
         old_sitemap = site.sitemap_url
-        discovered_urls = await self.discovery.run(site, lookback_days=self.lookback_days)
+        # Stored rules that don't compile fall back to the defaults; the warning is kept whatever the sources
+        rules_warning = url_rules.rules_warning(site.url_rules)
+        if rules_warning:
+            logger.error(f"Site {site.name}: {rules_warning}")
+            await remote_logger.log(rules_warning, level="warning", extra={"site_id": site.id})
+        rules = url_rules.for_site(None if rules_warning else site.url_rules)
+        discovered_urls = await self.discovery.run(site, lookback_days=self.lookback_days, stages=stages, rules=rules)
         
         # Persist discovered sitemap if found
         if not old_sitemap and site.sitemap_url:
@@ -112,7 +154,7 @@ class ScraperEngine:
             await db.execute(
                 update(models.Site)
                 .where(models.Site.id == site.id)
-                .values(sitemap_url=site.sitemap_url, config_warning=None)
+                .values(sitemap_url=site.sitemap_url, config_warning=rules_warning)
             )
             await db.commit()
             await remote_logger.log(f"Auto-discovered and saved sitemap: {site.sitemap_url}", level="success", extra={"site_id": site.id})
@@ -122,7 +164,7 @@ class ScraperEngine:
             await db.execute(
                 update(models.Site)
                 .where(models.Site.id == site.id)
-                .values(config_warning=None)
+                .values(config_warning=rules_warning)
             )
             await db.commit()
 
@@ -133,7 +175,7 @@ class ScraperEngine:
             await db.execute(
                 update(models.Site)
                 .where(models.Site.id == site.id)
-                .values(config_warning=warning_msg)
+                .values(config_warning=f"{rules_warning} {warning_msg}" if rules_warning else warning_msg)
             )
             await db.commit()
             await remote_logger.log(
@@ -153,6 +195,8 @@ class ScraperEngine:
         await remote_logger.log(f"Upserting {len(discovered_urls)} URLs for {site.name}", level="info", extra={"site_id": site.id})
         
         total_discovered = len(discovered_urls)
+        total_new = 0
+        metrics.DISCOVERED_URLS.labels(str(site.id)).inc(total_discovered)
         
         # Batch Upsert using Postgres ON CONFLICT
         if discovered_urls:
@@ -170,30 +214,34 @@ class ScraperEngine:
                     "last_seen_at": now
                 })
             
-            # Divide into chunks of 500 to avoid huge statements
-            for i in range(0, len(values), 500):
-                chunk = values[i:i+500]
-                stmt = insert(models.Page).values(chunk)
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=['url_hash'],
-                    set_={"last_seen_at": now}
-                )
-                await db.execute(stmt)
-            
-            await db.commit()
+            with stages.span("upsert"), metrics.DB_WRITE_SECONDS.labels(str(site.id), "discovery_upsert").time():
+                # Divide into chunks of 500 to avoid huge statements
+                for i in range(0, len(values), 500):
+                    chunk = values[i:i+500]
+                    stmt = insert(models.Page).values(chunk)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=['url_hash'],
+                        set_={"last_seen_at": now}
+                    )
+                    # xmax is 0 only for rows this statement inserted (not for updated ones)
+                    result = await db.execute(stmt.returning(literal_column("xmax = 0")))
+                    total_new += sum(1 for inserted in result.scalars() if inserted)
+                
+                await db.commit()
         
         # Update run stats
         await db.execute(
             update(models.ScrapeRun)
             .where(models.ScrapeRun.id == run_id)
-            .values(pages_discovered=total_discovered)
+            .values(pages_discovered=total_discovered, pages_new=total_new)
         )
         await db.commit()
 
-    async def run_processing_phase(self, db, site: models.Site, run_id, limit=200):
+    async def run_processing_phase(self, db, site: models.Site, run_id, limit=200, stages: Optional[StageTimer] = None):
         """
         Process NEW pages.
         """
+        stages = stages or StageTimer()
         # Ensure settings are current
         await self.reload_settings(db)
         
@@ -213,15 +261,28 @@ class ScraperEngine:
         
         processed = 0
         failed = 0
+        skipped = 0
         
+        # Per-site extraction profile: lets stable sites skip extractor tiers that never work for them
+        if site.id not in self.extraction_profiles:
+            self.extraction_profiles[site.id] = ExtractionProfile.from_dict(site.extraction_profile)
+        profile = self.extraction_profiles[site.id]
+
         for page in pages:
             try:
-                await self.process_page(db, page, site.id)
-                processed += 1
+                await self.process_page(db, page, site, stages)
+                if page.status == models.PageStatus.PROCESSED:
+                    processed += 1
+                elif page.status == models.PageStatus.SKIPPED:
+                    skipped += 1
+                else:
+                    failed += 1
+                metrics.PAGES.labels(str(site.id), page.status.value).inc()
             except Exception as e:
                 logger.error(f"Failed to process {page.url}: {e}")
                 await remote_logger.log(f"Failed to process {page.url}: {e}", level="error", extra={"site_id": site.id, "url": page.url})
                 failed += 1
+                metrics.PAGES.labels(str(site.id), models.PageStatus.FAILED.value).inc()
                 page.status = models.PageStatus.FAILED
                 page.error = str(e)
                 db.add(page)
@@ -230,6 +291,13 @@ class ScraperEngine:
             # Rate limit
             await asyncio.sleep(site.rate_limit_ms / 1000.0)
 
+        if pages:
+            await db.execute(
+                update(models.Site)
+                .where(models.Site.id == site.id)
+                .values(extraction_profile=profile.to_dict())
+            )
+
         # Update run stats
         await db.execute(
             update(models.ScrapeRun)
@@ -237,72 +305,162 @@ class ScraperEngine:
             .values(
                 pages_processed=processed, 
                 pages_failed=failed,
+                pages_skipped=skipped,
+                stage_timings=stages.summary(),
                 finished_at=datetime.now(timezone.utc)
             )
         )
         await db.commit()
-        await remote_logger.log(f"Processing phase finished. Processed: {processed}, Failed: {failed}", level="info", extra={"site_id": site.id, "run_id": run_id})
+        await remote_logger.log(f"Processing phase finished. Processed: {processed}, Skipped: {skipped}, Failed: {failed}", level="info", extra={"site_id": site.id, "run_id": run_id})
 
-    async def process_page(self, db, page: models.Page, site_id: int):
+    def _can_render(self, site: models.Site, mode: models.RenderMode) -> bool:
+        return self.renderer.enabled and site.render_mode == mode
+
+    async def _render(self, url: str, site_id) -> Optional[str]:
+        """Renders the page with the browser pool. Returns None if rendering failed."""
+        try:
+            status, html = await self.renderer.render(url)
+            if status == 200:
+                return html
+            logger.info(f"Rendering {url} returned HTTP {status}")
+        except Exception as e:
+            logger.error(f"Rendering failed for {url}: {e}")
+            await remote_logger.log(f"Rendering failed for {url}: {e}", level="warning", extra={"site_id": site_id, "url": url})
+        return None
+
+    async def _skip_if_old(self, db, page: models.Page, published_at: Optional[datetime], stages: StageTimer) -> bool:
+        """Marks the page SKIPPED and commits when it was published before the lookback window."""
+        if not published_at:
+            return False
+        # Ensure published_at is aware for comparison
+        p_at = published_at
+        if p_at.tzinfo is None: p_at = p_at.replace(tzinfo=timezone.utc)
+
+        threshold = datetime.now(timezone.utc) - timedelta(days=self.lookback_days)
+        if p_at >= threshold:
+            return False
+        logger.info(f"Skipping {page.url}: Older than {self.lookback_days} days ({p_at})")
+        await remote_logger.log(f"Skipping {page.url}: Older than {self.lookback_days} days", level="info", extra={"site_id": page.site_id, "url": page.url})
+        page.status = models.PageStatus.SKIPPED
+        page.published_at = published_at
+        db.add(page)
+        with stages.span("commit"):
+            await db.commit()
+        return True
+
+    async def process_page(self, db, page: models.Page, site: models.Site, stages: Optional[StageTimer] = None):
+        site_id = site.id
         logger.info(f"Scraping {page.url}")
         await remote_logger.log(f"Scraping {page.url}...", level="info", extra={"site_id": site_id, "url": page.url})
+
+        parsing = metrics.Stopwatch()
+        try:
+            await self._process_page(db, page, site, parsing, stages or StageTimer())
+        finally:
+            if parsing.elapsed:
+                metrics.PARSE_SECONDS.labels(str(site_id)).observe(parsing.elapsed)
+
+    async def _process_page(self, db, page: models.Page, site: models.Site, parsing: metrics.Stopwatch, stages: StageTimer):
+        site_id = site.id
+        loop_monitor.set_activity(site_id=str(site_id), url=page.url)
+        metrics.PAGES_FETCHED.labels(str(site_id)).inc()
+        # Browser mode sites usually block or starve plain HTTP clients: the browser does the
+        # only fetch, and its response status is the page's
+        rendered = self._can_render(site, models.RenderMode.BROWSER)
+        try:
+            if rendered:
+                with stages.span("render"), metrics.FETCH_SECONDS.labels(str(site_id)).time():
+                    status_code, html = await self.renderer.render(page.url)
+            else:
+                with stages.span("fetch"), metrics.FETCH_SECONDS.labels(str(site_id)).time():
+                    resp = await self.http_client.get(page.url)
+                status_code = resp.status_code
+        except Exception:
+            metrics.HTTP_RESPONSES.labels(str(site_id), "error").inc()
+            raise
+        metrics.HTTP_RESPONSES.labels(str(site_id), metrics.status_class(status_code)).inc()
+        page.http_status = status_code
         
-        resp = await self.http_client.get(page.url)
-        page.http_status = resp.status_code
-        
-        if resp.status_code != 200:
+        if status_code != 200:
             page.status = models.PageStatus.FAILED
-            page.error = f"HTTP {resp.status_code}"
+            page.error = f"HTTP {status_code}"
             db.add(page)
-            await db.commit()
-            await remote_logger.log(f"HTTP Error {resp.status_code} for {page.url}", level="error", extra={"site_id": site_id, "url": page.url})
+            with stages.span("commit"):
+                await db.commit()
+            await remote_logger.log(f"HTTP Error {status_code} for {page.url}", level="error", extra={"site_id": site_id, "url": page.url})
             return
 
-        html = resp.text
-        
+        if not rendered:
+            html = resp.text
+
+        with stages.span("validate"), parsing.measure():
+            soup, json_ld, is_article = self._analyze(html)
+
+        # Escalate to the browser only when the static HTML has no article markup
+        if not is_article and not rendered and self._can_render(site, models.RenderMode.AUTO):
+            with stages.span("render"):
+                rendered_html = await self._render(page.url, site_id)
+            if rendered_html:
+                with stages.span("validate"), parsing.measure():
+                    rendered_analysis = self._analyze(rendered_html)
+                if rendered_analysis[2]:
+                    html, rendered = rendered_html, True
+                    soup, json_ld, is_article = rendered_analysis
+
         # --- JSON-LD FILTER ---
-        if not self._is_valid_article(html):
+        if not is_article:
             logger.info(f"Skipping {page.url}: Not a valid article (JSON-LD check failed)")
             await remote_logger.log(f"Skipping {page.url}: Not a valid article", level="info", extra={"site_id": site_id, "url": page.url})
             page.status = models.PageStatus.SKIPPED
             page.error = "Filtered: Not an article (JSON-LD)"
             db.add(page)
-            await db.commit()
+            with stages.span("commit"):
+                await db.commit()
             return
         # ---------------------
 
-        soup = BeautifulSoup(html, 'html.parser')
-
         # 1. Date Extraction
-        published_at, date_source, conf = DateExtractor.extract(html, page.url, soup)
+        with stages.span("date"), parsing.measure():
+            published_at, date_source, conf = DateExtractor.extract(html, page.url, soup, json_ld)
         
         # --- LOOKBACK FILTER ---
-        if published_at:
-            # Ensure published_at is aware for comparison
-            p_at = published_at
-            if p_at.tzinfo is None: p_at = p_at.replace(tzinfo=timezone.utc)
-            
-            threshold = datetime.now(timezone.utc) - timedelta(days=self.lookback_days)
-            if p_at < threshold:
-                logger.info(f"Skipping {page.url}: Older than {self.lookback_days} days ({p_at})")
-                await remote_logger.log(f"Skipping {page.url}: Older than {self.lookback_days} days", level="info", extra={"site_id": site_id, "url": page.url})
-                page.status = models.PageStatus.SKIPPED
-                page.published_at = published_at
-                db.add(page)
-                await db.commit()
-                return
+        if await self._skip_if_old(db, page, published_at, stages):
+            return
         # ---------------------
 
-        # 2. Content Extraction
-        text, method_used = ContentExtractor.extract(html)
+        # 2. Content Extraction (straight to the site's known-good tier when there is one)
+        profile = self.extraction_profiles.get(site_id)
+        hint = profile.hint() if profile else None
+        with stages.span("content"), parsing.measure():
+            text, method_used, content_selector = ContentExtractor.extract_with_hint(html, *(hint or (None, None)))
+        if profile:
+            profile.record(hint, method_used, content_selector)
+
+        # ... or when the article body isn't in it (client-side rendered)
+        if len(text) < ContentExtractor.MIN_TEXT_LENGTH and not rendered and self._can_render(site, models.RenderMode.AUTO):
+            with stages.span("render"):
+                rendered_html = await self._render(page.url, site_id)
+            if rendered_html:
+                with stages.span("content"), parsing.measure():
+                    rendered_text, rendered_method, rendered_selector = ContentExtractor.extract_with_hint(rendered_html)
+                    if len(rendered_text) > len(text):
+                        html, rendered = rendered_html, True
+                        text, method_used, content_selector = rendered_text, rendered_method, rendered_selector
+                        soup, json_ld, _ = self._analyze(html)
+                        if not published_at:
+                            published_at, date_source, conf = DateExtractor.extract(html, page.url, soup, json_ld)
+            # A date only the rendered page has gets the same lookback check
+            if rendered and await self._skip_if_old(db, page, published_at, stages):
+                return
         
         # 3. Metadata Extraction
         from worker.app.metadata_extractor import MetadataExtractor
-        meta = MetadataExtractor.extract(html, soup)
-        
-        title = meta.get("title") or (soup.title.string if soup.title else None)
-        
-        content_hash = utils.compute_content_hash(text)
+        with stages.span("metadata"), parsing.measure():
+            meta = MetadataExtractor.extract(html, soup)
+            
+            title = meta.get("title") or (soup.title.string if soup.title else None)
+            
+            content_hash = utils.compute_content_hash(text)
         
         # Save Content
         new_content = models.PageContent(
@@ -313,6 +471,9 @@ class ScraperEngine:
                 "date_source": date_source,
                 "date_confidence": conf,
                 "extraction_method": method_used,
+                "content_selector": content_selector,
+                "extraction_hinted": hint is not None,
+                "rendered": rendered,
                 "og_title": title,
                 "meta_extracted": True
             }
@@ -320,6 +481,7 @@ class ScraperEngine:
         db.add(new_content)
         
         # Update Page
+        event_type = EVENT_UPDATED if page.scraped_at else EVENT_CREATED
         page.status = models.PageStatus.PROCESSED
         page.title = title
         page.author = meta.get("author")
@@ -329,10 +491,15 @@ class ScraperEngine:
         page.published_at = published_at
         page.scraped_at = datetime.now(timezone.utc)
         page.content_hash = content_hash
+        page.search_vector = build_search_vector(page.language, title, page.summary, text)
         
         db.add(page)
-        await db.commit()
+        with stages.span("commit"), metrics.DB_WRITE_SECONDS.labels(str(site_id), "page").time():
+            # change_seq + public event (outbox + NOTIFY), committed together with the page
+            await mark_page_changed(db, page, event_type)
+            await db.commit()
         await remote_logger.log(f"Successfully scraped {page.url}", level="success", extra={"site_id": site_id, "url": page.url})
 
     async def close(self):
         await self.http_client.aclose()
+        await self.renderer.close()
@@ -0,0 +1,58 @@
+import math
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+
+from worker.app.loop_monitor import loop_monitor
+
+# Order of the stages in a run summary (others follow in the order first seen)
+STAGE_ORDER = [
+    "robots", "sitemap_fetch", "sitemap_parse", "rss", "links", "upsert",
+    "fetch", "render", "validate", "date", "content", "metadata", "commit",
+]
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    # Nearest rank
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+class StageTimer:
+    """
+    Collects wall-clock durations per stage over one scrape run.
+
+        with stages.span("fetch"):
+            resp = await client.get(url)
+
+    summary() gives count, total and percentiles per stage, in milliseconds, as stored
+    in scrape_runs.stage_timings. A span that raises is still recorded.
+    """
+
+    def __init__(self):
+        self.durations: dict[str, list[float]] = defaultdict(list)
+
+    @contextmanager
+    def span(self, stage: str):
+        # Also names the stage in event loop block reports
+        outer = loop_monitor.get_stage()
+        loop_monitor.set_stage(stage)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[stage].append(perf_counter() - start)
+            loop_monitor.set_stage(outer)
+
+    def summary(self) -> dict:
+        order = {stage: i for i, stage in enumerate(STAGE_ORDER)}
+        stages = sorted(self.durations, key=lambda stage: order.get(stage, len(order)))
+        result = {}
+        for stage in stages:
+            values = sorted(self.durations[stage])
+            result[stage] = {
+                "count": len(values),
+                "total_ms": round(sum(values) * 1000, 2),
+                "p50_ms": round(_percentile(values, 50) * 1000, 2),
+                "p90_ms": round(_percentile(values, 90) * 1000, 2),
+                "p99_ms": round(_percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+            }
+        return result
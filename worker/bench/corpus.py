@@ -0,0 +1,260 @@
+"""
+Deterministic corpus of news-site pages for the benchmarks.
+
+The pages copy the shapes the worker meets on real publishers: long navigation and
+footer boilerplate, inline scripts, JSON-LD NewsArticle (flat and @graph), OpenGraph-only
+articles, Arc Fusion pages whose body only exists in the Fusion.globalContent script,
+articles dated only by their URL, and category pages with no article markup.
+
+Every page comes with the values the extractors should find (`expected`), which the
+benchmarks check on top of the byte-exact golden outputs.
+"""
+import hashlib
+import html as html_lib
+import json
+import os
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+KINDS = ["jsonld", "jsonld_graph", "opengraph", "fusion", "url_date", "category"]
+BASE_URL = "https://noticias.example.com"
+
+SECTIONS = ["politica", "economia", "sociedad", "deportes", "el-mundo", "cultura", "tecnologia"]
+AUTHORS = ["María González", "Juan Pérez", "Lucía Fernández", "Carlos Rodríguez", "Ana Martínez"]
+WORDS = (
+    "el gobierno anunció nuevas medidas económicas para la provincia durante la conferencia "
+    "de prensa realizada este martes en la casa de gobierno los funcionarios explicaron que "
+    "el plan incluye obras de infraestructura créditos para pequeñas empresas y un programa "
+    "de capacitación laboral según datos oficiales la inflación del último trimestre se ubicó "
+    "por debajo de lo previsto mientras que el consumo mostró señales de recuperación en los "
+    "principales centros urbanos el intendente aseguró que los trabajos comenzarán antes de "
+    "fin de año y que la inversión total supera los cálculos iniciales vecinos y comerciantes "
+    "de la zona manifestaron su preocupación por el estado de las calles y el transporte público"
+).split()
+
+@dataclass
+class CorpusPage:
+    id: str
+    kind: str
+    url: str
+    html: str
+    expected: dict = field(default_factory=dict)
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+def _paragraphs(rng: random.Random, count: int) -> list[str]:
+    return [" ".join(_sentence(rng, rng.randint(12, 28)) for _ in range(rng.randint(2, 5))) for _ in range(count)]
+
+def _title(rng: random.Random) -> str:
+    return _sentence(rng, rng.randint(7, 12))[:-1]
+
+def _slug(title: str) -> str:
+    return "-".join(title.lower().split()[:8])
+
+def _boilerplate_head(rng: random.Random) -> str:
+    # Analytics/ads scripts and CSS as most publishers ship them
+    styles = "\n".join(f".c{i}{{margin:{i}px;padding:{i % 7}px;color:#{i * 2731 % 0xffffff:06x}}}" for i in range(rng.randint(150, 300)))
+    config = json.dumps({"ads": [{"slot": f"div-gpt-{i}", "sizes": [[300, 250], [728, 90]]} for i in range(30)]})
+    return (
+        f"<style>{styles}</style>\n"
+        f"<script>window.dataLayer=window.dataLayer||[];window.adsConfig={config};</script>\n"
+        "<script async src=\"https://www.googletagmanager.com/gtag/js?id=G-XXXX\"></script>\n"
+    )
+
+def _nav(rng: random.Random) -> str:
+    links = "".join(
+        f'<li><a href="{BASE_URL}/{rng.choice(SECTIONS)}/{_slug(_title(rng))}">{_title(rng)[:40]}</a></li>'
+        for _ in range(rng.randint(60, 140))
+    )
+    sections = "".join(f'<a href="{BASE_URL}/{s}/">{s.title()}</a>' for s in SECTIONS)
+    return f'<header><nav class="menu">{sections}<ul>{links}</ul></nav></header>'
+
+def _footer(rng: random.Random) -> str:
+    links = "".join(f'<a href="{BASE_URL}/{s}/">{s}</a> ' for s in SECTIONS * 4)
+    return f'<footer><div class="footer-links">{links}</div><p>© {rng.randint(2000, 2020)}-2026 Noticias Example. Todos los derechos reservados.</p></footer>'
+
+def _aside(rng: random.Random) -> str:
+    items = "".join(f'<li><a href="{BASE_URL}/{rng.choice(SECTIONS)}/{_slug(_title(rng))}">{_title(rng)}</a></li>' for _ in range(10))
+    return f'<aside class="mas-leidas"><h3>Lo más leído</h3><ol>{items}</ol></aside>'
+
+def _meta_tags(title, summary, author, image, published, og_type="article") -> str:
+    tags = [
+        f'<meta property="og:type" content="{og_type}">',
+        f'<meta property="og:title" content="{html_lib.escape(title)}">',
+        f'<meta property="og:description" content="{html_lib.escape(summary)}">',
+        f'<meta property="og:image" content="{image}">',
+        f'<meta name="description" content="{html_lib.escape(summary)}">',
+        f'<meta name="author" content="{html_lib.escape(author)}">',
+    ]
+    if published:
+        tags.append(f'<meta property="article:published_time" content="{published}">')
+    return "\n".join(tags)
+
+def _article(rng: random.Random, kind: str, index: int, now: datetime) -> CorpusPage:
+    section = rng.choice(SECTIONS)
+    title = _title(rng)
+    summary = _sentence(rng, 20)
+    author = rng.choice(AUTHORS)
+    published_dt = (now - timedelta(days=rng.randint(0, 20), minutes=rng.randint(0, 1440))).replace(second=0, microsecond=0)
+    published = published_dt.strftime("%Y-%m-%dT%H:%M:%S-03:00")
+    image = f"{BASE_URL}/resizer/{index}/{_slug(title)}.jpg"
+    paragraphs = _paragraphs(rng, rng.randint(6, 16))
+
+    url = f"{BASE_URL}/{section}/{_slug(title)}-n{index}"
+    expected = {
+        "is_article": True,
+        "date_source": "meta_article:published_time",
+        "published_at": datetime.fromisoformat(published).isoformat(),
+        "content_method": "trafilatura",
+        "content_contains": [paragraphs[0][:60], paragraphs[-1][-60:]],
+        "title": title,
+        "author": author,
+        "language": "es",
+        "image_url": image,
+    }
+
+    head_meta = _meta_tags(title, summary, author, image, published)
+    json_ld = ""
+    if kind == "jsonld":
+        json_ld = json.dumps({
+            "@context": "https://schema.org", "@type": "NewsArticle", "headline": title,
+            "datePublished": published, "author": {"@type": "Person", "name": author}, "image": [image],
+        }, ensure_ascii=False)
+    elif kind == "jsonld_graph":
+        json_ld = json.dumps({"@context": "https://schema.org", "@graph": [
+            {"@type": "WebSite", "url": BASE_URL, "name": "Noticias Example"},
+            {"@type": "BreadcrumbList", "itemListElement": [{"@type": "ListItem", "position": 1, "name": section}]},
+            {"@type": ["NewsArticle", "Article"], "headline": title, "datePublished": published},
+        ]}, ensure_ascii=False)
+    elif kind == "opengraph":
+        # No JSON-LD, no article:published_time: the <time> tag is the only date
+        head_meta = _meta_tags(title, summary, author, image, None)
+        expected["date_source"] = "time_tag_datetime"
+    elif kind == "url_date":
+        # Dated only by its URL; valid through og:type
+        head_meta = _meta_tags(title, summary, author, image, None)
+        url = f"{BASE_URL}/{published_dt:%Y/%m/%d}/{section}/{_slug(title)}/"
+        expected["date_source"] = "url_pattern"
+        expected["published_at"] = datetime(published_dt.year, published_dt.month, published_dt.day).isoformat()
+
+    body_paragraphs = "".join(f"<p>{html_lib.escape(p)}</p>" for p in paragraphs)
+    time_tag = f'<time datetime="{published}">{published_dt:%d/%m/%Y}</time>' if kind != "url_date" else ""
+    ld_script = f'<script type="application/ld+json">{json_ld}</script>' if json_ld else ""
+    html = (
+        f'<!DOCTYPE html><html lang="es"><head><meta charset="utf-8"><title>{html_lib.escape(title)} | Noticias Example</title>\n'
+        f"{head_meta}\n{ld_script}\n{_boilerplate_head(rng)}</head><body>{_nav(rng)}"
+        f'<main><article class="nota"><h1>{html_lib.escape(title)}</h1>'
+        f'<div class="byline">Por {html_lib.escape(author)} {time_tag}</div>'
+        f'<div class="cuerpo">{body_paragraphs}</div></article>{_aside(rng)}</main>{_footer(rng)}</body></html>'
+    )
+    return CorpusPage(f"{kind}-{index:03d}", kind, url, html, expected)
+
+def _fusion(rng: random.Random, index: int, now: datetime) -> CorpusPage:
+    section = rng.choice(SECTIONS)
+    title = _title(rng)
+    summary = _sentence(rng, 20)
+    author = rng.choice(AUTHORS)
+    published_dt = (now - timedelta(days=rng.randint(0, 20), minutes=rng.randint(0, 1440))).replace(second=0, microsecond=0)
+    published = published_dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    image = f"{BASE_URL}/resizer/{index}/{_slug(title)}.jpg"
+    paragraphs = _paragraphs(rng, rng.randint(6, 14))
+    url = f"{BASE_URL}/{section}/{published_dt:%Y/%m/%d}/{_slug(title)}/"
+
+    elements = [{"type": "text", "content": f"<b>{p[:30]}</b>{p[30:]}"} for p in paragraphs]
+    elements.insert(2, {"type": "list", "items": [{"type": "text", "content": _sentence(rng, 8)} for _ in range(3)]})
+    global_content = {
+        "_id": f"ARC{index:06d}", "type": "story", "headlines": {"basic": title},
+        "display_date": published, "content_elements": elements,
+    }
+    fusion = (
+        f"window.Fusion=window.Fusion||{{}};Fusion.arcSite=\"noticias\";"
+        f"Fusion.globalContent={json.dumps(global_content, ensure_ascii=False)};"
+        f"Fusion.globalContentConfig={{\"source\":\"content-api\"}};"
+    )
+    ld = json.dumps({"@context": "https://schema.org", "@type": "NewsArticle", "headline": title, "datePublished": published}, ensure_ascii=False)
+    # Client-side rendered: the body has only the app shell
+    html = (
+        f'<!DOCTYPE html><html lang="es"><head><meta charset="utf-8"><title>{html_lib.escape(title)}</title>\n'
+        f"{_meta_tags(title, summary, author, image, published)}\n"
+        f'<script type="application/ld+json">{ld}</script>{_boilerplate_head(rng)}</head>'
+        f'<body><div id="fusion-app"></div><script>{fusion}</script></body></html>'
+    )
+    expected = {
+        "is_article": True,
+        "date_source": "meta_article:published_time",
+        "published_at": datetime.fromisoformat(published.replace(".000Z", "+00:00")).isoformat(),
+        "content_method": "arc_fusion",
+        "content_contains": [paragraphs[0][31:90], paragraphs[-1][-60:]],
+        "title": title,
+        "author": author,
+        "language": "es",
+        "image_url": image,
+    }
+    return CorpusPage(f"fusion-{index:03d}", "fusion", url, html, expected)
+
+def _category(rng: random.Random, index: int) -> CorpusPage:
+    section = SECTIONS[index % len(SECTIONS)]
+    teasers = "".join(
+        f'<div class="teaser"><a href="{BASE_URL}/{section}/{_slug(_title(rng))}"><h2>{_title(rng)}</h2></a>'
+        f"<p>{_sentence(rng, 25)}</p></div>"
+        for _ in range(rng.randint(20, 40))
+    )
+    html = (
+        f'<!DOCTYPE html><html lang="es"><head><meta charset="utf-8"><title>{section.title()} | Noticias Example</title>\n'
+        f'<meta property="og:type" content="website"><meta property="og:title" content="{section.title()}">'
+        f"{_boilerplate_head(rng)}</head><body>{_nav(rng)}<main><h1>{section.title()}</h1>{teasers}</main>"
+        f"{_aside(rng)}{_footer(rng)}</body></html>"
+    )
+    return CorpusPage(f"category-{index:03d}", "category", f"{BASE_URL}/{section}/?page={index}", html, {"is_article": False})
+
+def generate(pages_per_kind: int = 10, seed: int = 42, now: datetime = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)) -> list[CorpusPage]:
+    """Same arguments, same pages (byte for byte): outputs can be compared across commits."""
+    rng = random.Random(seed)
+    pages = []
+    for i in range(pages_per_kind):
+        for kind in KINDS:
+            if kind == "fusion":
+                pages.append(_fusion(rng, i, now))
+            elif kind == "category":
+                pages.append(_category(rng, i))
+            else:
+                pages.append(_article(rng, kind, i, now))
+    return pages
+
+def corpus_digest(pages: list[CorpusPage]) -> str:
+    digest = hashlib.sha256()
+    for page in pages:
+        digest.update(page.id.encode())
+        digest.update(page.html.encode())
+    return digest.hexdigest()[:16]
+
+def load(directory: str) -> list[CorpusPage]:
+    """
+    Reads a saved corpus: <id>.html plus <id>.json with {"url", "kind", "expected"}.
+    Real pages can be added this way (expected may be partial or empty).
+    """
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".html"):
+            continue
+        page_id = name[:-5]
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            html = f.read()
+        meta = {}
+        meta_path = os.path.join(directory, f"{page_id}.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        pages.append(CorpusPage(page_id, meta.get("kind", "saved"), meta.get("url", f"{BASE_URL}/{page_id}"), html, meta.get("expected", {})))
+    return pages
+
+def save(pages: list[CorpusPage], directory: str):
+    os.makedirs(directory, exist_ok=True)
+    for page in pages:
+        with open(os.path.join(directory, f"{page.id}.html"), "w", encoding="utf-8") as f:
+            f.write(page.html)
+        with open(os.path.join(directory, f"{page.id}.json"), "w", encoding="utf-8") as f:
+            json.dump({"url": page.url, "kind": page.kind, "expected": page.expected}, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,241 @@
+"""
+Discovery benchmark: how DiscoveryPipeline scales with sitemap, RSS and homepage size.
+
+    python -m worker.bench.discovery [--only=sitemap,rss,links] [--sitemap-sizes=10000,50000,200000]
+        [--rss-sizes=100,1000,10000] [--links-sizes=500,5000,20000] [--output=report.json]
+        [--baseline=old_report.json] [--max-slowdown=0.2]
+
+Every scenario runs the whole pipeline (DiscoveryPipeline.run) on a site where one source is
+big: a gzip sitemap index with N URLs, an RSS feed with N items or a homepage with N links.
+Pages come from the mock news site (worker.bench.mock_site), generated up front and served
+through an httpx.MockTransport, so no time is spent on a network or a server. Each scenario
+runs in a fresh process, which makes its peak RSS its own. Reported: URLs/s, peak RSS and the
+time per stage: fetch (HTTP client), parse (XML / HTML / feed parsing, dates, link resolution),
+filter (URL rules, see shared.core.url_rules), canonicalize and dedupe (merging the sources and prioritizing).
+"""
+import asyncio
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+import httpx
+
+from shared.core.models import Site
+from shared.core.url_rules import UrlRules
+from worker.app import pipeline as pipeline_module
+from worker.app.pipeline import DiscoveryPipeline
+from worker.app.stages import StageTimer
+from worker.bench import corpus
+from worker.bench.mock_site import MockNewsSite, MockSiteConfig
+
+KINDS = ["sitemap", "rss", "links"]
+DEFAULT_SIZES = {"sitemap": [10_000, 50_000, 200_000], "rss": [100, 1_000, 10_000], "links": [500, 5_000, 20_000]}
+SOURCE_SPANS = ["robots", "sitemap_fetch", "sitemap_parse", "rss", "links"]
+
+def build_fixtures(kind: str, size: int) -> dict:
+    """{path: (status, content type, body)} of a site whose `kind` source has `size` URLs."""
+    small = 50
+    config = MockSiteConfig(
+        urls=size,
+        per_sitemap=50_000,
+        homepage_links=size if kind == "links" else small,
+        rss_items=size if kind == "rss" else small,
+    )
+    site = MockNewsSite(config)
+    paths = ["/", "/rss.xml"]
+    if kind == "sitemap":
+        sitemaps = (size + config.per_sitemap - 1) // config.per_sitemap
+        paths += ["/robots.txt", "/sitemap_index.xml"] + [f"/sitemaps/{n}.xml.gz" for n in range(sitemaps)]
+    # Other scenarios have no sitemap: robots.txt and the common sitemap paths are 404
+    return {path: site.route(path, corpus.BASE_URL) for path in paths}
+
+def mock_transport(fixtures: dict) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        found = fixtures.get(request.url.path)
+        if found is None:
+            return httpx.Response(404, text="Not found")
+        status, content_type, body = found
+        return httpx.Response(status, content=body, headers={"Content-Type": content_type})
+    return httpx.MockTransport(handler)
+
+class DiscoveryProbe:
+    """
+    Times the discovery steps that have no stage span of their own: HTTP requests, the URL
+    filter and canonicalization. Wraps them for the duration of attach() only; the wrappers
+    cost well under a microsecond per call.
+    """
+
+    def __init__(self):
+        self.elapsed = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    def _timed(self, name: str, function):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.elapsed[name] += time.perf_counter() - start
+                self.calls[name] += 1
+        return wrapper
+
+    def _timed_async(self, name: str, function):
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                self.elapsed[name] += time.perf_counter() - start
+                self.calls[name] += 1
+        return wrapper
+
+    @contextmanager
+    def attach(self, pipeline: DiscoveryPipeline):
+        client = pipeline.client
+        canonicalize_url = pipeline_module.canonicalize_url
+        filter_urls = UrlRules.filter
+        client.get = self._timed_async("fetch", client.get)
+        client.head = self._timed_async("fetch", client.head)
+        UrlRules.filter = self._timed("filter", filter_urls)
+        pipeline_module.canonicalize_url = self._timed("canonicalize", canonicalize_url)
+        try:
+            yield self
+        finally:
+            del client.get, client.head
+            UrlRules.filter = filter_urls
+            pipeline_module.canonicalize_url = canonicalize_url
+
+def _max_rss_mib() -> float:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return round(max_rss / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+
+async def _discover(kind: str, fixtures: dict) -> tuple[list[str], StageTimer, DiscoveryProbe, float]:
+    site = Site(name=f"Discovery bench ({kind})", base_url=f"{corpus.BASE_URL}/", rss_url=None)
+    if kind == "rss":
+        site.rss_url = f"{corpus.BASE_URL}/rss.xml"
+    stages = StageTimer()
+    probe = DiscoveryProbe()
+    async with httpx.AsyncClient(transport=mock_transport(fixtures), follow_redirects=True) as client:
+        discovery = DiscoveryPipeline(client)
+        with probe.attach(discovery):
+            start = time.perf_counter()
+            urls = await discovery.run(site, lookback_days=30, stages=stages)
+            total = time.perf_counter() - start
+    return urls, stages, probe, total
+
+def run_scenario(kind: str, size: int) -> dict:
+    """One scenario; meant to run in its own process (see main)."""
+    fixtures = build_fixtures(kind, size)
+    rss_before = _max_rss_mib()
+    urls, stages, probe, total = asyncio.run(_discover(kind, fixtures))
+
+    spans = stages.summary()
+    in_sources = sum(spans[name]["total_ms"] for name in SOURCE_SPANS if name in spans) / 1000
+    fetch = probe.elapsed["fetch"]
+    filtering = probe.elapsed["filter"]
+    canonicalize = probe.elapsed["canonicalize"]
+    return {
+        "kind": kind,
+        "size": size,
+        "urls_found": len(urls),
+        "seconds": round(total, 3),
+        "urls_per_s": round(size / total, 1) if total else None,
+        "fixture_bytes": sum(len(body) for _, _, body in fixtures.values()),
+        "rss_before_mib": rss_before,
+        "peak_rss_mib": _max_rss_mib(),
+        "stages_ms": {
+            "fetch": round(fetch * 1000, 2),
+            "parse": round(max(0.0, in_sources - fetch - filtering - canonicalize) * 1000, 2),
+            "filter": round(filtering * 1000, 2),
+            "canonicalize": round(canonicalize * 1000, 2),
+            "dedupe": round(max(0.0, total - in_sources) * 1000, 2),
+        },
+        "calls": dict(probe.calls),
+    }
+
+def compare_reports(report: dict, baseline: dict, max_slowdown: float) -> list[str]:
+    regressions = []
+    before = {(s["kind"], s["size"]): s for s in baseline.get("scenarios", [])}
+    for now in report["scenarios"]:
+        old = before.get((now["kind"], now["size"]))
+        if not old or not old["urls_per_s"]:
+            continue
+        if now["urls_per_s"] < old["urls_per_s"] / (1 + max_slowdown):
+            regressions.append(f"{now['kind']} {now['size']}: {old['urls_per_s']} -> {now['urls_per_s']} URLs/s")
+        if now["urls_found"] != old["urls_found"]:
+            regressions.append(f"{now['kind']} {now['size']}: found {old['urls_found']} -> {now['urls_found']} URLs")
+    return regressions
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+def main(argv: list[str]) -> int:
+    options = {"max-slowdown": "0.2"}
+    for arg in argv:
+        if not arg.startswith("--") or "=" not in arg:
+            print(__doc__)
+            return 2
+        key, value = arg[2:].split("=", 1)
+        options[key] = value
+
+    kinds = options["only"].split(",") if "only" in options else KINDS
+    scenarios = []
+    for kind in kinds:
+        if kind not in KINDS:
+            print(f"Unknown discovery source: {kind} (available: {', '.join(KINDS)})")
+            return 2
+        sizes = [int(size) for size in options[f"{kind}-sizes"].split(",")] if f"{kind}-sizes" in options else DEFAULT_SIZES[kind]
+        scenarios += [(kind, size) for size in sizes]
+
+    # A new process per scenario: peak RSS is never reset within a process
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for kind, size in scenarios:
+        with context.Pool(1) as pool:
+            result = pool.apply(run_scenario, (kind, size))
+        results.append(result)
+        stages = "  ".join(f"{name} {ms:.0f}" for name, ms in result["stages_ms"].items())
+        print(
+            f"{kind:>8} {size:>8}: {result['urls_per_s']:>10} URLs/s  peak {result['peak_rss_mib']:>7} MiB  ms: {stages}",
+            file=sys.stderr,
+        )
+
+    report = {
+        "meta": {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "scenarios": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if "output" in options:
+        with open(options["output"], "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if "baseline" in options:
+        with open(options["baseline"]) as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, float(options["max-slowdown"]))
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,264 @@
+"""
+Extractor benchmark: speed, memory and accuracy of the page extractors on a fixed corpus.
+
+    python -m worker.bench.extractors [--pages-per-kind=10] [--iterations=5] [--corpus=DIR]
+        [--save-corpus=DIR] [--output=report.json] [--baseline=old_report.json]
+        [--max-slowdown=0.2] [--update-golden]
+
+For _is_valid_article, ContentExtractor.extract, DateExtractor.extract and
+MetadataExtractor.extract it reports throughput, latency percentiles and peak traced
+memory, checks the outputs against the corpus' expected values and against the golden
+outputs (worker/bench/golden.json), and writes everything as JSON with sorted keys, so
+two reports diff cleanly. With --baseline, slowdowns beyond --max-slowdown and any
+accuracy or golden regressions are listed and the exit status is 1.
+"""
+import gc
+import hashlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+from worker.app.content_extractor import ContentExtractor
+from worker.app.date_extractor import DateExtractor, _parse_date_cached
+from worker.app.metadata_extractor import MetadataExtractor
+from worker.app.scraper import ScraperEngine
+from worker.bench import corpus
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden.json")
+EXTRACTORS = ["is_valid_article", "content", "date", "metadata"]
+OPTIONS = {"pages-per-kind", "iterations", "corpus", "save-corpus", "output", "baseline", "max-slowdown"}
+FLAGS = {"update-golden"}
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+class ExtractorBench:
+    def __init__(self, pages: list[corpus.CorpusPage]):
+        self.pages = pages
+        self.engine = ScraperEngine()
+        # Parsed once, outside the timings: the worker hands the same soup to every extractor
+        self.soups = {page.id: BeautifulSoup(page.html, "html.parser") for page in pages}
+        self.json_ld = {page.id: self.engine._parse_json_ld(self.soups[page.id]) for page in pages}
+
+    def call(self, name: str, page: corpus.CorpusPage):
+        if name == "is_valid_article":
+            return self.engine._is_valid_article(page.html)
+        if name == "content":
+            return ContentExtractor.extract(page.html)
+        if name == "date":
+            # Cold cache, as for a page the worker sees for the first time
+            _parse_date_cached.cache_clear()
+            return DateExtractor.extract(page.html, page.url, self.soups[page.id], self.json_ld[page.id])
+        if name == "metadata":
+            return MetadataExtractor.extract(page.html, self.soups[page.id])
+        raise ValueError(name)
+
+    def output(self, name: str, result) -> dict:
+        """The comparable (JSON) form of an extractor result."""
+        if name == "is_valid_article":
+            return {"is_article": bool(result)}
+        if name == "content":
+            text, method = result
+            return {"method": method, "length": len(text), "sha256": _digest(text)}
+        if name == "date":
+            dt, source, confidence = result
+            return {"published_at": dt.isoformat() if dt else None, "source": source, "confidence": confidence}
+        return {key: result.get(key) for key in sorted(result)}
+
+    def check(self, name: str, page: corpus.CorpusPage, result) -> list[str]:
+        """Mismatches with the page's expected values (only the ones it defines)."""
+        expected = page.expected
+        problems = []
+        if name == "is_valid_article" and "is_article" in expected:
+            if bool(result) != expected["is_article"]:
+                problems.append(f"is_article {bool(result)} != {expected['is_article']}")
+        elif not expected.get("is_article", True):
+            pass  # Extraction results of non-articles are only covered by the golden outputs
+        elif name == "content":
+            text, method = result
+            if "content_method" in expected and method != expected["content_method"]:
+                problems.append(f"method {method} != {expected['content_method']}")
+            for snippet in expected.get("content_contains", []):
+                if snippet not in text:
+                    problems.append(f"missing text: {snippet[:40]}...")
+        elif name == "date":
+            dt, source, _ = result
+            if "date_source" in expected and source != expected["date_source"]:
+                problems.append(f"date source {source} != {expected['date_source']}")
+            if "published_at" in expected and (dt.isoformat() if dt else None) != expected["published_at"]:
+                problems.append(f"published_at {dt.isoformat() if dt else None} != {expected['published_at']}")
+        elif name == "metadata":
+            for key in ("title", "author", "language", "image_url"):
+                if key in expected and result.get(key) != expected[key]:
+                    problems.append(f"{key} {result.get(key)!r} != {expected[key]!r}")
+        return problems
+
+    def run(self, iterations: int) -> tuple[dict, dict]:
+        """Returns (per-extractor report, outputs by page id and extractor)."""
+        report = {}
+        outputs = {page.id: {} for page in self.pages}
+        for name in EXTRACTORS:
+            latencies = []
+            failures = {}
+            for page in self.pages:
+                result = self.call(name, page)
+                outputs[page.id][name] = self.output(name, result)
+                problems = self.check(name, page, result)
+                if problems:
+                    failures[page.id] = problems
+
+            gc.collect()
+            started = time.perf_counter()
+            for _ in range(iterations):
+                for page in self.pages:
+                    start = time.perf_counter()
+                    self.call(name, page)
+                    latencies.append(time.perf_counter() - start)
+            total = time.perf_counter() - started
+
+            # Separate pass: tracing allocations slows everything down
+            gc.collect()
+            tracemalloc.start()
+            peak = 0
+            for page in self.pages:
+                tracemalloc.reset_peak()
+                self.call(name, page)
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+            latencies.sort()
+            report[name] = {
+                "calls": len(latencies),
+                "pages_per_s": round(len(latencies) / total, 1),
+                "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+                "p90_ms": round(_percentile(latencies, 90) * 1000, 3),
+                "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+                "max_ms": round(latencies[-1] * 1000, 3),
+                "peak_kib": round(peak / 1024, 1),
+                "accuracy": {"checked": len(self.pages), "passed": len(self.pages) - len(failures)},
+                "failures": failures,
+            }
+        return report, outputs
+
+def compare_golden(outputs: dict, golden: dict) -> dict:
+    changed = {}
+    for page_id, page_outputs in outputs.items():
+        for name, output in page_outputs.items():
+            expected = golden.get(page_id, {}).get(name)
+            if expected is not None and expected != output:
+                changed.setdefault(page_id, {})[name] = {"golden": expected, "now": output}
+    missing = sorted(page_id for page_id in outputs if page_id not in golden)
+    return {"matched": not changed, "changed": changed, "pages_without_golden": missing}
+
+def compare_reports(report: dict, baseline: dict, max_slowdown: float) -> list[str]:
+    regressions = []
+    for name, now in report["extractors"].items():
+        before = baseline.get("extractors", {}).get(name)
+        if not before:
+            continue
+        for key in ("p50_ms", "p90_ms"):
+            if before[key] and now[key] > before[key] * (1 + max_slowdown):
+                regressions.append(f"{name} {key}: {before[key]} -> {now[key]} ms")
+        if now["accuracy"]["passed"] < before["accuracy"]["passed"]:
+            regressions.append(f"{name} accuracy: {before['accuracy']['passed']} -> {now['accuracy']['passed']} passed")
+    if baseline.get("golden", {}).get("matched") and not report["golden"]["matched"]:
+        regressions.append(f"golden outputs changed for {len(report['golden']['changed'])} pages")
+    return regressions
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+def main(argv: list[str]) -> int:
+    options = {"pages-per-kind": "10", "iterations": "5", "max-slowdown": "0.2"}
+    flags = set()
+    for arg in argv:
+        key, _, value = arg[2:].partition("=")
+        if arg.startswith("--") and "=" in arg and key in OPTIONS:
+            options[key] = value
+        elif arg.startswith("--") and arg[2:] in FLAGS:
+            flags.add(arg[2:])
+        else:
+            print(__doc__)
+            return 2
+
+    if "corpus" in options:
+        pages = corpus.load(options["corpus"])
+    else:
+        pages = corpus.generate(pages_per_kind=int(options["pages-per-kind"]))
+    if "save-corpus" in options:
+        corpus.save(pages, options["save-corpus"])
+
+    bench = ExtractorBench(pages)
+    extractors, outputs = bench.run(int(options["iterations"]))
+
+    golden = {}
+    if os.path.exists(GOLDEN_PATH) and "update-golden" not in flags:
+        with open(GOLDEN_PATH) as f:
+            golden = json.load(f)
+    if "update-golden" in flags:
+        with open(GOLDEN_PATH, "w") as f:
+            json.dump(outputs, f, indent=1, sort_keys=True, ensure_ascii=False)
+            f.write("\n")
+        golden = outputs
+
+    import bs4
+    import trafilatura
+    report = {
+        "meta": {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "trafilatura": trafilatura.__version__,
+            "beautifulsoup4": bs4.__version__,
+            "corpus": {"pages": len(pages), "digest": corpus.corpus_digest(pages), "source": options.get("corpus", "generated")},
+            "iterations": int(options["iterations"]),
+        },
+        "extractors": extractors,
+        "golden": compare_golden(outputs, golden),
+    }
+
+    text = json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False)
+    if "output" in options:
+        with open(options["output"], "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    for name, result in extractors.items():
+        print(
+            f"{name:>17}: {result['pages_per_s']:>8} pages/s  p50 {result['p50_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  "
+            f"peak {result['peak_kib']:>8} KiB  accuracy {result['accuracy']['passed']}/{result['accuracy']['checked']}",
+            file=sys.stderr,
+        )
+    if not report["golden"]["matched"]:
+        print(f"Golden outputs changed for {len(report['golden']['changed'])} pages", file=sys.stderr)
+
+    if "baseline" in options:
+        with open(options["baseline"]) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("corpus", {}).get("digest") != report["meta"]["corpus"]["digest"]:
+            print("Warning: the baseline was run on a different corpus", file=sys.stderr)
+        regressions = compare_reports(report, baseline, float(options["max-slowdown"]))
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
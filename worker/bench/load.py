@@ -0,0 +1,219 @@
+"""
+End-to-end worker load test: discovery and processing runs of the real ScraperEngine against
+the mock news site (worker.bench.mock_site), writing to the database of DATABASE_URL.
+
+    python -m worker.bench.load [--runs=10] [--pages-per-run=200] [--site-url=URL]
+        [--output=report.json] [--keep] [mock site options, e.g. --urls=100000 --rate-429=0.01]
+
+Without --site-url the mock site is started in a child process on --port (8800). Runs go on
+until the backlog of NEW pages is empty or --runs is reached. The report has, per run, the
+discovery and processing times, the page counts and the stage timings, and overall the
+processing throughput (pages/s), the time to ingest the backlog and the CPU time and peak RSS
+of the harness process. The test site is created disabled (so a running worker ignores it)
+and is deleted with its pages and runs afterwards, unless --keep.
+
+Use a local database: the test writes thousands of pages.
+"""
+import asyncio
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import delete, func, select
+
+from shared.core import database, models
+from shared.core.cleanup import SiteDataCleaner
+from worker.app.scraper import ScraperEngine
+from worker.app.stages import StageTimer
+from worker.bench.mock_site import MockSiteConfig, parse_options, run_server
+
+async def wait_for_site(url: str, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                await client.get(f"{url}/robots.txt", timeout=1.0)
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Mock site at {url} did not start")
+                await asyncio.sleep(0.1)
+
+def resource_usage() -> dict:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    max_rss = usage.ru_maxrss / 1024 if sys.platform != "darwin" else usage.ru_maxrss / 1024 / 1024
+    return {"cpu_user_s": round(usage.ru_utime, 2), "cpu_sys_s": round(usage.ru_stime, 2), "max_rss_mib": round(max_rss, 1)}
+
+class LoadTest:
+    def __init__(self, site_url: str, runs: int, pages_per_run: int):
+        self.site_url = site_url.rstrip("/")
+        self.runs = runs
+        self.pages_per_run = pages_per_run
+        self.engine = ScraperEngine()
+        self.site_id = None
+
+    async def backlog(self, db) -> int:
+        return await db.scalar(
+            select(func.count()).select_from(models.Page)
+            .where(models.Page.site_id == self.site_id, models.Page.status == models.PageStatus.NEW)
+        )
+
+    async def run(self) -> dict:
+        async with database.AsyncSessionLocal() as db:
+            site = models.Site(
+                name=f"Load test {datetime.now(timezone.utc):%Y-%m-%d %H:%M:%S}",
+                base_url=f"{self.site_url}/",
+                rss_url=f"{self.site_url}/rss.xml",
+                enabled=False,
+                rate_limit_ms=0,
+            )
+            db.add(site)
+            await db.commit()
+            await db.refresh(site)
+            self.site_id = site.id
+
+            runs = []
+            processed_total = 0
+            processing_time = 0.0
+            time_to_ingest = None
+            started = time.perf_counter()
+            for _ in range(self.runs):
+                run = models.ScrapeRun(site_id=site.id)
+                db.add(run)
+                await db.commit()
+                await db.refresh(run)
+
+                stages = StageTimer()
+                phase_started = time.perf_counter()
+                await self.engine.run_discovery_phase(db, site, run.id, stages)
+                discovery_s = time.perf_counter() - phase_started
+
+                phase_started = time.perf_counter()
+                await self.engine.run_processing_phase(db, site, run.id, limit=self.pages_per_run, stages=stages)
+                processing_s = time.perf_counter() - phase_started
+
+                await db.refresh(run)
+                handled = run.pages_processed + run.pages_skipped + run.pages_failed
+                processed_total += handled
+                processing_time += processing_s
+                backlog = await self.backlog(db)
+                runs.append({
+                    "run_id": run.id,
+                    "discovered": run.pages_discovered,
+                    "new": run.pages_new,
+                    "processed": run.pages_processed,
+                    "skipped": run.pages_skipped,
+                    "failed": run.pages_failed,
+                    "backlog": backlog,
+                    "discovery_s": round(discovery_s, 2),
+                    "processing_s": round(processing_s, 2),
+                    "pages_per_s": round(handled / processing_s, 2) if processing_s else None,
+                    "stage_timings": run.stage_timings,
+                })
+                print(
+                    f"run {len(runs)}: {run.pages_new} new, {handled} handled in {processing_s:.1f}s, backlog {backlog}",
+                    file=sys.stderr,
+                )
+                if backlog == 0:
+                    time_to_ingest = time.perf_counter() - started
+                    break
+
+        return {
+            "runs": runs,
+            "totals": {
+                "runs": len(runs),
+                "pages_handled": processed_total,
+                "elapsed_s": round(time.perf_counter() - started, 2),
+                "pages_per_s": round(processed_total / processing_time, 2) if processing_time else None,
+                # Until the backlog was empty; null when --runs ended first
+                "time_to_ingest_s": round(time_to_ingest, 2) if time_to_ingest is not None else None,
+                "backlog_left": runs[-1]["backlog"] if runs else None,
+            },
+        }
+
+    async def cleanup(self):
+        if self.site_id is None:
+            return
+        await SiteDataCleaner(self.site_id, throttle_ms=0).run()
+        async with database.AsyncSessionLocal() as db:
+            await db.execute(delete(models.PageEvent).where(models.PageEvent.site_id == self.site_id))
+            await db.execute(delete(models.ScrapeRun).where(models.ScrapeRun.site_id == self.site_id))
+            await db.execute(delete(models.Site).where(models.Site.id == self.site_id))
+            await db.commit()
+
+async def mock_stats(site_url: str):
+    try:
+        async with httpx.AsyncClient() as client:
+            return (await client.get(f"{site_url}/__stats", timeout=5.0)).json()
+    except Exception:
+        return None
+
+async def main(argv: list[str]) -> int:
+    try:
+        options = parse_options(argv)
+    except ValueError as e:
+        print(e)
+        print(__doc__)
+        return 2
+
+    config = MockSiteConfig.from_args(options)
+    server = None
+    site_url = options.get("site-url")
+    if not site_url:
+        port = int(options.get("port", 8800))
+        site_url = f"http://127.0.0.1:{port}"
+        server = multiprocessing.Process(target=run_server, args=(config, "127.0.0.1", port), daemon=True)
+        server.start()
+    site_url = site_url.rstrip("/")
+
+    test = LoadTest(site_url, int(options.get("runs", 10)), int(options.get("pages-per-run", 200)))
+    try:
+        await wait_for_site(site_url)
+        result = await test.run()
+        requests = await mock_stats(site_url)
+    finally:
+        if "keep" not in options:
+            await test.cleanup()
+        await test.engine.http_client.aclose()
+        if server is not None:
+            server.terminate()
+            server.join()
+
+    report = {
+        "meta": {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "site_url": site_url,
+            "mock_site": vars(config) if server is not None else None,
+            "pages_per_run": test.pages_per_run,
+            "kept_site_id": str(test.site_id) if "keep" in options else None,
+        },
+        **result,
+        "mock_requests": requests,
+        "resources": resource_usage(),
+    }
+    text = json.dumps(report, indent=2, sort_keys=True, default=str)
+    if "output" in options:
+        with open(options["output"], "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    totals = report["totals"]
+    print(
+        f"{totals['pages_handled']} pages in {totals['runs']} runs: {totals['pages_per_s']} pages/s, "
+        f"time to ingest {totals['time_to_ingest_s']} s, backlog left {totals['backlog_left']}, "
+        f"peak RSS {report['resources']['max_rss_mib']} MiB",
+        file=sys.stderr,
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
@@ -0,0 +1,286 @@
+"""
+Mock news publisher for load tests: a self-contained HTTP server (asyncio, no dependencies)
+that serves a whole site generated on the fly.
+
+    python -m worker.bench.mock_site [--port=8800] [--urls=100000] [--per-sitemap=10000]
+        [--plain-sitemaps] [--latency-ms=0] [--jitter-ms=0] [--rate-429=0] [--rate-5xx=0]
+        [--slow-rate=0] [--slow-seconds=2] [--fusion-ratio=0.1] [--non-article-ratio=0.05]
+
+Pages: /robots.txt -> /sitemap_index.xml -> /sitemaps/<n>.xml.gz (gzip files, or .xml with
+--plain-sitemaps), /rss.xml, the homepage with links to the latest articles, section pages
+(/seccion/<name>/) and articles, built with the benchmark corpus (JSON-LD, OpenGraph,
+URL-dated and Arc Fusion articles, plus non-article pages). Article n is always the same page,
+article 0 is the newest. Faults are drawn per request: extra latency, 429 / 503 responses and
+slow bodies trickled over --slow-seconds. GET /__stats returns the request counts.
+"""
+import asyncio
+import gzip
+import json
+import random
+import sys
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Optional
+
+from worker.bench import corpus
+
+REASONS = {200: "OK", 404: "Not Found", 405: "Method Not Allowed", 429: "Too Many Requests", 503: "Service Unavailable"}
+ARTICLE_KINDS = ["jsonld", "jsonld_graph", "opengraph", "url_date"]
+
+@dataclass
+class MockSiteConfig:
+    urls: int = 10_000
+    per_sitemap: int = 10_000
+    gzip_sitemaps: bool = True
+    homepage_links: int = 300
+    rss_items: int = 100
+    # Articles are spread over this many days back from the server start
+    days: int = 7
+    fusion_ratio: float = 0.1
+    non_article_ratio: float = 0.05
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    slow_rate: float = 0.0
+    slow_seconds: float = 2.0
+    seed: int = 1
+
+    @classmethod
+    def from_args(cls, options: dict) -> "MockSiteConfig":
+        config = cls()
+        for f in fields(cls):
+            key = f.name.replace("_", "-")
+            if key in options and f.type is not bool:
+                setattr(config, f.name, f.type(options[key]))
+        if "plain-sitemaps" in options:
+            config.gzip_sitemaps = False
+        return config
+
+class MockNewsSite:
+    def __init__(self, config: MockSiteConfig):
+        self.config = config
+        self.started = datetime.now(timezone.utc).replace(microsecond=0)
+        self.faults = random.Random(config.seed)
+        self.stats: Counter[str] = Counter()
+
+    # --- Site model ---
+
+    def kind(self, article_id: int) -> str:
+        bucket = (article_id * 2654435761 % 1000) / 1000
+        if bucket < self.config.fusion_ratio:
+            return "fusion"
+        if bucket < self.config.fusion_ratio + self.config.non_article_ratio:
+            return "category"
+        return ARTICLE_KINDS[article_id % len(ARTICLE_KINDS)]
+
+    def published(self, article_id: int) -> datetime:
+        return self.started - timedelta(days=self.config.days) * (article_id / max(1, self.config.urls))
+
+    def path(self, article_id: int) -> str:
+        section = corpus.SECTIONS[article_id % len(corpus.SECTIONS)]
+        if self.kind(article_id) == "url_date":
+            return f"/{self.published(article_id):%Y/%m/%d}/{section}/nota-{article_id}/"
+        return f"/{section}/nota-{article_id}"
+
+    @staticmethod
+    def article_id(path: str) -> Optional[int]:
+        marker = path.rfind("nota-")
+        if marker == -1:
+            return None
+        digits = path[marker + 5:].rstrip("/")
+        return int(digits) if digits.isdigit() else None
+
+    # --- Pages ---
+
+    def robots(self, base: str) -> bytes:
+        return f"User-agent: *\nDisallow: /buscar/\n\nSitemap: {base}/sitemap_index.xml\n".encode()
+
+    def sitemap_index(self, base: str) -> bytes:
+        extension = "xml.gz" if self.config.gzip_sitemaps else "xml"
+        count = (self.config.urls + self.config.per_sitemap - 1) // self.config.per_sitemap
+        entries = "".join(
+            f"<sitemap><loc>{base}/sitemaps/{n}.{extension}</loc>"
+            f"<lastmod>{self.published(n * self.config.per_sitemap).isoformat()}</lastmod></sitemap>"
+            for n in range(count)
+        )
+        return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</sitemapindex>'.encode()
+
+    def sitemap(self, base: str, n: int) -> Optional[bytes]:
+        first = n * self.config.per_sitemap
+        if first >= self.config.urls:
+            return None
+        last = min(self.config.urls, first + self.config.per_sitemap)
+        entries = "".join(
+            f"<url><loc>{base}{self.path(i)}</loc><lastmod>{self.published(i).isoformat()}</lastmod></url>"
+            for i in range(first, last)
+        )
+        return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'.encode()
+
+    def rss(self, base: str) -> bytes:
+        items = "".join(
+            f"<item><title>Nota {i}</title><link>{base}{self.path(i)}</link>"
+            f"<pubDate>{format_datetime(self.published(i))}</pubDate></item>"
+            for i in range(min(self.config.rss_items, self.config.urls))
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>Noticias Example</title><link>{base}/</link><description>Últimas noticias</description>{items}</channel></rss>"
+        ).encode()
+
+    def homepage(self, base: str) -> bytes:
+        links = "".join(
+            f'<li><a href="{self.path(i)}">Nota {i}</a></li>' for i in range(min(self.config.homepage_links, self.config.urls))
+        )
+        sections = "".join(f'<a href="/seccion/{s}/">{s}</a> ' for s in corpus.SECTIONS)
+        return (
+            '<!DOCTYPE html><html lang="es"><head><meta charset="utf-8"><title>Noticias Example</title>'
+            f'<meta property="og:type" content="website"></head><body><nav>{sections}</nav><ul>{links}</ul>'
+            f'<a href="/buscar/?q=economia">Buscar</a></body></html>'
+        ).encode()
+
+    def article(self, article_id: int) -> bytes:
+        rng = random.Random(self.config.seed * 1_000_003 + article_id)
+        kind = self.kind(article_id)
+        if kind == "fusion":
+            page = corpus._fusion(rng, article_id, self.published(article_id))
+        elif kind == "category":
+            page = corpus._category(rng, article_id)
+        else:
+            page = corpus._article(rng, kind, article_id, self.published(article_id))
+        return page.html.encode()
+
+    def route(self, path: str, base: str) -> tuple[int, str, Optional[bytes]]:
+        """(status, content type, body) for a path."""
+        path = path.split("?", 1)[0]
+        if path == "/robots.txt":
+            return 200, "text/plain", self.robots(base)
+        if path == "/sitemap_index.xml":
+            return 200, "application/xml", self.sitemap_index(base)
+        if path.startswith("/sitemaps/"):
+            name = path[len("/sitemaps/"):]
+            number = name.split(".", 1)[0]
+            body = self.sitemap(base, int(number)) if number.isdigit() else None
+            if body is None:
+                return 404, "text/plain", b"Not found"
+            if name.endswith(".gz"):
+                return 200, "application/gzip", gzip.compress(body, compresslevel=5)
+            return 200, "application/xml", body
+        if path == "/rss.xml":
+            return 200, "application/rss+xml", self.rss(base)
+        if path == "/":
+            return 200, "text/html; charset=utf-8", self.homepage(base)
+        if path.startswith("/seccion/"):
+            rng = random.Random(path)
+            return 200, "text/html; charset=utf-8", corpus._category(rng, 0).html.encode()
+        article_id = self.article_id(path)
+        if article_id is not None and article_id < self.config.urls:
+            return 200, "text/html; charset=utf-8", self.article(article_id)
+        return 404, "text/plain", b"Not found"
+
+    # --- HTTP ---
+
+    async def respond(self, method: str, path: str, headers: dict) -> tuple[int, str, bytes, dict, bool]:
+        """(status, content type, body, extra headers, slow)"""
+        config = self.config
+        if config.latency_ms or config.jitter_ms:
+            await asyncio.sleep(max(0.0, config.latency_ms + self.faults.uniform(-config.jitter_ms, config.jitter_ms)) / 1000)
+        if path == "/__stats":
+            return 200, "application/json", json.dumps(self.stats).encode(), {}, False
+        if method not in ("GET", "HEAD"):
+            return 405, "text/plain", b"", {}, False
+
+        roll = self.faults.random()
+        if roll < config.rate_429:
+            return 429, "text/plain", b"Too many requests", {"Retry-After": "1"}, False
+        if roll < config.rate_429 + config.rate_5xx:
+            return 503, "text/plain", b"Service unavailable", {}, False
+
+        base = f"http://{headers.get('host', 'localhost')}"
+        status, content_type, body = self.route(path, base)
+        slow = status == 200 and self.faults.random() < config.slow_rate
+        return status, content_type, body, {}, slow
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get("content-length") or 0):
+                    await reader.readexactly(int(headers["content-length"]))
+
+                status, content_type, body, extra, slow = await self.respond(method, target, headers)
+                self.stats[str(status)] += 1
+                if slow:
+                    self.stats["slow_bodies"] += 1
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                head = [
+                    f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}",
+                    f"Content-Type: {content_type}",
+                    f"Content-Length: {len(body)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                    *(f"{name}: {value}" for name, value in extra.items()),
+                ]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+                if method != "HEAD":
+                    if slow:
+                        # The body trickles in 20 parts: the client's read timeout, not connect, applies
+                        step = max(1, len(body) // 20)
+                        for i in range(0, len(body), step):
+                            writer.write(body[i:i + step])
+                            await writer.drain()
+                            await asyncio.sleep(self.config.slow_seconds / 20)
+                    else:
+                        writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8800):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Mock news site on http://{host}:{port}/ ({self.config.urls} URLs)", file=sys.stderr, flush=True)
+        async with server:
+            await server.serve_forever()
+
+def parse_options(argv: list[str]) -> dict:
+    options = {}
+    for arg in argv:
+        if not arg.startswith("--"):
+            raise ValueError(f"Unexpected argument: {arg}")
+        key, _, value = arg[2:].partition("=")
+        options[key] = value
+    return options
+
+def run_server(config: MockSiteConfig, host: str, port: int):
+    """Entry point for a separate process (see worker.bench.load)."""
+    try:
+        asyncio.run(MockNewsSite(config).serve(host, port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    try:
+        options = parse_options(sys.argv[1:])
+    except ValueError as e:
+        print(e)
+        print(__doc__)
+        sys.exit(1)
+    config = MockSiteConfig.from_args(options)
+    print(json.dumps(asdict(config)), file=sys.stderr)
+    run_server(config, options.get("host", "127.0.0.1"), int(options.get("port", 8800)))